@@ -2,6 +2,8 @@
 ASGI config for app project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Besides the Django application it serves the /sync/events/ change stream,
+so the app is run by an ASGI server: uvicorn app.asgi:application.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -9,8 +11,17 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+if settings.DEBUG:
+    # Static files, as runserver serves them in development.
+    django_application = ASGIStaticFilesHandler(django_application)
+
+from sync.events import route  # noqa: E402
+
+application = route(django_application)
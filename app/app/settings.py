@@ -36,15 +36,24 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'drf_spectacular',
     'core',
     'user',
     'recipe',
+    'benchmark',
+    'monitoring',
+    'sync',
+    'batch',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.MetricsMiddleware',
+    'monitoring.middleware.ServerTimingMiddleware',
+    'monitoring.middleware.SlowQueryMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -134,8 +143,191 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
+
+# OpenAPI schema cache
+# The schema is generated once per CODE_VERSION (defaults to a hash of the
+# source files) by `manage.py generate_schema` or on first request, unless
+# SCHEMA_LIVE_GENERATION is disabled.
+
+CODE_VERSION = os.environ.get('CODE_VERSION')
+SCHEMA_CACHE_DIR = os.environ.get('SCHEMA_CACHE_DIR', '/vol/web/schema')
+SCHEMA_LIVE_GENERATION = bool(int(
+    os.environ.get('SCHEMA_LIVE_GENERATION', 1)
+))
+SCHEMA_CACHE_MAX_AGE = int(os.environ.get('SCHEMA_CACHE_MAX_AGE', 3600))
+
+# Recipe lists
+# GET /recipes/ returns every matching recipe unless `cursor` or
+# `page_size` is given; pages default to RECIPE_PAGE_SIZE recipes.
+
+RECIPE_PAGE_SIZE = int(os.environ.get('RECIPE_PAGE_SIZE', 100))
+RECIPE_MAX_PAGE_SIZE = int(os.environ.get('RECIPE_MAX_PAGE_SIZE', 1000))
+
+# Similar recipes
+# GET /recipes/<id>/similar/ is served from in-memory indexes kept for the
+# SIMILAR_INDEX_USERS most recently used users of each process. A shared
+# tag counts SIMILAR_TAG_WEIGHT against 1 for a shared ingredient.
+
+SIMILAR_INDEX_USERS = int(os.environ.get('SIMILAR_INDEX_USERS', 200))
+SIMILAR_TAG_WEIGHT = float(os.environ.get('SIMILAR_TAG_WEIGHT', 0.5))
+
+# Batch requests
+# POST /batch/ runs up to BATCH_MAX_REQUESTS GET requests to the recipe and
+# user APIs, authenticated once, and returns their responses together.
+
+BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', 20))
+
+# Delta sync
+# GET /sync/?since=<cursor> pages through per-user changes. Tombstones
+# older than SYNC_TOMBSTONE_RETENTION_DAYS are purged by
+# `manage.py compact_changes`; clients behind the purge are told to reset.
+
+SYNC_PAGE_SIZE = int(os.environ.get('SYNC_PAGE_SIZE', 500))
+SYNC_MAX_PAGE_SIZE = int(os.environ.get('SYNC_MAX_PAGE_SIZE', 5000))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(
+    os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+)
+
+# Change events
+# The ASGI application streams committed changes at /sync/events/. Idle
+# streams get a comment every SYNC_EVENTS_HEARTBEAT seconds; a client more
+# than SYNC_EVENTS_QUEUE_SIZE events behind is sent a single resync event.
+# EventSource clients authenticate with a ticket from POST /sync/ticket/,
+# valid for SYNC_EVENTS_TICKET_MAX_AGE seconds.
+
+SYNC_EVENTS_HEARTBEAT = float(os.environ.get('SYNC_EVENTS_HEARTBEAT', 15))
+SYNC_EVENTS_QUEUE_SIZE = int(os.environ.get('SYNC_EVENTS_QUEUE_SIZE', 100))
+SYNC_EVENTS_TICKET_MAX_AGE = int(
+    os.environ.get('SYNC_EVENTS_TICKET_MAX_AGE', 60)
+)
+
+# Admin
+# Admin changelists above ADMIN_COUNT_ESTIMATE_THRESHOLD rows show the
+# planner's row estimate instead of an exact COUNT(*).
+
+ADMIN_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get('ADMIN_COUNT_ESTIMATE_THRESHOLD', 10000)
+)
+
+# Background jobs
+# `manage.py run_workers` runs JOB_WORKER_PROCESSES processes with
+# JOB_WORKER_THREADS threads each. Failed jobs are retried with exponential
+# backoff up to JOB_MAX_ATTEMPTS times. Workers mark their running jobs
+# every JOB_HEARTBEAT_INTERVAL seconds; running jobs without a heartbeat for
+# JOB_TIMEOUT seconds are assumed lost and requeued.
+
+JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES', 1))
+JOB_WORKER_THREADS = int(os.environ.get('JOB_WORKER_THREADS', 4))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 5))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+JOB_RETRY_BASE_DELAY = float(os.environ.get('JOB_RETRY_BASE_DELAY', 10))
+JOB_RETRY_MAX_DELAY = float(os.environ.get('JOB_RETRY_MAX_DELAY', 3600))
+JOB_PER_USER_CONCURRENCY = int(
+    os.environ.get('JOB_PER_USER_CONCURRENCY', 2)
+)
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get('JOB_HEARTBEAT_INTERVAL', 30))
+JOB_TIMEOUT = int(os.environ.get('JOB_TIMEOUT', 300))
+
+# Account archives
+# Archives requested at /archives/ are built by the job workers into
+# ARCHIVE_DIR, which must be shared with the web processes, and deleted
+# ARCHIVE_TTL seconds after they are finished.
+
+ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', '/vol/web/archives')
+ARCHIVE_TTL = int(os.environ.get('ARCHIVE_TTL', 24 * 60 * 60))
+
+# Response compression
+# Responses of at least COMPRESSION_MIN_SIZE bytes are compressed with the
+# first of COMPRESSION_ENCODINGS the client accepts; br and zstd need the
+# brotli and zstandard packages. Streamed responses are compressed per chunk.
+
+COMPRESSION_ENABLED = bool(int(os.environ.get('COMPRESSION_ENABLED', 1)))
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_ENCODINGS = os.environ.get(
+    'COMPRESSION_ENCODINGS', 'br,zstd,gzip'
+).split(',')
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_LEVEL = int(os.environ.get('COMPRESSION_BROTLI_LEVEL', 4))
+COMPRESSION_ZSTD_LEVEL = int(os.environ.get('COMPRESSION_ZSTD_LEVEL', 3))
+
+# Request timing
+# Server-Timing headers and timing logs are emitted for a sampled share of
+# requests, and for any request sending `X-Server-Timing: 1` when opt-in is
+# allowed.
+
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.environ.get('SERVER_TIMING_SAMPLE_RATE', 0)
+)
+SERVER_TIMING_HEADER_OPT_IN = bool(int(
+    os.environ.get('SERVER_TIMING_HEADER_OPT_IN', int(DEBUG))
+))
+
+# Prometheus metrics
+# Served at /metrics to staff users and to scrapers sending
+# `Authorization: Bearer <METRICS_TOKEN>`; METRICS_PUBLIC=1 opts in to
+# serving it to anyone, e.g. behind a private network. Set
+# PROMETHEUS_MULTIPROC_DIR to an empty directory shared by all worker
+# processes so their samples are aggregated, and have the server call
+# monitoring.metrics.process_exited(pid) for each worker that exits, e.g.
+# from gunicorn's child_exit hook.
+
+METRICS_ENABLED = bool(int(os.environ.get('METRICS_ENABLED', 1)))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_PUBLIC = bool(int(os.environ.get('METRICS_PUBLIC', 0)))
+
+# Request profiling
+# Staff users profile single requests with an `X-Profile: 1` header, and a
+# PROFILING_SAMPLE_RATE share of requests to profiled views is captured.
+# PROFILING_MODE is 'sample' (folded stacks) or 'cprofile' (pstats).
+
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+PROFILING_MODE = os.environ.get('PROFILING_MODE', 'sample')
+PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', 0.005))
+PROFILING_DIR = os.environ.get('PROFILING_DIR', '/vol/web/profiles')
+PROFILING_CAPACITY = int(os.environ.get('PROFILING_CAPACITY', 100))
+
+# Slow query capture
+# Statements slower than SLOW_QUERY_THRESHOLD_MS (unset disables capture)
+# are stored with their EXPLAIN (ANALYZE, BUFFERS) plan, at most once per
+# SLOW_QUERY_CAPTURE_INTERVAL seconds per statement fingerprint.
+
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 0))
+SLOW_QUERY_CAPTURE_INTERVAL = float(
+    os.environ.get('SLOW_QUERY_CAPTURE_INTERVAL', 60)
+)
+SLOW_QUERY_CAPTURES_PER_MINUTE = int(
+    os.environ.get('SLOW_QUERY_CAPTURES_PER_MINUTE', 30)
+)
+SLOW_QUERY_DIR = os.environ.get('SLOW_QUERY_DIR', '/vol/web/slow-queries')
+SLOW_QUERY_CAPACITY = int(os.environ.get('SLOW_QUERY_CAPACITY', 500))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'monitoring': {
+            'handlers': ['console'],
+            'level': os.environ.get('MONITORING_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,36 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET'], default='GET')
+    path = serializers.CharField(
+        max_length=2048,
+        help_text='Path and query string, e.g. /user/me/'
+    )
+
+    def validate_path(self, value):
+        if not value.startswith('/'):
+            raise serializers.ValidationError('Must be an absolute path.')
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f'At most {settings.BATCH_MAX_REQUESTS} requests per batch.'
+            )
+        return value
+
+
+class SubResponseSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    body = serializers.JSONField()
+
+
+class BatchResultSerializer(serializers.Serializer):
+    """Documents batch results; one response per request, in order."""
+    responses = SubResponseSerializer(many=True)
@@ -0,0 +1,190 @@
+"""
+Tests for the batch API.
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag
+)
+
+BATCH_URL = reverse('batch:batch')
+ME_URL = reverse('user:me')
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+def create_recipe(user, title):
+    return Recipe.objects.create(
+        user=user, title=title, time_minutes=5, price=Decimal('1.00')
+    )
+
+
+class PublicBatchApiTests(TestCase):
+    def test_auth_required(self):
+        res = APIClient().post(
+            BATCH_URL, {'requests': [{'path': ME_URL}]}, format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateBatchApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123', name='User'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def batch(self, *paths):
+        res = self.client.post(
+            BATCH_URL,
+            {'requests': [{'method': 'GET', 'path': p} for p in paths]},
+            format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data['responses']
+
+    def test_responses_in_order(self):
+        breakfast = Tag.objects.create(user=self.user, name='Breakfast')
+        Tag.objects.create(user=self.user, name='Dinner')
+        recipe = create_recipe(self.user, 'Pancake')
+        recipe.tags.add(breakfast)
+        create_recipe(self.user, 'Soup')
+
+        responses = self.batch(
+            ME_URL, TAGS_URL, f'{RECIPES_URL}?tags={breakfast.id}'
+        )
+
+        self.assertEqual(
+            [response['status'] for response in responses], [200] * 3
+        )
+        self.assertEqual(responses[0]['body']['email'], 'user@example.com')
+        self.assertEqual(
+            [tag['name'] for tag in responses[1]['body']],
+            ['Dinner', 'Breakfast']
+        )
+        self.assertEqual(
+            [recipe['title'] for recipe in responses[2]['body']], ['Pancake']
+        )
+
+    def test_public_recipe_paths(self):
+        tag = Tag.objects.create(user=self.user, name='Breakfast')
+        create_recipe(self.user, 'Pancake').tags.add(tag)
+        create_recipe(self.user, 'Soup')
+
+        responses = self.batch('//recipes/', f'//recipes/?tags={tag.id}')
+
+        self.assertEqual(
+            [response['status'] for response in responses], [200, 200]
+        )
+        self.assertEqual(len(responses[0]['body']), 2)
+        self.assertEqual(
+            [recipe['title'] for recipe in responses[1]['body']], ['Pancake']
+        )
+
+    def test_authenticated_once(self):
+        with patch.object(
+            TokenAuthentication,
+            'authenticate_credentials',
+            autospec=True,
+            side_effect=TokenAuthentication.authenticate_credentials
+        ) as authenticate:
+            self.batch(ME_URL, TAGS_URL, RECIPES_URL)
+
+        self.assertEqual(authenticate.call_count, 1)
+
+    def test_sub_request_errors(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        recipe = create_recipe(other, 'Other')
+
+        responses = self.batch(
+            reverse('recipe:recipe-detail', args=[recipe.id]),
+            f'{RECIPES_URL}?price_min=cheap',
+            reverse('sync:sync'),
+            '/missing/',
+            EXPORT_URL,
+        )
+
+        self.assertEqual(
+            [response['status'] for response in responses],
+            [404, 400, 404, 404, 400]
+        )
+        self.assertIn('price_min', responses[1]['body'])
+
+    def test_failing_sub_request_isolated(self):
+        Tag.objects.create(user=self.user, name='Dinner')
+
+        with self.assertLogs('batch', 'ERROR'):
+            responses = self.batch(
+                f'{INGREDIENTS_URL}?assigned_only=abc', TAGS_URL
+            )
+
+        self.assertEqual(
+            [response['status'] for response in responses], [500, 200]
+        )
+        self.assertEqual(responses[1]['body'][0]['name'], 'Dinner')
+
+    def test_streamed_responses_released(self):
+        closed = []
+
+        def content():
+            try:
+                yield b'[]'
+            finally:
+                closed.append(True)
+
+        def export(view, request):
+            stream = content()
+            next(stream)
+            return StreamingHttpResponse(stream)
+
+        with patch('recipe.views.RecipeViewSet.export', export):
+            responses = self.batch(EXPORT_URL)
+
+        self.assertEqual(responses[0]['status'], 400)
+        self.assertEqual(closed, [True])
+
+    def test_next_links_are_public_urls(self):
+        for i in range(3):
+            create_recipe(self.user, f'Recipe {i}')
+
+        responses = self.batch(f'{RECIPES_URL}?page_size=2')
+
+        first = responses[0]['body']
+        self.assertEqual(len(first['recipes']), 2)
+        second = self.client.get(first['next'])
+        self.assertEqual(len(second.data['recipes']), 1)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_invalid_batch(self):
+        invalid = [
+            {'requests': []},
+            {'requests': [{'method': 'POST', 'path': RECIPES_URL}]},
+            {'requests': [{'path': 'recipes/'}]},
+            {'requests': [{'path': ME_URL}] * 3},
+        ]
+        for payload in invalid:
+            with self.subTest(payload=payload):
+                res = self.client.post(BATCH_URL, payload, format='json')
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
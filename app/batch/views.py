@@ -0,0 +1,142 @@
+"""
+Batched reads: several GET requests against the recipe and user APIs
+answered in one round trip.
+
+The batch is authenticated once, and each sub-request is dispatched
+straight to its view as the batch's user, skipping middleware. They run
+one after another on the batch's database connection, inside a single
+REPEATABLE READ transaction, so every response reads the same snapshot.
+A sub-request that fails gets a 500 entry of its own, its writes rolled
+back to a savepoint, and the rest of the batch still runs.
+"""
+import logging
+from urllib.parse import unquote
+
+from django.db import (
+    connection,
+    transaction
+)
+from django.http import (
+    HttpRequest,
+    QueryDict
+)
+from django.urls import (
+    Resolver404,
+    resolve
+)
+from drf_spectacular.utils import extend_schema
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from batch.serializers import (
+    BatchResultSerializer,
+    BatchSerializer
+)
+from monitoring.profiling import ProfilingMixin
+
+logger = logging.getLogger('batch')
+
+NAMESPACES = {'recipe', 'user'}
+
+# Request headers describing the batch's own body.
+BODY_HEADERS = {'CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_CONTENT_ENCODING'}
+
+
+class SubRequest(HttpRequest):
+    """A GET of `path` on behalf of the batch `request`'s user."""
+
+    def __init__(self, request, path, query_string):
+        super().__init__()
+        self.method = 'GET'
+        self.path = self.path_info = path
+        self.META = {
+            key: value for key, value in request.META.items()
+            if key not in BODY_HEADERS
+        }
+        self.META.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': query_string,
+            'HTTP_ACCEPT': 'application/json',
+        })
+        self.GET = QueryDict(query_string)
+        self.COOKIES = request.COOKIES
+        self.user = request.user
+        self._scheme = request.scheme
+        # The batch's credentials were checked once already. DRF's Request
+        # authenticates a request carrying these with ForcedAuthentication
+        # instead of running the view's authenticators again.
+        self._force_auth_user = request.user
+        self._force_auth_token = request.auth
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+def _release(response):
+    # HttpResponse.close() also sends request_finished, which can close
+    # the database connection the rest of the batch runs on; only the
+    # response's own resources, such as a FileResponse's file, are closed.
+    for closer in response._resource_closers:
+        closer()
+    response._resource_closers.clear()
+
+
+def _error(status, detail):
+    return {'status': status, 'body': {'detail': detail}}
+
+
+def execute(request, path):
+    """Run the GET `path` for the batch `request`; return its result."""
+    # Not urlsplit: it reads '//recipes/' as a host named 'recipes'.
+    path, _, query_string = path.partition('?')
+    path = unquote(path)
+    try:
+        match = resolve(path)
+    except Resolver404:
+        match = None
+    if match is None or not NAMESPACES & set(match.namespaces):
+        return _error(404, 'Not found.')
+
+    sub_request = SubRequest(request, path, query_string)
+    sub_request.resolver_match = match
+    try:
+        with transaction.atomic():
+            response = match.func(sub_request, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception('Batched request to %s failed', path)
+        return _error(500, 'Internal server error.')
+
+    try:
+        if response.streaming or not isinstance(response, Response):
+            return _error(400, 'Only JSON responses can be batched.')
+        return {'status': response.status_code, 'body': response.data}
+    finally:
+        _release(response)
+
+
+class BatchView(ProfilingMixin, APIView):
+    """Several GET requests to the recipe and user APIs at once."""
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=BatchSerializer, responses=BatchResultSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Only an outermost transaction can still choose its isolation.
+        snapshot = connection.get_autocommit()
+        with transaction.atomic():
+            if snapshot:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ'
+                    )
+            responses = [
+                execute(request, item['path'])
+                for item in serializer.validated_data['requests']
+            ]
+        return Response({'responses': responses})
@@ -0,0 +1,85 @@
+"""
+Minimal keep-alive HTTP client used by the load-test virtual users.
+"""
+import http.client
+import json
+import uuid
+from urllib.parse import (
+    urlencode,
+    urlsplit
+)
+
+
+class HttpError(Exception):
+    pass
+
+
+def encode_multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f'{value}\r\n'.encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{name}"; '
+            f'filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode()
+            + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Session:
+    def __init__(self, base_url, timeout=30):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.timeout = timeout
+        self.token = None
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def request(self, method, path, params=None, json_body=None,
+                body=None, content_type=None):
+        headers = {'Accept': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Token {self.token}'
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            content_type = 'application/json'
+        if content_type:
+            headers['Content-Type'] = content_type
+        if params:
+            path = f'{path}?{urlencode(params)}'
+
+        try:
+            connection = self._connect()
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException) as error:
+            self.close()
+            raise HttpError(str(error)) from error
+
+        if response.getheader('Connection', '').lower() == 'close':
+            self.close()
+
+        return response.status, payload
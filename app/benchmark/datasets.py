@@ -0,0 +1,80 @@
+"""
+Seed data for benchmark runs.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+
+from core.models import (
+    Recipe,
+    Tag,
+    Ingredient
+)
+from user.jobs import purge
+
+BATCH_SIZE = 5000
+TAGS_PER_USER = 30
+INGREDIENTS_PER_USER = 200
+TAGS_PER_RECIPE = 3
+INGREDIENTS_PER_RECIPE = 6
+PASSWORD = 'benchmark-password'
+
+
+def _batches(count, size=BATCH_SIZE):
+    for start in range(0, count, size):
+        yield range(start, min(start + size, count))
+
+
+def create_dataset(recipe_count, email):
+    # A dataset kept from an earlier run (--keepdb) is replaced.
+    existing = get_user_model().objects.filter(email=email).first()
+    if existing is not None:
+        purge(existing.id)
+
+    user = get_user_model().objects.create_user(
+        email=email,
+        password=PASSWORD,
+        name='Benchmark User'
+    )
+    tags = Tag.objects.bulk_create([
+        Tag(user=user, name=f'Tag {i}') for i in range(TAGS_PER_USER)
+    ])
+    ingredients = Ingredient.objects.bulk_create([
+        Ingredient(user=user, name=f'Ingredient {i}')
+        for i in range(INGREDIENTS_PER_USER)
+    ])
+
+    recipe_tags = Recipe.tags.through
+    recipe_ingredients = Recipe.ingredients.through
+    for batch in _batches(recipe_count):
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                user=user,
+                title=f'Recipe {i}',
+                description='Benchmark recipe description. ' * 5,
+                time_minutes=5 + i % 120,
+                price=Decimal(100 + i % 4900) / 100,
+                link=f'https://example.com/recipes/{i}',
+            )
+            for i in batch
+        ])
+        recipe_tags.objects.bulk_create([
+            recipe_tags(
+                recipe_id=recipe.id,
+                tag_id=tags[(i + n * 7) % TAGS_PER_USER].id
+            )
+            for i, recipe in zip(batch, recipes)
+            for n in range(TAGS_PER_RECIPE)
+        ])
+        recipe_ingredients.objects.bulk_create([
+            recipe_ingredients(
+                recipe_id=recipe.id,
+                ingredient_id=ingredients[
+                    (i + n * 13) % INGREDIENTS_PER_USER
+                ].id
+            )
+            for i, recipe in zip(batch, recipes)
+            for n in range(INGREDIENTS_PER_RECIPE)
+        ])
+
+    return user
@@ -0,0 +1,101 @@
+"""
+PostgreSQL-side statistics collected while a load test runs.
+"""
+import threading
+
+from django.db import connections
+
+DATABASE_COUNTERS = [
+    'xact_commit',
+    'xact_rollback',
+    'blks_read',
+    'blks_hit',
+    'tup_returned',
+    'tup_fetched',
+    'tup_inserted',
+    'tup_updated',
+    'tup_deleted',
+    'conflicts',
+    'deadlocks',
+    'temp_files',
+    'temp_bytes',
+]
+
+
+def database_counters(alias='default'):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            f'SELECT {", ".join(DATABASE_COUNTERS)} '
+            'FROM pg_stat_database WHERE datname = current_database()'
+        )
+        row = cursor.fetchone()
+
+    return dict(zip(DATABASE_COUNTERS, (int(value or 0) for value in row)))
+
+
+def activity_snapshot(alias='default'):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'SELECT count(*), '
+            "count(*) FILTER (WHERE state = 'active'), "
+            "count(*) FILTER (WHERE state LIKE 'idle in transaction%'), "
+            "count(*) FILTER (WHERE wait_event_type = 'Lock') "
+            'FROM pg_stat_activity WHERE datname = current_database()'
+        )
+        total, active, idle_in_transaction, lock_waits = cursor.fetchone()
+        cursor.execute('SELECT count(*) FROM pg_locks WHERE NOT granted')
+        ungranted_locks = cursor.fetchone()[0]
+
+    return {
+        'connections': total,
+        'active': active,
+        'idle_in_transaction': idle_in_transaction,
+        'lock_waits': lock_waits,
+        'ungranted_locks': ungranted_locks,
+    }
+
+
+def max_connections(alias='default'):
+    with connections[alias].cursor() as cursor:
+        cursor.execute('SHOW max_connections')
+        return int(cursor.fetchone()[0])
+
+
+class DatabaseSampler(threading.Thread):
+    def __init__(self, interval=1.0, alias='default'):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.alias = alias
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                self.samples.append(activity_snapshot(self.alias))
+                self._stop_event.wait(self.interval)
+        finally:
+            connections[self.alias].close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def summary(self):
+        if not self.samples:
+            return {}
+        keys = self.samples[0].keys()
+        return {
+            key: {
+                'max': max(sample[key] for sample in self.samples),
+                'mean': round(
+                    sum(sample[key] for sample in self.samples)
+                    / len(self.samples), 2
+                ),
+            }
+            for key in keys
+        }
+
+
+def counter_deltas(before, after):
+    return {key: after[key] - before[key] for key in before}
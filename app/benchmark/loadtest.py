@@ -0,0 +1,163 @@
+"""
+Concurrent virtual users driving a running app server.
+"""
+import bisect
+import random
+import threading
+import time
+from collections import defaultdict
+
+from benchmark import scenarios
+from benchmark.client import (
+    HttpError,
+    Session
+)
+from benchmark.runner import percentile
+
+HISTOGRAM_BUCKETS_MS = [
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000
+]
+
+
+class ScenarioStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = defaultdict(int)
+        self.errors = 0
+
+    def record(self, latency_ms, status):
+        self.latencies.append(latency_ms)
+        if status is None:
+            self.errors += 1
+        else:
+            self.statuses[status] += 1
+            if status >= 400:
+                self.errors += 1
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        for status, count in other.statuses.items():
+            self.statuses[status] += count
+
+    def histogram(self):
+        counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for latency in self.latencies:
+            counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency)] += 1
+        labels = [f'<={bucket}ms' for bucket in HISTOGRAM_BUCKETS_MS]
+        labels.append(f'>{HISTOGRAM_BUCKETS_MS[-1]}ms')
+
+        return dict(zip(labels, counts))
+
+    def summary(self, duration):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            'requests': count,
+            'throughput_rps': round(count / duration, 2) if duration else 0,
+            'error_rate': round(self.errors / count, 4) if count else 0,
+            'statuses': {
+                str(status): hits for status, hits in self.statuses.items()
+            },
+            'p50_ms': _rounded(percentile(latencies, 50)),
+            'p95_ms': _rounded(percentile(latencies, 95)),
+            'p99_ms': _rounded(percentile(latencies, 99)),
+            'max_ms': _rounded(latencies[-1] if latencies else None),
+            'histogram': self.histogram(),
+        }
+
+
+def _rounded(value):
+    return None if value is None else round(value, 2)
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, base_url, account, mix, stop_event,
+                 think_time=0.0, seed=None):
+        super().__init__(daemon=True)
+        self.session = Session(base_url)
+        self.email = account['email']
+        self.recipe_ids = list(account['recipe_ids'])
+        self.tag_ids = list(account['tag_ids'])
+        self.ingredient_ids = list(account['ingredient_ids'])
+        self.created_ids = []
+        self.picker = scenarios.Picker(mix, seed=seed)
+        self.rng = random.Random(seed)
+        self.stop_event = stop_event
+        self.think_time = think_time
+        self.stats = defaultdict(ScenarioStats)
+
+    def _run_scenario(self, name):
+        start = time.perf_counter()
+        try:
+            status = scenarios.SCENARIOS[name](self)
+        except scenarios.Substitute as substitute:
+            return self._run_scenario(substitute.name)
+        except HttpError:
+            status = None
+        self.stats[name].record((time.perf_counter() - start) * 1000, status)
+
+    def run(self):
+        try:
+            self._run_scenario('login')
+            while not self.stop_event.is_set():
+                self._run_scenario(self.picker.pick())
+                if self.think_time:
+                    self.stop_event.wait(
+                        self.rng.uniform(0, 2 * self.think_time)
+                    )
+        finally:
+            self.session.close()
+
+
+class LoadTest:
+    def __init__(self, base_url, accounts, mix=None, think_time=0.0,
+                 ramp_up=0.0, seed=0):
+        self.base_url = base_url
+        self.accounts = accounts
+        self.mix = mix or scenarios.DEFAULT_MIX
+        self.think_time = think_time
+        self.ramp_up = ramp_up
+        self.seed = seed
+
+    def run(self, users, duration):
+        stop_event = threading.Event()
+        virtual_users = [
+            VirtualUser(
+                self.base_url,
+                self.accounts[index % len(self.accounts)],
+                self.mix,
+                stop_event,
+                think_time=self.think_time,
+                seed=self.seed + index
+            )
+            for index in range(users)
+        ]
+
+        start = time.perf_counter()
+        for virtual_user in virtual_users:
+            virtual_user.start()
+            if self.ramp_up:
+                time.sleep(self.ramp_up / users)
+        stop_event.wait(max(duration - (time.perf_counter() - start), 0))
+        stop_event.set()
+        for virtual_user in virtual_users:
+            virtual_user.join()
+        elapsed = time.perf_counter() - start
+
+        combined = defaultdict(ScenarioStats)
+        total = ScenarioStats()
+        for virtual_user in virtual_users:
+            for name, stats in virtual_user.stats.items():
+                combined[name].merge(stats)
+                total.merge(stats)
+
+        return {
+            'users': users,
+            'duration_s': round(elapsed, 2),
+            'total': total.summary(elapsed),
+            'scenarios': {
+                name: stats.summary(elapsed)
+                for name, stats in sorted(combined.items())
+            },
+        }
@@ -0,0 +1,135 @@
+import tempfile
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment
+)
+
+from benchmark.results import (
+    build_report,
+    compare,
+    load_report,
+    parse_thresholds,
+    save_report
+)
+from benchmark.runner import Runner
+
+DEFAULT_SIZES = '10,1000,100000'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every route in recipe.urls and user.urls against '
+        'seeded datasets in a throwaway database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default=DEFAULT_SIZES,
+            help='Comma separated recipes-per-user dataset sizes.'
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument(
+            '--routes',
+            help='Only benchmark routes whose name contains this value.'
+        )
+        parser.add_argument(
+            '--output', default='benchmark-results.json',
+            help='Where to write the JSON results.'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON results to compare against.'
+        )
+        parser.add_argument(
+            '--threshold', action='append', dest='thresholds',
+            metavar='METRIC=RATIO',
+            help='Allowed relative increase per metric, e.g. p95_ms=0.2.'
+        )
+        parser.add_argument(
+            '--keepdb', action='store_true',
+            help='Keep the benchmark database between runs.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+            thresholds = parse_thresholds(options['thresholds'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        runner = Runner(
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            route_filter=options['routes']
+        )
+        results, uncovered = self._run(runner, sizes, options['keepdb'])
+
+        report = build_report(results, uncovered)
+        save_report(report, options['output'])
+        self._print(report)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+        if uncovered:
+            self.stdout.write(self.style.WARNING(
+                'Routes without a benchmark case: ' + ', '.join(uncovered)
+            ))
+
+        if options['baseline']:
+            self._check_baseline(report, options['baseline'], thresholds)
+
+    def _run(self, runner, sizes, keepdb):
+        old_name = connection.settings_dict['NAME']
+        setup_test_environment(debug=False)
+        connection.creation.create_test_db(
+            verbosity=0,
+            autoclobber=True,
+            serialize=False,
+            keepdb=keepdb
+        )
+        try:
+            with tempfile.TemporaryDirectory() as media_root, \
+                    override_settings(MEDIA_ROOT=media_root):
+                return runner.run(sizes)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name,
+                verbosity=0,
+                keepdb=keepdb
+            )
+            teardown_test_environment()
+
+    def _print(self, report):
+        for size, routes in report['results'].items():
+            self.stdout.write(f'\n{size} recipes per user')
+            for route, metrics in routes.items():
+                self.stdout.write(
+                    f'  {route:<40} p50 {metrics["p50_ms"]:>9.2f}ms  '
+                    f'p95 {metrics["p95_ms"]:>9.2f}ms  '
+                    f'queries {metrics["queries"]:>4}  '
+                    f'alloc {metrics["alloc_kb"]:>9.1f}KB'
+                )
+
+    def _check_baseline(self, report, baseline_path, thresholds):
+        regressions = compare(report, load_report(baseline_path), thresholds)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions.'))
+            return
+
+        for regression in regressions:
+            change = (
+                f'+{regression.change:.0%}'
+                if regression.change is not None else 'new'
+            )
+            self.stdout.write(self.style.ERROR(
+                f'{regression.size} {regression.route} {regression.metric}: '
+                f'{regression.baseline} -> {regression.current} ({change})'
+            ))
+        raise CommandError(f'{len(regressions)} benchmark regressions.')
@@ -0,0 +1,29 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from benchmark.render import compare_renderers
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON render throughput on large recipe list payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10000)
+        parser.add_argument('--rounds', type=int, default=10)
+
+    def handle(self, *args, **options):
+        results = compare_renderers(options['recipes'], options['rounds'])
+        for name in ('drf', 'fast'):
+            metrics = results[name]
+            self.stdout.write(
+                f'{name:<5} best {metrics["best_ms"]:>9.2f}ms  '
+                f'mean {metrics["mean_ms"]:>9.2f}ms  '
+                f'{metrics["rows_per_s"]:>10} rows/s  '
+                f'{metrics["bytes"]} bytes'
+            )
+        self.stdout.write(f'speedup {results["speedup"]}x')
+
+        if not results['identical']:
+            raise CommandError('Renderers produced different output.')
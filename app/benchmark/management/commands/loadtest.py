@@ -0,0 +1,213 @@
+import json
+import shlex
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from core.models import (
+    Recipe,
+    Tag,
+    Ingredient
+)
+from benchmark import dbstats
+from benchmark.datasets import create_dataset
+from benchmark.loadtest import LoadTest
+from benchmark.scenarios import (
+    DEFAULT_MIX,
+    parse_mix
+)
+
+DEFAULT_SERVER_COMMAND = (
+    f'{sys.executable} manage.py runserver --noreload 127.0.0.1:{{port}}'
+)
+SAMPLED_IDS = 500
+
+
+def _wait_for_port(port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class Command(BaseCommand):
+    help = (
+        'Run concurrent virtual users with a mixed workload against a '
+        'local app server and report throughput, latency and DB stats.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help='Drive an already running server instead of starting one.'
+        )
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--server-command', default=DEFAULT_SERVER_COMMAND,
+            help='Command used to start the server, {port} is substituted.'
+        )
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--duration', type=float, default=60)
+        parser.add_argument('--ramp-up', type=float, default=5)
+        parser.add_argument(
+            '--think-time', type=float, default=0.0,
+            help='Mean pause between requests of one user, in seconds.'
+        )
+        parser.add_argument(
+            '--accounts', type=int, default=5,
+            help='Seeded accounts shared by the virtual users.'
+        )
+        parser.add_argument(
+            '--recipes', type=int, default=1000,
+            help='Seeded recipes per account.'
+        )
+        parser.add_argument(
+            '--mix',
+            default=','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()),
+            help='Scenario weights, e.g. list=50,detail=30,create=20.'
+        )
+        parser.add_argument('--output', help='Write the report as JSON.')
+        parser.add_argument(
+            '--keep-data', action='store_true',
+            help='Do not delete the seeded accounts afterwards.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        self.stdout.write('Seeding accounts...')
+        users, accounts = self._seed(options['accounts'], options['recipes'])
+        server = None
+        try:
+            base_url = options['url']
+            if not base_url:
+                server = self._start_server(
+                    options['server_command'], options['port']
+                )
+                base_url = f'http://127.0.0.1:{options["port"]}'
+
+            report = self._run(base_url, accounts, mix, options)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+            if not options['keep_data']:
+                for user in users:
+                    user.delete()
+
+        self._print(report)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+
+    def _seed(self, count, recipes):
+        run_id = uuid.uuid4().hex[:8]
+        users = []
+        accounts = []
+        for index in range(count):
+            user = create_dataset(
+                recipes, email=f'load-{run_id}-{index}@example.com'
+            )
+            users.append(user)
+            accounts.append({
+                'email': user.email,
+                'recipe_ids': list(
+                    Recipe.objects.filter(user=user).values_list(
+                        'id', flat=True
+                    )[:SAMPLED_IDS]
+                ),
+                'tag_ids': list(
+                    Tag.objects.filter(user=user).values_list('id', flat=True)
+                ),
+                'ingredient_ids': list(
+                    Ingredient.objects.filter(user=user).values_list(
+                        'id', flat=True
+                    )[:SAMPLED_IDS]
+                ),
+            })
+
+        return users, accounts
+
+    def _start_server(self, command, port):
+        self.stdout.write(f'Starting server on port {port}...')
+        server = subprocess.Popen(
+            shlex.split(command.format(port=port)),
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        if not _wait_for_port(port, timeout=30):
+            server.terminate()
+            raise CommandError('Server did not start listening in time.')
+
+        return server
+
+    def _run(self, base_url, accounts, mix, options):
+        sampler = dbstats.DatabaseSampler()
+        counters_before = dbstats.database_counters()
+        sampler.start()
+        try:
+            report = LoadTest(
+                base_url,
+                accounts,
+                mix=mix,
+                think_time=options['think_time'],
+                ramp_up=options['ramp_up']
+            ).run(options['users'], options['duration'])
+        finally:
+            sampler.stop()
+
+        report['database'] = {
+            'max_connections': dbstats.max_connections(),
+            'activity': sampler.summary(),
+            'counters': dbstats.counter_deltas(
+                counters_before, dbstats.database_counters()
+            ),
+        }
+        return report
+
+    def _print(self, report):
+        total = report['total']
+        self.stdout.write(
+            f'\n{report["users"]} users for {report["duration_s"]}s: '
+            f'{total["requests"]} requests, '
+            f'{total["throughput_rps"]} req/s, '
+            f'error rate {total["error_rate"]:.2%}'
+        )
+        for name, stats in report['scenarios'].items():
+            self.stdout.write(
+                f'  {name:<14} {stats["requests"]:>7} req  '
+                f'{stats["throughput_rps"]:>8} req/s  '
+                f'p50 {stats["p50_ms"]}ms  p95 {stats["p95_ms"]}ms  '
+                f'p99 {stats["p99_ms"]}ms  errors {stats["error_rate"]:.2%}'
+            )
+            self.stdout.write('    ' + '  '.join(
+                f'{bucket} {count}'
+                for bucket, count in stats['histogram'].items() if count
+            ))
+
+        database = report['database']
+        self.stdout.write(
+            f'\nDatabase (max_connections {database["max_connections"]})'
+        )
+        for key, values in database['activity'].items():
+            self.stdout.write(
+                f'  {key:<20} max {values["max"]:>5}  mean {values["mean"]}'
+            )
+        for key, value in database['counters'].items():
+            self.stdout.write(f'  {key:<20} {value}')
@@ -0,0 +1,67 @@
+"""
+Render throughput of the JSON renderers on large recipe list payloads.
+"""
+import time
+from collections import OrderedDict
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from core.renderers import FastJSONRenderer
+
+RENDERERS = {
+    'drf': JSONRenderer,
+    'fast': FastJSONRenderer,
+}
+
+
+def recipe_payload(count):
+    return ReturnList([
+        OrderedDict([
+            ('id', index),
+            ('title', f'Recipe {index} – crème brûlée'),
+            ('time_minutes', 5 + index % 120),
+            ('price', f'{(100 + index % 4900) / 100:.2f}'),
+            ('link', f'https://example.com/recipes/{index}'),
+            ('tags', [
+                OrderedDict([('id', tag), ('name', f'Tag {tag}')])
+                for tag in range(index % 30, index % 30 + 3)
+            ]),
+            ('ingredients', [
+                OrderedDict([('id', item), ('name', f'Ingredient {item}')])
+                for item in range(index % 200, index % 200 + 6)
+            ]),
+        ])
+        for index in range(count)
+    ], serializer=None)
+
+
+def measure(renderer_class, payload, rounds):
+    renderer = renderer_class()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        content = renderer.render(payload)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        'best_ms': round(best * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'rows_per_s': round(len(payload) / best),
+        'bytes': len(content),
+    }, content
+
+
+def compare_renderers(count=10000, rounds=10):
+    payload = recipe_payload(count)
+    results = {}
+    outputs = {}
+    for name, renderer_class in RENDERERS.items():
+        results[name], outputs[name] = measure(renderer_class, payload, rounds)
+
+    results['identical'] = outputs['drf'] == outputs['fast']
+    results['speedup'] = round(
+        results['drf']['best_ms'] / results['fast']['best_ms'], 2
+    )
+    return results
@@ -0,0 +1,77 @@
+"""
+Benchmark result files and regression checks against a baseline.
+"""
+import json
+import platform
+from collections import namedtuple
+
+import django
+from django.utils import timezone
+
+DEFAULT_THRESHOLDS = {
+    'p95_ms': 0.25,
+    'queries': 0.0,
+    'alloc_kb': 0.25,
+}
+
+Regression = namedtuple(
+    'Regression',
+    ['size', 'route', 'metric', 'baseline', 'current', 'change']
+)
+
+
+def build_report(results, uncovered=()):
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'uncovered': list(uncovered),
+        'results': results,
+    }
+
+
+def save_report(report, path):
+    with open(path, 'w') as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+
+
+def load_report(path):
+    with open(path) as report_file:
+        return json.load(report_file)
+
+
+def parse_thresholds(values):
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for value in values or []:
+        metric, _, ratio = value.partition('=')
+        if not ratio:
+            raise ValueError(f'Expected metric=ratio, got "{value}"')
+        thresholds[metric.strip()] = float(ratio)
+
+    return thresholds
+
+
+def compare(current, baseline, thresholds=None):
+    thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    regressions = []
+    for size, routes in current['results'].items():
+        baseline_routes = baseline['results'].get(size, {})
+        for route, metrics in routes.items():
+            baseline_metrics = baseline_routes.get(route)
+            if baseline_metrics is None:
+                continue
+            for metric, ratio in thresholds.items():
+                value = metrics.get(metric)
+                base = baseline_metrics.get(metric)
+                if value is None or base is None:
+                    continue
+                if value <= base * (1 + ratio):
+                    continue
+                change = (value - base) / base if base else None
+                regressions.append(
+                    Regression(size, route, metric, base, value, change)
+                )
+
+    return regressions
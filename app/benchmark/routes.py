@@ -0,0 +1,285 @@
+"""
+Route discovery and the request each benchmarked route is driven with.
+"""
+import io
+import uuid
+from collections import namedtuple
+from decimal import Decimal
+
+from PIL import Image
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import (
+    URLPattern,
+    URLResolver,
+    get_resolver,
+    reverse
+)
+
+from core import jobs
+from core.models import (
+    Job,
+    Recipe,
+    Tag,
+    Ingredient
+)
+from benchmark.datasets import (
+    INGREDIENTS_PER_RECIPE,
+    PASSWORD,
+    TAGS_PER_RECIPE
+)
+from recipe.jobs import (
+    ARCHIVE_JOB,
+    build_archive
+)
+
+URLCONFS = [
+    ('recipe', 'recipe.urls'),
+    ('user', 'user.urls'),
+]
+IGNORED_METHODS = {'head', 'options'}
+
+Route = namedtuple('Route', ['name', 'method'])
+Call = namedtuple('Call', ['method', 'path', 'data', 'format'])
+
+
+def _pattern_methods(pattern):
+    callback = pattern.callback
+    actions = getattr(callback, 'actions', None)
+    if actions:
+        return [method for method in actions if method not in IGNORED_METHODS]
+
+    view_class = getattr(callback, 'view_class', None) or getattr(
+        callback, 'cls', None
+    )
+    if view_class is None:
+        return ['get']
+
+    return [
+        method for method in view_class.http_method_names
+        if method not in IGNORED_METHODS and hasattr(view_class, method)
+    ]
+
+
+def _walk(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern
+
+
+def discover_routes(urlconfs=URLCONFS):
+    routes = []
+    for namespace, module in urlconfs:
+        for pattern in _walk(get_resolver(module).url_patterns):
+            for method in _pattern_methods(pattern):
+                route = Route(f'{namespace}:{pattern.name}', method.upper())
+                if route not in routes:
+                    routes.append(route)
+
+    return routes
+
+
+def _recipe_payload(suffix=''):
+    return {
+        'title': f'Benchmark recipe{suffix}',
+        'time_minutes': 25,
+        'price': Decimal('7.50'),
+        'link': 'https://example.com/benchmark',
+        'tags': [{'name': 'Tag 1'}, {'name': 'Tag 2'}],
+        'ingredients': [{'name': 'Ingredient 1'}, {'name': 'Ingredient 2'}],
+    }
+
+
+def _image_file():
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64)).save(buffer, format='JPEG')
+    return SimpleUploadedFile(
+        'benchmark.jpg',
+        buffer.getvalue(),
+        content_type='image/jpeg'
+    )
+
+
+def _fresh_recipe(ctx):
+    return Recipe.objects.create(
+        user=ctx.user,
+        title='Disposable recipe',
+        time_minutes=5,
+        price=Decimal('1.00')
+    )
+
+
+def _linked_recipe(ctx):
+    # Mutating cases get their own recipe, linked like the dataset's, so
+    # the shared ctx.recipe_id read by other cases is never changed.
+    recipe = _fresh_recipe(ctx)
+    recipe.tags.add(*Tag.objects.filter(user=ctx.user)[:TAGS_PER_RECIPE])
+    recipe.ingredients.add(*Ingredient.objects.filter(
+        user=ctx.user
+    )[:INGREDIENTS_PER_RECIPE])
+    return recipe
+
+
+def _disposable(model, ctx):
+    # Names are unique per user, so every call needs a new one.
+    return model.objects.create(
+        user=ctx.user, name=f'Disposable {uuid.uuid4().hex}'
+    )
+
+
+def _disposable_tag(ctx):
+    tag = _disposable(Tag, ctx)
+    _fresh_recipe(ctx).tags.add(tag)
+    return tag
+
+
+def _merge_payload(model, ctx):
+    target, source = _disposable(model, ctx), _disposable(model, ctx)
+    return {'target': target.id, 'sources': [source.id]}
+
+
+def _archive(ctx):
+    job = Job.objects.filter(
+        user=ctx.user, name=ARCHIVE_JOB, status=Job.STATUS_SUCCEEDED
+    ).exclude(result__file=None).first()
+    if job is None:
+        job = jobs.enqueue(ARCHIVE_JOB, user=ctx.user)
+        Job.objects.filter(id=job.id).update(
+            status=Job.STATUS_SUCCEEDED, result=build_archive(job)
+        )
+    return job
+
+
+def _recipe_url(name, recipe_id):
+    return reverse(f'recipe:{name}', args=[recipe_id])
+
+
+CASES = {
+    Route('recipe:api-root', 'GET'): lambda ctx: Call(
+        'GET', reverse('recipe:api-root'), None, None
+    ),
+    Route('recipe:recipe-list', 'GET'): lambda ctx: Call(
+        'GET', reverse('recipe:recipe-list'), None, None
+    ),
+    Route('recipe:recipe-export', 'GET'): lambda ctx: Call(
+        'GET', reverse('recipe:recipe-export'), None, None
+    ),
+    Route('recipe:recipe-match', 'POST'): lambda ctx: Call(
+        'POST', reverse('recipe:recipe-match'),
+        {'ingredients': [ctx.ingredient_id], 'max_missing': 2}, 'json'
+    ),
+    Route('recipe:recipe-list', 'POST'): lambda ctx: Call(
+        'POST', reverse('recipe:recipe-list'), _recipe_payload(), 'json'
+    ),
+    Route('recipe:recipe-list', 'DELETE'): lambda ctx: Call(
+        'DELETE',
+        f"{reverse('recipe:recipe-list')}?tags={_disposable_tag(ctx).id}",
+        None, None
+    ),
+    Route('recipe:recipe-detail', 'GET'): lambda ctx: Call(
+        'GET', _recipe_url('recipe-detail', ctx.recipe_id), None, None
+    ),
+    Route('recipe:recipe-detail', 'PUT'): lambda ctx: Call(
+        'PUT',
+        _recipe_url('recipe-detail', _linked_recipe(ctx).id),
+        _recipe_payload(' (put)'),
+        'json'
+    ),
+    Route('recipe:recipe-detail', 'PATCH'): lambda ctx: Call(
+        'PATCH',
+        _recipe_url('recipe-detail', _linked_recipe(ctx).id),
+        {'title': 'Patched recipe'},
+        'json'
+    ),
+    Route('recipe:recipe-detail', 'DELETE'): lambda ctx: Call(
+        'DELETE', _recipe_url('recipe-detail', _fresh_recipe(ctx).id),
+        None, None
+    ),
+    Route('recipe:recipe-similar', 'GET'): lambda ctx: Call(
+        'GET', _recipe_url('recipe-similar', ctx.recipe_id), None, None
+    ),
+    Route('recipe:recipe-upload-image', 'POST'): lambda ctx: Call(
+        'POST',
+        _recipe_url('recipe-upload-image', _fresh_recipe(ctx).id),
+        {'image': _image_file()},
+        'multipart'
+    ),
+    Route('recipe:archive-list', 'GET'): lambda ctx: Call(
+        'GET', reverse('recipe:archive-list'), None, None
+    ),
+    Route('recipe:archive-list', 'POST'): lambda ctx: Call(
+        'POST', reverse('recipe:archive-list'), None, None
+    ),
+    Route('recipe:archive-detail', 'GET'): lambda ctx: Call(
+        'GET', _recipe_url('archive-detail', _archive(ctx).id), None, None
+    ),
+    Route('recipe:archive-download', 'GET'): lambda ctx: Call(
+        'GET', _recipe_url('archive-download', _archive(ctx).id), None, None
+    ),
+    Route('recipe:tag-list', 'GET'): lambda ctx: Call(
+        'GET', reverse('recipe:tag-list'), None, None
+    ),
+    Route('recipe:tag-detail', 'PUT'): lambda ctx: Call(
+        'PUT', _recipe_url('tag-detail', ctx.tag_id),
+        {'name': 'Tag 0'}, 'json'
+    ),
+    Route('recipe:tag-detail', 'PATCH'): lambda ctx: Call(
+        'PATCH', _recipe_url('tag-detail', ctx.tag_id),
+        {'name': 'Tag 0'}, 'json'
+    ),
+    Route('recipe:tag-detail', 'DELETE'): lambda ctx: Call(
+        'DELETE',
+        _recipe_url('tag-detail', _disposable(Tag, ctx).id),
+        None, None
+    ),
+    Route('recipe:tag-merge', 'POST'): lambda ctx: Call(
+        'POST', reverse('recipe:tag-merge'), _merge_payload(Tag, ctx), 'json'
+    ),
+    Route('recipe:ingredient-list', 'GET'): lambda ctx: Call(
+        'GET', reverse('recipe:ingredient-list'), None, None
+    ),
+    Route('recipe:ingredient-detail', 'PUT'): lambda ctx: Call(
+        'PUT', _recipe_url('ingredient-detail', ctx.ingredient_id),
+        {'name': 'Ingredient 0'}, 'json'
+    ),
+    Route('recipe:ingredient-detail', 'PATCH'): lambda ctx: Call(
+        'PATCH', _recipe_url('ingredient-detail', ctx.ingredient_id),
+        {'name': 'Ingredient 0'}, 'json'
+    ),
+    Route('recipe:ingredient-detail', 'DELETE'): lambda ctx: Call(
+        'DELETE',
+        _recipe_url('ingredient-detail', _disposable(Ingredient, ctx).id),
+        None, None
+    ),
+    Route('recipe:ingredient-merge', 'POST'): lambda ctx: Call(
+        'POST', reverse('recipe:ingredient-merge'),
+        _merge_payload(Ingredient, ctx), 'json'
+    ),
+    Route('user:create', 'POST'): lambda ctx: Call(
+        'POST', reverse('user:create'),
+        {
+            'email': f'{uuid.uuid4().hex}@example.com',
+            'password': PASSWORD,
+            'name': 'New User',
+        },
+        'json'
+    ),
+    Route('user:token', 'POST'): lambda ctx: Call(
+        'POST', reverse('user:token'),
+        {'email': ctx.user.email, 'password': PASSWORD},
+        'json'
+    ),
+    Route('user:me', 'GET'): lambda ctx: Call(
+        'GET', reverse('user:me'), None, None
+    ),
+    Route('user:me', 'PUT'): lambda ctx: Call(
+        'PUT', reverse('user:me'),
+        {'email': ctx.user.email, 'password': PASSWORD, 'name': 'Put'},
+        'json'
+    ),
+    Route('user:me', 'PATCH'): lambda ctx: Call(
+        'PATCH', reverse('user:me'), {'name': 'Patched'}, 'json'
+    ),
+}
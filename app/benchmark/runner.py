@@ -0,0 +1,158 @@
+"""
+Measure latency, query count and allocated memory per route.
+"""
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag,
+    Ingredient
+)
+from benchmark.datasets import create_dataset
+from benchmark.routes import (
+    CASES,
+    discover_routes
+)
+
+PERCENTILES = (50, 90, 95, 99)
+
+Context = namedtuple(
+    'Context',
+    ['user', 'recipe_id', 'tag_id', 'ingredient_id']
+)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = rank - lower
+
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+class Runner:
+    def __init__(self, iterations=20, warmup=2, route_filter=None):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.route_filter = route_filter
+
+    def routes(self):
+        routes = discover_routes()
+        if self.route_filter:
+            routes = [
+                route for route in routes
+                if self.route_filter in route.name
+            ]
+        return routes
+
+    def _client(self, user):
+        token, _ = Token.objects.get_or_create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        return client
+
+    def _request(self, client, call):
+        kwargs = {}
+        if call.data is not None:
+            kwargs['data'] = call.data
+        if call.format is not None:
+            kwargs['format'] = call.format
+        method = getattr(client, call.method.lower())
+
+        response = method(call.path, **kwargs)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def _measure(self, client, build, ctx):
+        for _ in range(self.warmup):
+            self._request(client, build(ctx))
+
+        timings = []
+        statuses = set()
+        for _ in range(self.iterations):
+            call = build(ctx)
+            start = time.perf_counter()
+            response = self._request(client, call)
+            timings.append((time.perf_counter() - start) * 1000)
+            statuses.add(response.status_code)
+
+        call = build(ctx)
+        with CaptureQueriesContext(connection) as queries:
+            self._request(client, call)
+        query_count = len(queries.captured_queries)
+
+        call = build(ctx)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            self._request(client, call)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        result = {
+            f'p{pct}_ms': round(percentile(timings, pct), 3)
+            for pct in PERCENTILES
+        }
+        result.update({
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'queries': query_count,
+            'alloc_kb': round(peak / 1024, 1),
+            'statuses': sorted(statuses),
+            'iterations': len(timings),
+        })
+        return result
+
+    def run_size(self, recipe_count):
+        user = create_dataset(
+            recipe_count,
+            email=f'benchmark-{recipe_count}@example.com'
+        )
+        ctx = Context(
+            user=user,
+            recipe_id=Recipe.objects.filter(user=user).values_list(
+                'id', flat=True
+            ).first(),
+            tag_id=Tag.objects.filter(user=user).values_list(
+                'id', flat=True
+            ).first(),
+            ingredient_id=Ingredient.objects.filter(user=user).values_list(
+                'id', flat=True
+            ).first(),
+        )
+        client = self._client(user)
+
+        results = {}
+        uncovered = []
+        for route in self.routes():
+            build = CASES.get(route)
+            if build is None:
+                uncovered.append(f'{route.method} {route.name}')
+                continue
+            results[f'{route.method} {route.name}'] = self._measure(
+                client, build, ctx
+            )
+
+        return results, uncovered
+
+    def run(self, sizes):
+        results = {}
+        uncovered = set()
+        for size in sizes:
+            results[str(size)], missing = self.run_size(size)
+            uncovered.update(missing)
+
+        return results, sorted(uncovered)
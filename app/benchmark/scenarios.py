@@ -0,0 +1,158 @@
+"""
+Load-test scenarios. Each scenario issues one request as a virtual user and
+returns the response status, or raises Substitute to run another scenario
+in its place.
+"""
+import io
+import json
+import random
+from decimal import Decimal
+
+from PIL import Image
+
+from django.urls import reverse
+
+from benchmark.client import encode_multipart
+from benchmark.datasets import PASSWORD
+
+
+def _image_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+IMAGE = _image_bytes()
+
+
+class Substitute(Exception):
+    """Run and record the scenario `name` instead of the one picked."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.name = name
+
+
+def login(user):
+    status, body = user.session.request(
+        'POST',
+        reverse('user:token'),
+        json_body={'email': user.email, 'password': PASSWORD}
+    )
+    if status == 200:
+        user.session.token = json.loads(body)['token']
+    return status
+
+
+def list_recipes(user):
+    params = {}
+    if user.tag_ids and user.rng.random() < 0.5:
+        tags = user.rng.sample(user.tag_ids, min(2, len(user.tag_ids)))
+        params['tags'] = ','.join(str(tag_id) for tag_id in tags)
+    if user.ingredient_ids and user.rng.random() < 0.3:
+        params['ingredients'] = str(user.rng.choice(user.ingredient_ids))
+
+    status, _ = user.session.request(
+        'GET', reverse('recipe:recipe-list'), params=params
+    )
+    return status
+
+
+def recipe_detail(user):
+    recipe_id = user.rng.choice(user.recipe_ids + user.created_ids)
+    status, _ = user.session.request(
+        'GET', reverse('recipe:recipe-detail', args=[recipe_id])
+    )
+    return status
+
+
+def create_recipe(user):
+    payload = {
+        'title': f'Load test recipe {user.rng.randint(0, 10 ** 6)}',
+        'time_minutes': user.rng.randint(5, 120),
+        'price': str(Decimal(user.rng.randint(100, 5000)) / 100),
+        'tags': [
+            {'name': f'Tag {user.rng.randint(0, 40)}'}
+            for _ in range(3)
+        ],
+        'ingredients': [
+            {'name': f'Ingredient {user.rng.randint(0, 250)}'}
+            for _ in range(5)
+        ],
+    }
+    status, body = user.session.request(
+        'POST', reverse('recipe:recipe-list'), json_body=payload
+    )
+    if status == 201:
+        user.created_ids.append(json.loads(body)['id'])
+    return status
+
+
+def upload_image(user):
+    recipe_id = user.rng.choice(user.created_ids or user.recipe_ids)
+    body, content_type = encode_multipart(
+        {}, {'image': ('load.jpg', IMAGE, 'image/jpeg')}
+    )
+    status, _ = user.session.request(
+        'POST',
+        reverse('recipe:recipe-upload-image', args=[recipe_id]),
+        body=body,
+        content_type=content_type
+    )
+    return status
+
+
+def delete_recipe(user):
+    if not user.created_ids:
+        # Only recipes made during the run are deleted; the create is
+        # recorded as one so it does not skew the delete latencies.
+        raise Substitute('create')
+
+    recipe_id = user.created_ids.pop(
+        user.rng.randrange(len(user.created_ids))
+    )
+    status, _ = user.session.request(
+        'DELETE', reverse('recipe:recipe-detail', args=[recipe_id])
+    )
+    return status
+
+
+SCENARIOS = {
+    'login': login,
+    'list': list_recipes,
+    'detail': recipe_detail,
+    'create': create_recipe,
+    'upload_image': upload_image,
+    'delete': delete_recipe,
+}
+
+DEFAULT_MIX = {
+    'login': 2,
+    'list': 40,
+    'detail': 30,
+    'create': 15,
+    'upload_image': 5,
+    'delete': 8,
+}
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f'Unknown scenario "{name}"')
+        mix[name] = int(weight or 1)
+
+    return mix
+
+
+class Picker:
+    def __init__(self, mix, seed=None):
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.rng = random.Random(seed)
+
+    def pick(self):
+        return self.rng.choices(self.names, weights=self.weights)[0]
@@ -0,0 +1,97 @@
+import tempfile
+
+from django.test import (
+    LiveServerTestCase,
+    SimpleTestCase,
+    override_settings
+)
+
+from core.models import (
+    Recipe,
+    Tag,
+    Ingredient
+)
+from benchmark import dbstats
+from benchmark.datasets import create_dataset
+from benchmark.loadtest import (
+    LoadTest,
+    ScenarioStats
+)
+from benchmark.scenarios import parse_mix
+
+
+class ScenarioStatsTests(SimpleTestCase):
+    def test_summary(self):
+        stats = ScenarioStats()
+        stats.record(3.0, 200)
+        stats.record(40.0, 201)
+        stats.record(700.0, 500)
+        stats.record(12.0, None)
+
+        summary = stats.summary(duration=2)
+
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['throughput_rps'], 2)
+        self.assertEqual(summary['error_rate'], 0.5)
+        self.assertEqual(summary['histogram']['<=5ms'], 1)
+        self.assertEqual(summary['histogram']['<=50ms'], 1)
+        self.assertEqual(summary['histogram']['<=1000ms'], 1)
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('list=3,detail'), {'list': 3, 'detail': 1})
+
+        with self.assertRaises(ValueError):
+            parse_mix('unknown=1')
+
+
+class LoadTestTests(LiveServerTestCase):
+    def _account(self, user):
+        return {
+            'email': user.email,
+            'recipe_ids': list(
+                Recipe.objects.filter(user=user).values_list('id', flat=True)
+            ),
+            'tag_ids': list(
+                Tag.objects.filter(user=user).values_list('id', flat=True)
+            ),
+            'ingredient_ids': list(
+                Ingredient.objects.filter(user=user).values_list(
+                    'id', flat=True
+                )
+            ),
+        }
+
+    def test_run_mixed_workload(self):
+        user = create_dataset(5, email='load@example.com')
+
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root):
+            report = LoadTest(
+                self.live_server_url, [self._account(user)]
+            ).run(users=2, duration=1)
+
+        self.assertGreater(report['total']['requests'], 2)
+        self.assertEqual(report['total']['error_rate'], 0)
+        self.assertEqual(report['scenarios']['login']['requests'], 2)
+
+    def test_delete_without_created_recipes_records_a_create(self):
+        user = create_dataset(2, email='load@example.com')
+
+        report = LoadTest(
+            self.live_server_url, [self._account(user)], mix={'delete': 1}
+        ).run(users=1, duration=1)
+
+        deletes = report['scenarios']['delete']
+        creates = report['scenarios']['create']
+        self.assertEqual(set(deletes['statuses']), {'204'})
+        self.assertEqual(set(creates['statuses']), {'201'})
+        self.assertLessEqual(
+            deletes['requests'], creates['requests']
+        )
+
+    def test_database_counters(self):
+        counters = dbstats.database_counters()
+        activity = dbstats.activity_snapshot()
+
+        self.assertIn('xact_commit', counters)
+        self.assertGreaterEqual(activity['connections'], 1)
@@ -0,0 +1,12 @@
+from django.test import SimpleTestCase
+
+from benchmark.render import compare_renderers
+
+
+class RenderBenchmarkTests(SimpleTestCase):
+    def test_compare_renderers(self):
+        results = compare_renderers(count=20, rounds=2)
+
+        self.assertTrue(results['identical'])
+        self.assertEqual(results['drf']['bytes'], results['fast']['bytes'])
+        self.assertGreater(results['fast']['rows_per_s'], 0)
@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+
+from benchmark import results
+
+
+def report(**metrics):
+    return {'results': {'10': {'GET recipe:recipe-list': metrics}}}
+
+
+class CompareTests(SimpleTestCase):
+    def test_no_regression_within_threshold(self):
+        regressions = results.compare(
+            report(p95_ms=11.0, queries=3, alloc_kb=100),
+            report(p95_ms=10.0, queries=3, alloc_kb=100),
+        )
+
+        self.assertEqual(regressions, [])
+
+    def test_latency_regression(self):
+        regressions = results.compare(
+            report(p95_ms=20.0, queries=3, alloc_kb=100),
+            report(p95_ms=10.0, queries=3, alloc_kb=100),
+        )
+
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0].metric, 'p95_ms')
+        self.assertEqual(regressions[0].change, 1.0)
+
+    def test_query_count_regression(self):
+        regressions = results.compare(
+            report(p95_ms=10.0, queries=4, alloc_kb=100),
+            report(p95_ms=10.0, queries=3, alloc_kb=100),
+        )
+
+        self.assertEqual([r.metric for r in regressions], ['queries'])
+
+    def test_routes_missing_from_baseline_are_skipped(self):
+        regressions = results.compare(
+            report(p95_ms=10.0, queries=3, alloc_kb=100),
+            {'results': {}},
+        )
+
+        self.assertEqual(regressions, [])
+
+    def test_parse_thresholds(self):
+        thresholds = results.parse_thresholds(['p95_ms=0.5', 'mean_ms=0.1'])
+
+        self.assertEqual(thresholds['p95_ms'], 0.5)
+        self.assertEqual(thresholds['mean_ms'], 0.1)
+        self.assertEqual(thresholds['queries'], 0.0)
+
+    def test_parse_invalid_threshold(self):
+        with self.assertRaises(ValueError):
+            results.parse_thresholds(['p95_ms'])
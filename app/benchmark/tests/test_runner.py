@@ -0,0 +1,86 @@
+import tempfile
+
+from django.test import (
+    TestCase,
+    override_settings
+)
+
+from core.models import Recipe
+from benchmark.datasets import create_dataset
+from benchmark.routes import (
+    CASES,
+    discover_routes
+)
+from benchmark.runner import (
+    Runner,
+    percentile
+)
+
+
+class RoutesTests(TestCase):
+    def test_every_route_has_a_case(self):
+        routes = discover_routes()
+
+        self.assertIn(('recipe:recipe-list', 'GET'), routes)
+        self.assertIn(('user:token', 'POST'), routes)
+        self.assertEqual([r for r in routes if r not in CASES], [])
+
+
+class RunnerTests(TestCase):
+    def test_percentile(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+        self.assertEqual(percentile(values, 50), 3.0)
+        self.assertEqual(percentile(values, 100), 5.0)
+        self.assertEqual(percentile(values, 90), 4.6)
+
+    def test_create_dataset(self):
+        user = create_dataset(5, email='bench@example.com')
+
+        recipes = Recipe.objects.filter(user=user)
+        self.assertEqual(recipes.count(), 5)
+        self.assertEqual(recipes.first().tags.count(), 3)
+        self.assertEqual(recipes.first().ingredients.count(), 6)
+
+    def test_create_dataset_replaces_kept_dataset(self):
+        create_dataset(5, email='bench@example.com')
+        user = create_dataset(3, email='bench@example.com')
+
+        self.assertEqual(Recipe.objects.count(), 3)
+        self.assertEqual(Recipe.objects.filter(user=user).count(), 3)
+
+    def test_run_collects_metrics(self):
+        runner = Runner(iterations=2, warmup=0)
+
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root,
+                                  ARCHIVE_DIR=media_root):
+            results, uncovered = runner.run([3])
+
+        self.assertEqual(uncovered, [])
+        metrics = results['3']['GET recipe:recipe-list']
+        self.assertEqual(metrics['statuses'], [200])
+        self.assertEqual(metrics['iterations'], 2)
+        self.assertGreater(metrics['queries'], 0)
+        self.assertGreater(metrics['alloc_kb'], 0)
+        self.assertEqual(
+            results['3']['DELETE recipe:recipe-detail']['statuses'],
+            [204]
+        )
+        for method in ('PUT', 'PATCH'):
+            self.assertEqual(
+                results['3'][f'{method} recipe:recipe-detail']['statuses'],
+                [200]
+            )
+        # The dataset's recipes, read by the GET cases, are left unchanged.
+        self.assertEqual(
+            Recipe.objects.filter(title__startswith='Recipe ').count(), 3
+        )
+        self.assertEqual(
+            results['3']['POST recipe:recipe-upload-image']['statuses'],
+            [200]
+        )
+        self.assertEqual(
+            results['3']['GET recipe:archive-download']['statuses'],
+            [200]
+        )
@@ -1,13 +1,36 @@
-from django.contrib import admin
+from django.contrib import (
+    admin,
+    messages
+)
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from core import models
+from core.paginators import EstimatedCountPaginator
+from user.jobs import request_purge
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Admin for per-user tables too large for exact counts and <select>s.
+
+    Searches are prefix matches served by upper(column) text_pattern_ops
+    indexes; narrow to one user with ?user__id__exact=<id>.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_select_related = ['user']
+    raw_id_fields = ['user']
 
 
 class UserAdmin(BaseUserAdmin):
     ordering = ['id']
     list_display = ['email', 'name']
+    search_fields = ['^email']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['purge_users']
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         (_('Personal Info'), {'fields': ('name',)}),
@@ -39,8 +62,42 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    @admin.action(description=_('Deactivate and purge in the background'))
+    def purge_users(self, request, queryset):
+        # Never purge the acting admin or a superuser from a bulk action.
+        protected = Q(is_superuser=True) | Q(id=request.user.id)
+        users = queryset.exclude(protected)
+        for user in users:
+            request_purge(user)
+        self.message_user(
+            request, _('%d user(s) queued for purging.') % len(users)
+        )
+        skipped = queryset.filter(protected).count()
+        if skipped:
+            self.message_user(
+                request,
+                _('%d superuser(s) or your own account skipped.') % skipped,
+                messages.WARNING
+            )
+
+
+class RecipeAdmin(LargeTableAdmin):
+    list_display = ['id', 'title', 'user', 'time_minutes', 'price']
+    search_fields = ['^title']
+    autocomplete_fields = ['tags', 'ingredients']
+
+
+class TagAdmin(LargeTableAdmin):
+    list_display = ['id', 'name', 'user']
+    search_fields = ['^name']
+
+
+class IngredientAdmin(LargeTableAdmin):
+    list_display = ['id', 'name', 'user']
+    search_fields = ['^name']
+
 
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Recipe)
-admin.site.register(models.Tag)
-admin.site.register(models.Ingredient)
+admin.site.register(models.Recipe, RecipeAdmin)
+admin.site.register(models.Tag, TagAdmin)
+admin.site.register(models.Ingredient, IngredientAdmin)
@@ -0,0 +1,151 @@
+"""
+HTTP content codings.
+
+gzip is always available; brotli (`br`) and zstd are offered when the
+`brotli` and `zstandard` packages are installed.
+"""
+import gzip
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipCompressor:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(
+            level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, chunk):
+        return (self._compressor.compress(chunk)
+                + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class GzipCodec:
+    name = 'gzip'
+    max_level = 9
+
+    def compress(self, data, level):
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def compressor(self, level):
+        return GzipCompressor(level)
+
+
+class BrotliCompressor:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class BrotliCodec:
+    name = 'br'
+    max_level = 11
+
+    def compress(self, data, level):
+        return brotli.compress(data, quality=level)
+
+    def compressor(self, level):
+        return BrotliCompressor(level)
+
+
+class ZstdCompressor:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk):
+        return (self._compressor.compress(chunk)
+                + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class ZstdCodec:
+    name = 'zstd'
+    max_level = 19
+
+    def compress(self, data, level):
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def compressor(self, level):
+        return ZstdCompressor(level)
+
+
+CODECS = {'gzip': GzipCodec()}
+if brotli is not None:
+    CODECS['br'] = BrotliCodec()
+if zstandard is not None:
+    CODECS['zstd'] = ZstdCodec()
+
+
+def level(name):
+    return {
+        'gzip': settings.COMPRESSION_GZIP_LEVEL,
+        'br': settings.COMPRESSION_BROTLI_LEVEL,
+        'zstd': settings.COMPRESSION_ZSTD_LEVEL,
+    }[name]
+
+
+def available():
+    return [
+        name for name in settings.COMPRESSION_ENCODINGS if name in CODECS
+    ]
+
+
+def parse_accept_encoding(header):
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def negotiate(request, encodings=None):
+    accepted = parse_accept_encoding(
+        request.META.get('HTTP_ACCEPT_ENCODING', '')
+    )
+    wildcard = accepted.get('*', 0.0)
+    best = None
+    best_quality = 0.0
+    for name in (available() if encodings is None else encodings):
+        quality = accepted.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compress_all(content):
+    """Compress `content` once with every available codec at maximum level."""
+    return {
+        name: codec.compress(content, codec.max_level)
+        for name, codec in CODECS.items()
+    }
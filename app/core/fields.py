@@ -0,0 +1,21 @@
+"""
+Model fields for PostgreSQL types Django does not provide.
+"""
+from django.db import models
+
+
+class BitStringField(models.Field):
+    """A fixed length bit(n) string, read and written as '0'/'1' text."""
+    description = 'Bit string'
+
+    def __init__(self, *args, length, **kwargs):
+        self.length = length
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['length'] = self.length
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        return f'bit({self.length})'
@@ -0,0 +1,213 @@
+"""
+Database backed background jobs.
+
+Handlers are registered with `@register('name')` in a `jobs` module of any
+installed app and queued with `enqueue('name', payload)`. Workers claim
+the highest priority due job with SELECT ... FOR UPDATE SKIP LOCKED, are
+woken by NOTIFY on JOBS_CHANNEL and fall back to polling for delayed
+retries. Jobs of one user never run more than JOB_PER_USER_CONCURRENCY at
+a time: claimers of the same user serialize on an advisory lock and
+recount running jobs before taking one. Workers send a heartbeat for the
+jobs they run, and running jobs whose heartbeat stopped are requeued.
+"""
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import (
+    connection,
+    transaction
+)
+from django.db.models import (
+    F,
+    Q
+)
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core import notify
+from core.models import Job
+
+logger = logging.getLogger('core.jobs')
+
+JOBS_CHANNEL = 'jobs'
+# High bits of the advisory lock key taken per user while claiming.
+USER_CLAIM_LOCK = 7201 << 32
+
+_registry = {}
+
+
+class UnknownJob(Exception):
+    pass
+
+
+def register(name):
+    def decorator(handler):
+        _registry[name] = handler
+        return handler
+    return decorator
+
+
+def autodiscover():
+    autodiscover_modules('jobs')
+
+
+def get_handler(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownJob(f'No handler registered for job {name!r}.')
+
+
+def enqueue(name, payload=None, user=None, priority=0, run_at=None,
+            max_attempts=None):
+    job = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        user=user,
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+    notify.notify(JOBS_CHANNEL, {'id': job.id})
+    return job
+
+
+CANDIDATE_SQL = f'''
+    SELECT job.id, job.user_id
+    FROM {Job._meta.db_table} job
+    WHERE job.status = %(queued)s
+      AND job.run_at <= %(now)s
+      AND (job.user_id IS NULL OR NOT job.user_id = ANY(%(skip)s))
+      AND (job.user_id IS NULL OR (
+          SELECT count(*) FROM {Job._meta.db_table} running
+          WHERE running.user_id = job.user_id
+            AND running.status = %(running)s
+      ) < %(limit)s)
+    ORDER BY job.priority DESC, job.run_at, job.id
+    LIMIT 1
+    FOR UPDATE OF job SKIP LOCKED
+'''
+
+RUNNING_COUNT_SQL = f'''
+    SELECT count(*) FROM {Job._meta.db_table}
+    WHERE user_id = %s AND status = %s
+'''
+
+
+def _candidate(cursor, limit):
+    skip = []
+    while True:
+        cursor.execute(CANDIDATE_SQL, {
+            'queued': Job.STATUS_QUEUED,
+            'now': timezone.now(),
+            'running': Job.STATUS_RUNNING,
+            'limit': limit,
+            'skip': skip,
+        })
+        row = cursor.fetchone()
+        if row is None or row[1] is None:
+            return row
+
+        # Another worker may have just claimed a job of this user.
+        job_id, user_id = row
+        cursor.execute(
+            'SELECT pg_advisory_xact_lock(%s)', [USER_CLAIM_LOCK + user_id]
+        )
+        cursor.execute(RUNNING_COUNT_SQL, [user_id, Job.STATUS_RUNNING])
+        if cursor.fetchone()[0] < limit:
+            return row
+        skip.append(user_id)
+
+
+def claim(worker_id):
+    """Mark the next runnable job as running and return it, or None."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        row = _candidate(cursor, settings.JOB_PER_USER_CONCURRENCY)
+        if row is None:
+            return None
+
+        job_id = row[0]
+        now = timezone.now()
+        Job.objects.filter(id=job_id).update(
+            status=Job.STATUS_RUNNING,
+            locked_at=now,
+            locked_by=worker_id,
+            heartbeat_at=now,
+            attempts=F('attempts') + 1,
+        )
+    return Job.objects.get(id=job_id)
+
+
+def retry_delay(attempts):
+    delay = min(
+        settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+        settings.JOB_RETRY_MAX_DELAY
+    )
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _finish(job, **outcome):
+    # A job requeued as stale may already be queued again or running on
+    # another worker, whose outcome must not be overwritten.
+    updated = Job.objects.filter(
+        id=job.id, status=Job.STATUS_RUNNING, locked_by=job.locked_by
+    ).update(locked_at=None, locked_by='', heartbeat_at=None, **outcome)
+    if not updated:
+        logger.warning('Job %s was requeued while running; '
+                       'dropping its outcome', job)
+
+
+def run(job):
+    """Run a claimed job and record its outcome."""
+    try:
+        result = get_handler(job.name)(job)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Job %s failed (attempt %s of %s)',
+                       job, job.attempts, job.max_attempts)
+        if job.attempts < job.max_attempts:
+            outcome = {
+                'status': Job.STATUS_QUEUED,
+                'run_at': timezone.now() + retry_delay(job.attempts),
+            }
+        else:
+            outcome = {
+                'status': Job.STATUS_FAILED,
+                'finished_at': timezone.now(),
+            }
+        _finish(job, error=error, **outcome)
+        return False
+
+    _finish(
+        job,
+        status=Job.STATUS_SUCCEEDED,
+        result=result,
+        finished_at=timezone.now(),
+        error='',
+    )
+    return True
+
+
+def heartbeat(job_ids):
+    """Mark the running jobs `job_ids` as still being worked on."""
+    return Job.objects.filter(
+        id__in=job_ids, status=Job.STATUS_RUNNING
+    ).update(heartbeat_at=timezone.now())
+
+
+def requeue_stale():
+    """Requeue running jobs whose worker died without finishing them."""
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_TIMEOUT)
+    # Jobs claimed before heartbeats were recorded fall back to locked_at.
+    stale = Q(heartbeat_at__lt=cutoff) | Q(
+        heartbeat_at=None, locked_at__lt=cutoff
+    )
+    return Job.objects.filter(stale, status=Job.STATUS_RUNNING).update(
+        status=Job.STATUS_QUEUED,
+        locked_at=None,
+        locked_by='',
+        heartbeat_at=None
+    )
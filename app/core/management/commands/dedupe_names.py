@@ -0,0 +1,35 @@
+"""
+Django command to merge tags and ingredients differing only in case or
+whitespace.
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import (
+    Ingredient,
+    Tag
+)
+from recipe.merge import dedupe_batch
+
+
+class Command(BaseCommand):
+    help = 'Merge duplicate tags and ingredients in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of duplicate groups merged per batch.'
+        )
+
+    def handle(self, *args, **options):
+        for model in (Tag, Ingredient):
+            total = 0
+            while True:
+                merged = dedupe_batch(model, options['batch_size'])
+                if not merged:
+                    break
+                total += merged
+            self.stdout.write(self.style.SUCCESS(
+                f'Normalized {total} {model._meta.verbose_name} names.'
+            ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core import schema
+
+
+class Command(BaseCommand):
+    help = 'Generate the cached OpenAPI schema for the current code version.'
+
+    def handle(self, *args, **options):
+        version = schema.code_version()
+        schema.write(version)
+        self.stdout.write(self.style.SUCCESS(
+            f'Schema for version {version} written.'
+        ))
@@ -0,0 +1,43 @@
+"""
+Django command to delete a user and all of their data.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from user.jobs import (
+    deactivate,
+    purge,
+    request_purge
+)
+
+
+class Command(BaseCommand):
+    help = 'Deactivate a user and delete their data in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('email')
+        parser.add_argument(
+            '--now',
+            action='store_true',
+            help='Purge in this process instead of queueing a job.'
+        )
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(email=options['email'])
+        except user_model.DoesNotExist:
+            raise CommandError(f'No user with email {options["email"]}.')
+
+        if options['now']:
+            deactivate(user)
+            deleted = purge(user.id)
+            self.stdout.write(self.style.SUCCESS(f'Purged user: {deleted}.'))
+        else:
+            job = request_purge(user)
+            self.stdout.write(self.style.SUCCESS(
+                f'Queued purge job {job.id}.'
+            ))
@@ -0,0 +1,95 @@
+"""
+Django command to run background job workers.
+"""
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core import jobs
+from core.workers import WorkerPool
+
+
+def run_pool(threads, burst):
+    pool = WorkerPool(threads)
+    signal.signal(signal.SIGTERM, lambda *args: pool.stop())
+    signal.signal(signal.SIGINT, lambda *args: pool.stop())
+    pool.run(burst=burst)
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.JOB_WORKER_PROCESSES,
+            help='Number of worker processes.'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=settings.JOB_WORKER_THREADS,
+            help='Number of worker threads per process.'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once no job is due instead of waiting for more.'
+        )
+
+    def handle(self, *args, **options):
+        jobs.autodiscover()
+        processes = max(options['processes'], 1)
+        threads = max(options['threads'], 1)
+        burst = options['burst']
+        self.stdout.write(
+            f'Starting {processes} worker process(es) '
+            f'with {threads} thread(s) each.'
+        )
+
+        if processes == 1:
+            run_pool(threads, burst)
+        else:
+            self._supervise(processes, threads, burst)
+        self.stdout.write(self.style.SUCCESS('Workers stopped.'))
+
+    def _supervise(self, processes, threads, burst):
+        # Children must not share the parent's database connections.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        stopping = []
+
+        def start():
+            child = context.Process(target=run_pool, args=(threads, burst))
+            child.start()
+            return child
+
+        def stop(*args):
+            stopping.append(True)
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        children = [start() for _ in range(processes)]
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        while children:
+            running = []
+            for child in children:
+                child.join(timeout=0)
+                if child.exitcode is None:
+                    running.append(child)
+                elif not (burst or stopping):
+                    self.stderr.write(
+                        f'Worker process {child.pid} exited with '
+                        f'{child.exitcode}, restarting.'
+                    )
+                    running.append(start())
+            children = running
+            time.sleep(0.5)
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from core import compression
+
+STRONG_ETAG = _lazy_re_compile(r'^\s*"')
+INCOMPRESSIBLE_TYPES = ('image/', 'video/', 'audio/', 'application/zip')
+# Compressed HTML that reflects input next to a secret such as the CSRF
+# token leaks the secret through its length (BREACH).
+SECRET_BEARING_TYPES = ('text/html',)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts.
+
+    Responses under COMPRESSION_MIN_SIZE, HTML pages and responses that
+    already carry a Content-Encoding (such as the precompressed schema)
+    are left alone.
+    Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, get_response):
+        if not settings.COMPRESSION_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def _compressible(self, response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        content_type = response.get('Content-Type', '')
+        return not content_type.startswith(
+            INCOMPRESSIBLE_TYPES + SECRET_BEARING_TYPES
+        )
+
+    def process_response(self, request, response):
+        if not self._compressible(response):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.negotiate(request)
+        if encoding is None:
+            return response
+
+        codec = compression.CODECS[encoding]
+        level = compression.level(encoding)
+        if response.streaming:
+            compressor = codec.compressor(level)
+            if response.is_async:
+                response.streaming_content = self._compress_async(
+                    compressor, response.streaming_content
+                )
+            else:
+                response.streaming_content = self._compress(
+                    compressor, response.streaming_content
+                )
+            del response['Content-Length']
+        else:
+            content = codec.compress(response.content, level)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        etag = response.get('ETag')
+        if etag and STRONG_ETAG.match(etag):
+            response['ETag'] = f'W/{etag}'
+        response['Content-Encoding'] = encoding
+        return response
+
+    def _compress(self, compressor, chunks):
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+    async def _compress_async(self, compressor, chunks):
+        async for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
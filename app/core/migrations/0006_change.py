@@ -0,0 +1,42 @@
+# Generated by Django 4.2.16 on 2026-10-19 09:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_recipe_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeSequence',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_seq', models.BigIntegerField(default=0)),
+                ('horizon', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('recipe', 'Recipe'), ('tag', 'Tag'), ('ingredient', 'Ingredient'), ('recipe_tag', 'Recipe tag link'), ('recipe_ingredient', 'Recipe ingredient link')], max_length=32)),
+                ('object_id', models.BigIntegerField()),
+                ('seq', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'seq'], name='core_change_user_seq')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='change',
+            constraint=models.UniqueConstraint(fields=('user', 'kind', 'object_id'), name='core_change_unique_object'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.16 on 2026-10-19 09:37
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+def drop_leftover(name):
+    # A failed concurrent build leaves an INVALID index behind that a
+    # rerun would otherwise trip over.
+    return migrations.RunSQL(
+        f'DROP INDEX CONCURRENTLY IF EXISTS {name}', migrations.RunSQL.noop
+    )
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to large tables.
+    atomic = False
+
+    dependencies = [
+        ('core', '0007_job'),
+    ]
+
+    operations = [
+        drop_leftover('core_ingredient_name_upper'),
+        AddIndexConcurrently(
+            model_name='ingredient',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='core_ingredient_name_upper'),
+        ),
+        drop_leftover('core_recipe_title_upper'),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='text_pattern_ops'), name='core_recipe_title_upper'),
+        ),
+        drop_leftover('core_tag_name_upper'),
+        AddIndexConcurrently(
+            model_name='tag',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='core_tag_name_upper'),
+        ),
+        drop_leftover('core_user_email_upper'),
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='text_pattern_ops'), name='core_user_email_upper'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.16 on 2026-10-19 09:41
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# Lookups from a tag or ingredient back to its recipes. The through tables
+# are auto-created, so their indexes are managed with raw SQL.
+THROUGH_INDEXES = [
+    ('core_recipe_tags', 'core_recipe_tags_tag_recipe', 'tag_id'),
+    (
+        'core_recipe_ingredients',
+        'core_recipe_ingredients_ingredient_recipe',
+        'ingredient_id'
+    ),
+]
+
+
+def drop_leftover(name):
+    # A failed concurrent build leaves an INVALID index behind that a
+    # rerun would otherwise keep or trip over.
+    return migrations.RunSQL(
+        f'DROP INDEX CONCURRENTLY IF EXISTS {name}', migrations.RunSQL.noop
+    )
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to live tables.
+    atomic = False
+
+    dependencies = [
+        ('core', '0008_search_indexes'),
+    ]
+
+    operations = [
+        drop_leftover('core_ingredient_user_name'),
+        AddIndexConcurrently(
+            model_name='ingredient',
+            index=models.Index(fields=['user', '-name'], include=('id',), name='core_ingredient_user_name'),
+        ),
+        drop_leftover('core_recipe_user_id_desc'),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['user', '-id'], include=('title', 'time_minutes', 'price', 'link'), name='core_recipe_user_id_desc'),
+        ),
+        drop_leftover('core_tag_user_name'),
+        AddIndexConcurrently(
+            model_name='tag',
+            index=models.Index(fields=['user', '-name'], include=('id',), name='core_tag_user_name'),
+        ),
+    ] + [
+        operation
+        for table, name, column in THROUGH_INDEXES
+        for operation in (
+            drop_leftover(name),
+            migrations.RunSQL(
+                f'CREATE INDEX CONCURRENTLY {name} '
+                f'ON {table} ({column}, recipe_id)',
+                f'DROP INDEX CONCURRENTLY IF EXISTS {name}'
+            ),
+        )
+    ]
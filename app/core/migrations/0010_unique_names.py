@@ -0,0 +1,100 @@
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+# Collapse first: btrim only strips spaces, not tabs or newlines.
+NORMALIZED = r"btrim(regexp_replace(name, '\s+', ' ', 'g'))"
+
+# Every duplicate is folded into the oldest object with the same name,
+# ignoring case and whitespace. This does not feed the sync change log;
+# run `manage.py dedupe_names` first on databases with sync clients.
+MERGE_SQL = '''
+WITH map AS (
+    SELECT id, min(id) OVER (
+        PARTITION BY user_id, UPPER({normalized})
+    ) AS target
+    FROM {table}
+), links AS (
+    SELECT link.id, map.target, link.{column} <> map.target AS moving,
+        row_number() OVER (
+            PARTITION BY link.recipe_id, map.target
+            ORDER BY link.{column} = map.target DESC, link.id
+        ) AS n
+    FROM {through} link
+    JOIN map ON map.id = link.{column}
+), moved AS (
+    UPDATE {through} SET {column} = links.target
+    FROM links
+    WHERE {through}.id = links.id AND links.n = 1 AND links.moving
+), dropped AS (
+    DELETE FROM {through}
+    USING links
+    WHERE {through}.id = links.id AND links.n > 1
+)
+DELETE FROM {table}
+USING map
+WHERE {table}.id = map.id AND map.id <> map.target
+'''
+
+NAMED = [
+    ('tag', 'core_tag', 'core_recipe_tags', 'tag_id'),
+    ('ingredient', 'core_ingredient', 'core_recipe_ingredients',
+     'ingredient_id'),
+]
+
+
+def operations(model_name, table, through, column):
+    name = f'{table}_user_name_unique'
+    return [
+        migrations.RunSQL(
+            MERGE_SQL.format(
+                table=table,
+                through=through,
+                column=column,
+                normalized=NORMALIZED
+            ),
+            migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            f'UPDATE {table} SET name = {NORMALIZED} '
+            f'WHERE name <> {NORMALIZED}',
+            migrations.RunSQL.noop
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                # A failed concurrent build leaves an INVALID index behind
+                # that IF NOT EXISTS would keep.
+                migrations.RunSQL(
+                    f'DROP INDEX CONCURRENTLY IF EXISTS {name}',
+                    migrations.RunSQL.noop
+                ),
+                migrations.RunSQL(
+                    f'CREATE UNIQUE INDEX CONCURRENTLY {name} '
+                    f'ON {table} (user_id, (UPPER(name)))',
+                    f'DROP INDEX CONCURRENTLY IF EXISTS {name}'
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name=model_name,
+                    constraint=models.UniqueConstraint(
+                        'user', Upper('name'), name=name
+                    ),
+                ),
+            ]
+        ),
+    ]
+
+
+class Migration(migrations.Migration):
+    # Build the unique indexes without blocking writes to live tables.
+    atomic = False
+
+    dependencies = [
+        ('core', '0009_access_path_indexes'),
+    ]
+
+    operations = [
+        operation
+        for args in NAMED
+        for operation in operations(*args)
+    ]
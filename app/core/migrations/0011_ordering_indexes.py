@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+def drop_leftover(name):
+    # A failed concurrent build leaves an INVALID index behind that a
+    # rerun would otherwise trip over.
+    return migrations.RunSQL(
+        f'DROP INDEX CONCURRENTLY IF EXISTS {name}', migrations.RunSQL.noop
+    )
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to live tables.
+    atomic = False
+
+    dependencies = [
+        ('core', '0010_unique_names'),
+    ]
+
+    operations = [
+        drop_leftover('core_recipe_user_price'),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'price', 'id'], name='core_recipe_user_price'),
+        ),
+        drop_leftover('core_recipe_user_time'),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'time_minutes', 'id'], name='core_recipe_user_time'),
+        ),
+        drop_leftover('core_recipe_user_title'),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'title', 'id'], name='core_recipe_user_title'),
+        ),
+    ]
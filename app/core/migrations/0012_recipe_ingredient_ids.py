@@ -0,0 +1,130 @@
+import django.contrib.postgres.fields
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+import core.fields
+
+# Both columns computed from a recipe's links.
+LINKS_SQL = '''
+SELECT
+    coalesce(array_agg(ingredient_id ORDER BY ingredient_id), '{}'),
+    coalesce(
+        bit_or(set_bit(repeat('0', 512)::bit(512), (ingredient_id % 512)::int, 1)),
+        repeat('0', 512)::bit(512)
+    )
+FROM core_recipe_ingredients
+WHERE recipe_id = core_recipe.id
+'''
+
+# Statement level triggers on the ingredient links recompute the columns of
+# every recipe a statement touched, once per statement.
+REFRESH_SQL = '''
+CREATE FUNCTION core_recipe_refresh_ingredient_ids() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    recipe_ids bigint[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT recipe_id) INTO recipe_ids FROM new_links;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT recipe_id) INTO recipe_ids FROM old_links;
+    ELSE
+        SELECT array_agg(recipe_id) INTO recipe_ids FROM (
+            SELECT recipe_id FROM new_links
+            UNION SELECT recipe_id FROM old_links
+        ) AS changed;
+    END IF;
+
+    UPDATE core_recipe SET (ingredient_ids, ingredient_mask) = (%s)
+    WHERE id = ANY(recipe_ids);
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER core_recipe_ingredients_insert
+AFTER INSERT ON core_recipe_ingredients
+REFERENCING NEW TABLE AS new_links
+FOR EACH STATEMENT EXECUTE FUNCTION core_recipe_refresh_ingredient_ids();
+
+CREATE TRIGGER core_recipe_ingredients_update
+AFTER UPDATE ON core_recipe_ingredients
+REFERENCING NEW TABLE AS new_links OLD TABLE AS old_links
+FOR EACH STATEMENT EXECUTE FUNCTION core_recipe_refresh_ingredient_ids();
+
+CREATE TRIGGER core_recipe_ingredients_delete
+AFTER DELETE ON core_recipe_ingredients
+REFERENCING OLD TABLE AS old_links
+FOR EACH STATEMENT EXECUTE FUNCTION core_recipe_refresh_ingredient_ids();
+''' % LINKS_SQL
+
+DROP_REFRESH_SQL = '''
+DROP TRIGGER core_recipe_ingredients_insert ON core_recipe_ingredients;
+DROP TRIGGER core_recipe_ingredients_update ON core_recipe_ingredients;
+DROP TRIGGER core_recipe_ingredients_delete ON core_recipe_ingredients;
+DROP FUNCTION core_recipe_refresh_ingredient_ids();
+'''
+
+BACKFILL_SQL = f'''
+UPDATE core_recipe SET (ingredient_ids, ingredient_mask) = ({LINKS_SQL})
+WHERE id IN (SELECT recipe_id FROM core_recipe_ingredients)
+'''
+
+# Model saves write every column, and an instance's copy of the array is
+# stale once its links change, so writes not made by the trigger above are
+# discarded.
+GUARD_SQL = '''
+CREATE FUNCTION core_recipe_guard_ingredient_ids() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF pg_trigger_depth() < 2 THEN
+        IF TG_OP = 'INSERT' THEN
+            NEW.ingredient_ids := '{}';
+            NEW.ingredient_mask := repeat('0', 512)::bit(512);
+        ELSE
+            NEW.ingredient_ids := OLD.ingredient_ids;
+            NEW.ingredient_mask := OLD.ingredient_mask;
+        END IF;
+    END IF;
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER core_recipe_guard_ingredient_ids
+BEFORE INSERT OR UPDATE OF ingredient_ids, ingredient_mask ON core_recipe
+FOR EACH ROW EXECUTE FUNCTION core_recipe_guard_ingredient_ids();
+'''
+
+DROP_GUARD_SQL = '''
+DROP TRIGGER core_recipe_guard_ingredient_ids ON core_recipe;
+DROP FUNCTION core_recipe_guard_ingredient_ids();
+'''
+
+
+class Migration(migrations.Migration):
+    # Build the index without blocking writes to the live table.
+    atomic = False
+
+    dependencies = [
+        ('core', '0011_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='ingredient_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='ingredient_mask',
+            field=core.fields.BitStringField(default='0' * 512, editable=False, length=512),
+        ),
+        migrations.RunSQL(REFRESH_SQL, DROP_REFRESH_SQL),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(GUARD_SQL, DROP_GUARD_SQL),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=GinIndex(fields=['ingredient_ids'], name='core_recipe_ingredient_ids'),
+        ),
+    ]
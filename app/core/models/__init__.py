@@ -2,11 +2,16 @@ from .user import User, UserManager
 from .recipe import Recipe
 from .tag import Tag
 from .ingredient import Ingredient
+from .change import Change, ChangeSequence
+from .job import Job
 
 __all__ = [
     'User',
     'UserManager',
     'Recipe',
     'Tag',
-    'Ingredient'
+    'Ingredient',
+    'Change',
+    'ChangeSequence',
+    'Job'
 ]
@@ -0,0 +1,54 @@
+from django.db import models
+from django.conf import settings
+
+
+class ChangeSequence(models.Model):
+    """Per-user change counter; `horizon` is the last compacted sequence."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True
+    )
+    last_seq = models.BigIntegerField(default=0)
+    horizon = models.BigIntegerField(default=0)
+
+
+class Change(models.Model):
+    """Latest change of one synced object, kept as a tombstone if deleted."""
+    KIND_RECIPE = 'recipe'
+    KIND_TAG = 'tag'
+    KIND_INGREDIENT = 'ingredient'
+    KIND_RECIPE_TAG = 'recipe_tag'
+    KIND_RECIPE_INGREDIENT = 'recipe_ingredient'
+    KIND_CHOICES = [
+        (KIND_RECIPE, 'Recipe'),
+        (KIND_TAG, 'Tag'),
+        (KIND_INGREDIENT, 'Ingredient'),
+        (KIND_RECIPE_TAG, 'Recipe tag link'),
+        (KIND_RECIPE_INGREDIENT, 'Recipe ingredient link'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE
+    )
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    seq = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'kind', 'object_id'],
+                name='core_change_unique_object'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['user', 'seq'], name='core_change_user_seq')
+        ]
+
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return f'{self.kind} {self.object_id} {action} at {self.seq}'
@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
 
 
@@ -9,5 +11,24 @@ class Ingredient(models.Model):
     )
     name = models.CharField(max_length=255)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                'user', Upper('name'), name='core_ingredient_user_name_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                OpClass(Upper('name'), name='text_pattern_ops'),
+                name='core_ingredient_name_upper'
+            ),
+            # Ingredient listings: one user's ingredients by name.
+            models.Index(
+                fields=['user', '-name'],
+                include=['id'],
+                name='core_ingredient_user_name'
+            ),
+        ]
+
     def __str__(self):
         return self.name
@@ -1,9 +1,20 @@
 import uuid
 import os
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import (
+    GinIndex,
+    OpClass
+)
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
 
+from core.fields import BitStringField
+
+# Width of Recipe.ingredient_mask; ingredient `id` sets bit id % MASK_BITS.
+MASK_BITS = 512
+
 
 def recipe_image_file_path(instance, filename):
     ext = os.path.splitext(filename)[1]
@@ -25,6 +36,46 @@ class Recipe(models.Model):
     price = models.DecimalField(max_digits=5, decimal_places=2)
     link = models.CharField(max_length=255, blank=True)
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
+    # Sorted copy of the ingredient links for set containment queries,
+    # and a signature of them with bit id % MASK_BITS set per ingredient.
+    # Database triggers keep both in sync; writes from the application are
+    # ignored.
+    ingredient_ids = ArrayField(
+        models.BigIntegerField(), default=list, blank=True, editable=False
+    )
+    ingredient_mask = BitStringField(
+        length=MASK_BITS, default='0' * MASK_BITS, editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                OpClass(Upper('title'), name='text_pattern_ops'),
+                name='core_recipe_title_upper'
+            ),
+            # Recipe listings: one user's recipes newest first, covering
+            # the listed columns for index-only scans.
+            models.Index(
+                fields=['user', '-id'],
+                include=['title', 'time_minutes', 'price', 'link'],
+                name='core_recipe_user_id_desc'
+            ),
+            # Sorted listings and keyset pages; scanned backwards for
+            # descending orderings.
+            models.Index(
+                fields=['user', 'price', 'id'], name='core_recipe_user_price'
+            ),
+            models.Index(
+                fields=['user', 'time_minutes', 'id'],
+                name='core_recipe_user_time'
+            ),
+            models.Index(
+                fields=['user', 'title', 'id'], name='core_recipe_user_title'
+            ),
+            GinIndex(
+                fields=['ingredient_ids'], name='core_recipe_ingredient_ids'
+            ),
+        ]
 
     def __str__(self):
         return self.title
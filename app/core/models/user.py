@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import (
     AbstractBaseUser,
     PermissionsMixin,
@@ -34,3 +36,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
+
+    class Meta:
+        indexes = [
+            models.Index(
+                OpClass(Upper('email'), name='text_pattern_ops'),
+                name='core_user_email_upper'
+            ),
+        ]
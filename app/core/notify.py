@@ -0,0 +1,40 @@
+"""
+PostgreSQL LISTEN/NOTIFY helpers shared by cross-process wakeups.
+"""
+import json
+
+import psycopg2
+from django.db import (
+    connection,
+    transaction
+)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD = 7999
+
+
+def send(channel, payload):
+    """NOTIFY `channel` right away on the default connection."""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_notify(%s, %s)', [channel, payload])
+
+
+def notify(channel, payload):
+    """NOTIFY `channel` with a JSON payload once the transaction commits."""
+    message = json.dumps(payload, separators=(',', ':'))
+    if len(message.encode()) > MAX_PAYLOAD:
+        raise ValueError(f'NOTIFY payload too large for {channel}.')
+    transaction.on_commit(lambda: send(channel, message))
+
+
+def listen(channels):
+    """Open a dedicated autocommit connection LISTENing on `channels`."""
+    params = connection.get_connection_params()
+    listener = psycopg2.connect(**params)
+    listener.set_session(autocommit=True)
+    with listener.cursor() as cursor:
+        for channel in channels:
+            cursor.execute(f'LISTEN "{channel}"')
+    return listener
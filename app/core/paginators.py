@@ -0,0 +1,61 @@
+"""
+Paginator for tables too large to COUNT(*) on every page view.
+
+Unfiltered querysets are sized from pg_class.reltuples and filtered ones
+from the planner's row estimate. Only when the estimate is below
+ADMIN_COUNT_ESTIMATE_THRESHOLD is the exact count taken, so small tables
+and narrow searches still show exact totals.
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def _planner_rows(queryset):
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']['Plan Rows']
+
+
+def _table_rows(model, using):
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 until the table is first vacuumed or analyzed.
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def estimate_count(queryset):
+    """Return an estimated row count for `queryset`, or None if unknown."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    query = queryset.query
+    if not query.where and not query.distinct and not query.combinator:
+        rows = _table_rows(queryset.model, queryset.db)
+    else:
+        rows = _planner_rows(queryset)
+    return None if rows is None else int(rows)
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        estimate = None
+        if hasattr(self.object_list, 'query'):
+            estimate = estimate_count(self.object_list)
+        if (estimate is None
+                or estimate < settings.ADMIN_COUNT_ESTIMATE_THRESHOLD):
+            return super().count
+        return estimate
@@ -0,0 +1,34 @@
+"""
+orjson based JSON parser, falling back to DRF's JSONParser for input it
+does not accept so errors and edge cases behave exactly as before.
+"""
+import io
+import re
+
+import orjson
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from core.renderers import FastJSONRenderer
+
+UTF8 = {'utf-8', 'utf8'}
+# orjson turns integers beyond 64 bits into floats; json keeps them exact.
+LONG_NUMBER = re.compile(rb'\d{19}')
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        content = stream.read()
+
+        if encoding.lower() in UTF8 and not LONG_NUMBER.search(content):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+
+        return super().parse(io.BytesIO(content), media_type, parser_context)
@@ -0,0 +1,127 @@
+"""
+orjson based JSON renderer producing the same bytes as DRF's JSONRenderer,
+plus columnar JSON and MessagePack renderers for bulk listings.
+
+The columnar shape holds one array per field. List-valued fields (many to
+many ids) are flattened CSR style into `offsets` and `ids`, so the ids of
+row i are ids[offsets[i]:offsets[i + 1]].
+"""
+import msgpack
+import orjson
+
+from rest_framework.renderers import (
+    BaseRenderer,
+    JSONRenderer
+)
+from rest_framework.utils.encoders import JSONEncoder
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def to_columns(rows):
+    columns = {}
+    relations = {}
+    for name in (rows[0] if rows else ()):
+        values = [row[name] for row in rows]
+        if not values or not isinstance(values[0], list):
+            columns[name] = values
+            continue
+
+        offsets = [0]
+        ids = []
+        for related in values:
+            ids.extend(related)
+            offsets.append(len(ids))
+        relations[name] = {'offsets': offsets, 'ids': ids}
+
+    return {'count': len(rows), 'columns': columns, 'relations': relations}
+
+
+def to_columnar_document(data, key):
+    if isinstance(data, list):
+        return to_columns(data)
+    if isinstance(data, dict) and key in data:
+        document = dict(to_columns(data[key]), included=data.get('included'))
+        if 'next' in data:
+            document['next'] = data['next']
+        return document
+    return data
+
+
+class FastJSONRenderer(JSONRenderer):
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context)
+                is not None):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        try:
+            content = orjson.dumps(
+                data, default=self.encoder.default, option=OPTIONS
+            )
+        except (orjson.JSONEncodeError, TypeError, ValueError):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        # Match JSONRenderer, which escapes these to stay a JavaScript subset.
+        if LINE_SEPARATOR in content or PARAGRAPH_SEPARATOR in content:
+            content = content.replace(LINE_SEPARATOR, b'\\u2028').replace(
+                PARAGRAPH_SEPARATOR, b'\\u2029'
+            )
+        return content
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    media_type = 'application/vnd.columnar+json'
+    format = 'columnar'
+    extension = 'json'
+    rows_key = 'recipes'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(
+            to_columnar_document(data, self.rows_key),
+            accepted_media_type, renderer_context
+        )
+
+    def stream(self, chunks, included):
+        separator = b''
+        yield b'{"batches":['
+        for chunk in chunks:
+            yield separator + super().render(to_columns(chunk))
+            separator = b','
+        yield b'],"included":' + super().render(included()) + b'}'
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    extension = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    rows_key = 'recipes'
+    encoder = JSONEncoder()
+
+    def _pack(self, data):
+        return msgpack.packb(data, default=self.encoder.default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self._pack(to_columnar_document(data, self.rows_key))
+
+    def stream(self, chunks, included):
+        """One {"batch": ...} object per chunk, then {"included": ...}."""
+        for chunk in chunks:
+            yield self._pack({'batch': to_columns(chunk)})
+        yield self._pack({'included': included()})
@@ -0,0 +1,186 @@
+"""
+Precomputed OpenAPI schema.
+
+The schema is generated once per code version and written to
+SCHEMA_CACHE_DIR, then served from memory with precompressed variants, an
+ETag per variant and cache headers instead of introspecting every view on each
+request.
+"""
+import hashlib
+import os
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import (
+    HttpResponse,
+    HttpResponseNotModified
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import (
+    OpenApiJsonRenderer,
+    OpenApiYamlRenderer
+)
+from drf_spectacular.settings import spectacular_settings
+
+from core import compression
+
+FORMATS = {
+    'yaml': ('application/vnd.oai.openapi', OpenApiYamlRenderer),
+    'json': ('application/vnd.oai.openapi+json', OpenApiJsonRenderer),
+}
+
+_lock = threading.Lock()
+_cache = {}
+
+
+class SchemaUnavailable(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(settings.BASE_DIR):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(('.', '__')))
+        for name in sorted(files):
+            if name.endswith('.py'):
+                with open(os.path.join(root, name), 'rb') as source:
+                    digest.update(source.read())
+    return digest.hexdigest()[:12]
+
+
+class SchemaDocument:
+    def __init__(self, content, content_type):
+        self.content = content
+        self.content_type = content_type
+        self.encoded = compression.compress_all(content)
+        digest = hashlib.sha1(content).hexdigest()
+        self.etags = {None: f'"{digest}"'}
+        for encoding in self.encoded:
+            self.etags[encoding] = f'"{digest}-{encoding}"'
+
+
+def _path(version, schema_format):
+    return os.path.join(
+        settings.SCHEMA_CACHE_DIR, f'openapi-{version}.{schema_format}'
+    )
+
+
+def generate():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        schema_format: renderer().render(schema, renderer_context={})
+        for schema_format, (_, renderer) in FORMATS.items()
+    }
+
+
+def write(version=None):
+    version = version or code_version()
+    os.makedirs(settings.SCHEMA_CACHE_DIR, exist_ok=True)
+    rendered = generate()
+    for schema_format, content in rendered.items():
+        path = _path(version, schema_format)
+        with open(f'{path}.tmp', 'wb') as output:
+            output.write(content)
+        os.replace(f'{path}.tmp', path)
+
+    for name in os.listdir(settings.SCHEMA_CACHE_DIR):
+        if name.startswith('openapi-') and version not in name:
+            os.remove(os.path.join(settings.SCHEMA_CACHE_DIR, name))
+
+    return rendered
+
+
+def _read(version):
+    rendered = {}
+    for schema_format in FORMATS:
+        try:
+            with open(_path(version, schema_format), 'rb') as schema_file:
+                rendered[schema_format] = schema_file.read()
+        except FileNotFoundError:
+            return None
+    return rendered
+
+
+def get_document(schema_format):
+    version = code_version()
+    key = (version, schema_format)
+    document = _cache.get(key)
+    if document is not None:
+        return document
+
+    with _lock:
+        document = _cache.get(key)
+        if document is not None:
+            return document
+
+        rendered = _read(version)
+        if rendered is None:
+            if not settings.SCHEMA_LIVE_GENERATION:
+                raise SchemaUnavailable(
+                    f'No schema generated for version {version}.'
+                )
+            rendered = write(version)
+
+        _cache.clear()
+        for name, content in rendered.items():
+            _cache[(version, name)] = SchemaDocument(
+                content, FORMATS[name][0]
+            )
+        return _cache[key]
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def _requested_format(request):
+    requested = request.GET.get('format')
+    if requested in FORMATS:
+        return requested
+    if 'json' in request.META.get('HTTP_ACCEPT', ''):
+        return 'json'
+    return 'yaml'
+
+
+def _not_modified(request, etag):
+    """Whether If-None-Match matches `etag`, compared weakly."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or etag in (tag.replace('W/', '', 1) for tag in etags)
+
+
+def schema_view(request):
+    try:
+        document = get_document(_requested_format(request))
+    except SchemaUnavailable as error:
+        return HttpResponse(str(error), status=503, content_type='text/plain')
+
+    encoding = compression.negotiate(request)
+    etag = document.etags[encoding]
+    if _not_modified(request, etag):
+        response = HttpResponseNotModified()
+    elif encoding is not None:
+        response = HttpResponse(
+            document.encoded[encoding], content_type=document.content_type
+        )
+        response['Content-Encoding'] = encoding
+    else:
+        response = HttpResponse(
+            document.content, content_type=document.content_type
+        )
+
+    response['ETag'] = etag
+    response['Cache-Control'] = (
+        f'public, max-age={settings.SCHEMA_CACHE_MAX_AGE}'
+    )
+    patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+    return response
@@ -1,8 +1,26 @@
-from django.test import TestCase
+from decimal import Decimal
+
+from django.test import (
+    TestCase,
+    override_settings
+)
 from django.contrib.auth import get_user_model
+from django.db import (
+    connection,
+    transaction
+)
 from django.urls import reverse
 from django.test import Client
 
+from core.models import (
+    Recipe,
+    Tag
+)
+from core.paginators import (
+    EstimatedCountPaginator,
+    estimate_count
+)
+
 
 class AdminSiteTests(TestCase):
     def setUp(self):
@@ -36,3 +54,92 @@ class AdminSiteTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
+
+    def test_purge_users_action(self):
+        url = reverse('admin:core_user_changelist')
+        response = self.client.post(url, {
+            'action': 'purge_users',
+            '_selected_action': [self.user.id],
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+    def test_purge_users_skips_superusers(self):
+        other_admin = get_user_model().objects.create_superuser(
+            email='other@example.com', password='superuser'
+        )
+        url = reverse('admin:core_user_changelist')
+        self.client.post(url, {
+            'action': 'purge_users',
+            '_selected_action': [self.admin_user.id, other_admin.id],
+        })
+
+        self.admin_user.refresh_from_db()
+        other_admin.refresh_from_db()
+        self.assertTrue(self.admin_user.is_active)
+        self.assertTrue(other_admin.is_active)
+
+    def test_recipe_pages(self):
+        recipe = Recipe.objects.create(
+            user=self.user, title='Soup', time_minutes=5,
+            price=Decimal('1.00')
+        )
+        recipe.tags.add(Tag.objects.create(user=self.user, name='Vegan'))
+        Tag.objects.create(user=self.user, name='Unrelated')
+
+        changelist = self.client.get(
+            reverse('admin:core_recipe_changelist'), {'q': 'sou'}
+        )
+        change = self.client.get(
+            reverse('admin:core_recipe_change', args=[recipe.id])
+        )
+
+        self.assertContains(changelist, 'Soup')
+        self.assertContains(change, 'admin-autocomplete')
+        self.assertContains(change, 'Vegan')
+        self.assertNotContains(change, 'Unrelated')
+
+    def test_tag_and_ingredient_changelists(self):
+        for name in ('tag', 'ingredient'):
+            url = reverse(f'admin:core_{name}_changelist')
+            response = self.client.get(url, {'q': 'x'})
+
+            self.assertEqual(response.status_code, 200)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        Tag.objects.bulk_create(
+            [Tag(user=self.user, name=f'Tag {i}') for i in range(5)]
+        )
+
+    @override_settings(ADMIN_COUNT_ESTIMATE_THRESHOLD=10 ** 9)
+    def test_exact_count_below_threshold(self):
+        paginator = EstimatedCountPaginator(Tag.objects.order_by('id'), 2)
+
+        self.assertEqual(paginator.count, 5)
+
+    @override_settings(ADMIN_COUNT_ESTIMATE_THRESHOLD=0)
+    def test_estimate_above_threshold(self):
+        queryset = Tag.objects.filter(name__istartswith='tag').order_by('id')
+        paginator = EstimatedCountPaginator(queryset, 2)
+
+        self.assertEqual(paginator.count, estimate_count(queryset))
+
+    def test_table_estimate(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_tag')
+
+        self.assertEqual(estimate_count(Tag.objects.all()), 5)
+
+    def test_prefix_search_uses_index(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = Recipe.objects.filter(title__istartswith='sou').explain()
+
+        self.assertIn('core_recipe_title_upper', plan)
@@ -0,0 +1,132 @@
+import gzip
+import zlib
+from unittest import skipUnless
+
+from django.http import (
+    HttpResponse,
+    StreamingHttpResponse
+)
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    override_settings
+)
+
+from core import compression
+from core.compression import (
+    brotli,
+    zstandard
+)
+from core.middleware import CompressionMiddleware
+
+BODY = b'{"title": "Recipe"}' * 200
+JSON = 'application/json'
+
+
+class NegotiationTests(SimpleTestCase):
+    def negotiate(self, header):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)
+        return compression.negotiate(request, ['br', 'zstd', 'gzip'])
+
+    def test_server_preference_wins_ties(self):
+        self.assertEqual(self.negotiate('gzip, br'), 'br')
+
+    def test_quality_values(self):
+        self.assertEqual(self.negotiate('br;q=0.5, gzip'), 'gzip')
+        self.assertEqual(self.negotiate('gzip;q=0, *;q=0.1'), 'br')
+        self.assertIsNone(self.negotiate('gzip;q=0'))
+        self.assertIsNone(self.negotiate(''))
+
+
+@override_settings(COMPRESSION_ENCODINGS=['gzip'], COMPRESSION_MIN_SIZE=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept='gzip'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_compresses_large_response(self):
+        response = self.process(HttpResponse(BODY, content_type=JSON))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(
+            response['Content-Length'], str(len(response.content))
+        )
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_response_untouched(self):
+        response = self.process(HttpResponse(b'{}', content_type=JSON))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'{}')
+
+    def test_html_untouched(self):
+        response = self.process(HttpResponse(b'<p>Recipe</p>' * 200))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'<p>Recipe</p>' * 200)
+
+    def test_not_accepted(self):
+        response = self.process(
+            HttpResponse(BODY, content_type=JSON), accept='identity'
+        )
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, BODY)
+
+    def test_already_encoded_untouched(self):
+        original = HttpResponse(b'x' * 500, content_type=JSON)
+        original['Content-Encoding'] = 'br'
+
+        response = self.process(original)
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response.content, b'x' * 500)
+
+    def test_strong_etag_weakened(self):
+        original = HttpResponse(BODY, content_type=JSON)
+        original['ETag'] = '"abc"'
+
+        response = self.process(original)
+
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_streaming_compressed_per_chunk(self):
+        chunks = [b'[', b'{"id": 1}' * 50, b',', b'{"id": 2}' * 50, b']']
+
+        response = self.process(
+            StreamingHttpResponse(iter(chunks), content_type=JSON)
+        )
+
+        compressed = list(response.streaming_content)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertGreater(len(compressed), 2)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.assertEqual(decompressor.decompress(compressed[0]), b'[')
+        self.assertEqual(
+            gzip.decompress(b''.join(compressed)), b''.join(chunks)
+        )
+
+    @skipUnless(brotli, 'brotli is not installed')
+    @override_settings(COMPRESSION_ENCODINGS=['br', 'gzip'])
+    def test_brotli(self):
+        response = self.process(
+            HttpResponse(BODY, content_type=JSON), accept='gzip, br'
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), BODY)
+
+    @skipUnless(zstandard, 'zstandard is not installed')
+    @override_settings(COMPRESSION_ENCODINGS=['zstd', 'gzip'])
+    def test_zstd_streaming(self):
+        response = self.process(
+            StreamingHttpResponse(iter([BODY, BODY]), content_type=JSON),
+            accept='zstd'
+        )
+
+        content = b''.join(response.streaming_content)
+        self.assertEqual(response['Content-Encoding'], 'zstd')
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        self.assertEqual(decompressor.decompress(content), BODY + BODY)
@@ -0,0 +1,102 @@
+"""
+Tests that the API's access paths are served by their indexes.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+
+from core.models import (
+    Ingredient,
+    Recipe,
+    Tag
+)
+
+USERS = 10
+RECIPES = 300
+NAMES = 200
+
+
+class AccessPathIndexTests(TransactionTestCase):
+    def setUp(self):
+        through = Recipe.tags.through
+        for n in range(USERS):
+            user = get_user_model().objects.create_user(
+                email=f'user{n}@example.com', password='password123'
+            )
+            tags = Tag.objects.bulk_create(
+                Tag(user=user, name=f'Tag {i}') for i in range(NAMES)
+            )
+            Ingredient.objects.bulk_create(
+                Ingredient(user=user, name=f'Ingredient {i}')
+                for i in range(NAMES)
+            )
+            recipes = Recipe.objects.bulk_create(
+                Recipe(
+                    user=user,
+                    title=f'Recipe {i}',
+                    time_minutes=i % 120,
+                    price=Decimal(i % 50)
+                )
+                for i in range(RECIPES)
+            )
+            through.objects.bulk_create(
+                through(recipe_id=recipe.id, tag_id=tags[i % NAMES].id)
+                for i, recipe in enumerate(recipes)
+            )
+        self.user = user
+        self.tag = tags[0]
+
+        # Outside a transaction, so the visibility map allows index only
+        # scans just as autovacuum would on a live database.
+        with connection.cursor() as cursor:
+            for model in (Recipe, Tag, Ingredient, through):
+                cursor.execute(f'VACUUM ANALYZE {model._meta.db_table}')
+
+    def test_recipe_list_page(self):
+        plan = (
+            Recipe.objects.filter(user=self.user).order_by('-id')
+            .values('id', 'title', 'time_minutes', 'price', 'link')[:20]
+            .explain()
+        )
+
+        self.assertIn('Index Only Scan using core_recipe_user_id_desc', plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_sorted_recipe_pages(self):
+        indexes = {
+            'price': 'core_recipe_user_price',
+            'time_minutes': 'core_recipe_user_time',
+            'title': 'core_recipe_user_title',
+        }
+        for name, index in indexes.items():
+            plan = (
+                Recipe.objects.filter(user=self.user)
+                .order_by(f'-{name}', '-id')[:20]
+                .explain()
+            )
+
+            self.assertIn(index, plan)
+            self.assertNotIn('Sort', plan)
+
+    def test_tag_and_ingredient_lists(self):
+        for model in (Tag, Ingredient):
+            plan = (
+                model.objects.filter(user=self.user).order_by('-name')
+                .values('id', 'name')[:20]
+                .explain()
+            )
+
+            name = f'{model._meta.db_table}_user_name'
+            self.assertIn(f'Index Only Scan using {name}', plan)
+            self.assertNotIn('Sort', plan)
+
+    def test_recipes_by_tag(self):
+        plan = (
+            Recipe.tags.through.objects.filter(tag_id__in=[self.tag.id])
+            .values('recipe_id')
+            .explain()
+        )
+
+        self.assertIn('core_recipe_tags_tag_recipe', plan)
@@ -0,0 +1,204 @@
+"""
+Tests for the background job runner.
+"""
+import time
+from datetime import timedelta
+from io import StringIO
+
+import psycopg2
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings
+)
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+
+
+@jobs.register('test.echo')
+def echo(job):
+    return {'echo': job.payload.get('value')}
+
+
+@jobs.register('test.slow')
+def slow(job):
+    time.sleep(0.3)
+    beat = Job.objects.get(id=job.id).heartbeat_at
+    return {'beat': beat > job.heartbeat_at}
+
+
+@jobs.register('test.fail')
+def fail(job):
+    raise RuntimeError('boom')
+
+
+def create_user(email='user@example.com'):
+    return get_user_model().objects.create_user(
+        email=email, password='password123'
+    )
+
+
+class ClaimTests(TestCase):
+    def test_claims_by_priority_then_age(self):
+        low = jobs.enqueue('test.echo')
+        high = jobs.enqueue('test.echo', priority=5)
+        jobs.enqueue(
+            'test.echo', priority=9,
+            run_at=timezone.now() + timedelta(hours=1)
+        )
+
+        first = jobs.claim('worker')
+        second = jobs.claim('worker')
+
+        self.assertEqual([first.id, second.id], [high.id, low.id])
+        self.assertEqual(first.status, Job.STATUS_RUNNING)
+        self.assertEqual(first.attempts, 1)
+        self.assertEqual(first.locked_by, 'worker')
+        self.assertIsNone(jobs.claim('worker'))
+
+    def test_run_records_result(self):
+        jobs.enqueue('test.echo', {'value': 3})
+
+        job = jobs.claim('worker')
+        self.assertTrue(jobs.run(job))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.result, {'echo': 3})
+        self.assertIsNotNone(job.finished_at)
+
+    @override_settings(JOB_RETRY_BASE_DELAY=10)
+    def test_failure_is_retried_with_backoff(self):
+        jobs.enqueue('test.fail', max_attempts=2)
+
+        job = jobs.claim('worker')
+        with self.assertLogs('core.jobs', 'WARNING'):
+            self.assertFalse(jobs.run(job))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertIn('RuntimeError: boom', job.error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=7))
+        self.assertIsNone(jobs.claim('worker'))
+
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.run(jobs.claim('worker'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_unknown_job_fails(self):
+        jobs.enqueue('test.missing', max_attempts=1)
+
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.run(jobs.claim('worker'))
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertIn('UnknownJob', job.error)
+
+    @override_settings(JOB_PER_USER_CONCURRENCY=1)
+    def test_per_user_concurrency(self):
+        user = create_user()
+        other = create_user('other@example.com')
+        jobs.enqueue('test.echo', user=user, priority=5)
+        jobs.enqueue('test.echo', user=user, priority=5)
+        other_job = jobs.enqueue('test.echo', user=other)
+
+        first = jobs.claim('worker')
+        second = jobs.claim('worker')
+
+        self.assertEqual(first.user, user)
+        self.assertEqual(second.id, other_job.id)
+        self.assertIsNone(jobs.claim('worker'))
+
+    @override_settings(JOB_TIMEOUT=60)
+    def test_requeue_stale(self):
+        jobs.enqueue('test.echo')
+        job = jobs.claim('worker')
+        Job.objects.filter(id=job.id).update(
+            heartbeat_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.assertEqual(jobs.requeue_stale(), 1)
+        self.assertEqual(jobs.claim('worker').id, job.id)
+
+    @override_settings(JOB_TIMEOUT=60)
+    def test_stale_outcome_is_dropped(self):
+        jobs.enqueue('test.echo', {'value': 3})
+        stale = jobs.claim('worker')
+        Job.objects.filter(id=stale.id).update(
+            heartbeat_at=timezone.now() - timedelta(minutes=5)
+        )
+        jobs.requeue_stale()
+        jobs.claim('other')
+
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.run(stale)
+
+        job = Job.objects.get(id=stale.id)
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertEqual(job.locked_by, 'other')
+        self.assertIsNone(job.result)
+
+    @override_settings(JOB_TIMEOUT=60)
+    def test_heartbeat_keeps_long_jobs(self):
+        jobs.enqueue('test.echo')
+        job = jobs.claim('worker')
+        Job.objects.filter(id=job.id).update(
+            locked_at=timezone.now() - timedelta(minutes=5),
+            heartbeat_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.assertEqual(jobs.heartbeat([job.id]), 1)
+        self.assertEqual(jobs.requeue_stale(), 0)
+
+
+class ConcurrentClaimTests(TransactionTestCase):
+    def test_locked_jobs_are_skipped(self):
+        locked = jobs.enqueue('test.echo', priority=5)
+        free = jobs.enqueue('test.echo')
+
+        other = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with other.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT id FROM {Job._meta.db_table} '
+                    'WHERE id = %s FOR UPDATE',
+                    [locked.id]
+                )
+                claimed = jobs.claim('worker')
+        finally:
+            other.rollback()
+            other.close()
+
+        self.assertEqual(claimed.id, free.id)
+
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.05)
+    def test_workers_send_heartbeats(self):
+        job = jobs.enqueue('test.slow')
+
+        call_command('run_workers', '--burst', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.result, {'beat': True})
+        self.assertIsNone(job.heartbeat_at)
+
+    def test_run_workers_burst(self):
+        for value in range(5):
+            jobs.enqueue('test.echo', {'value': value})
+        out = StringIO()
+
+        call_command('run_workers', '--burst', '--threads=3', stdout=out)
+
+        self.assertEqual(
+            Job.objects.filter(status=Job.STATUS_SUCCEEDED).count(), 5
+        )
+        self.assertIn('Workers stopped.', out.getvalue())
@@ -0,0 +1,163 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+import msgpack
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from benchmark.render import recipe_payload
+from core.parsers import FastJSONParser
+from core.renderers import (
+    ColumnarJSONRenderer,
+    FastJSONRenderer,
+    MessagePackRenderer,
+    to_columns
+)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameOutput(self, data, accepted_media_type=None):
+        expected = JSONRenderer().render(data, accepted_media_type)
+        actual = FastJSONRenderer().render(data, accepted_media_type)
+
+        self.assertEqual(actual, expected)
+
+    def test_recipe_payload(self):
+        self.assertSameOutput(recipe_payload(50))
+
+    def test_special_types(self):
+        self.assertSameOutput({
+            'aware': datetime.datetime(
+                2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc
+            ),
+            'naive': datetime.datetime(2024, 5, 1, 12, 30),
+            'date': datetime.date(2024, 5, 1),
+            'time': datetime.time(12, 30, 1, 500),
+            'duration': datetime.timedelta(minutes=90),
+            'price': Decimal('5.25'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Recipe'),
+            'tuple': (1, 2),
+            'float': 0.1,
+            'none': None,
+        })
+
+    def test_strings_and_keys(self):
+        self.assertSameOutput({
+            'unicode': 'Crème brûlée – 東京',
+            'separators': 'a b c',
+            'control': 'tab\tnew\nline\x01',
+            1: 'integer key',
+            'quote': '"/\\',
+        })
+
+    def test_falls_back_for_big_integers(self):
+        self.assertSameOutput({'big': 2 ** 70})
+
+    def test_indent_uses_default_renderer(self):
+        self.assertSameOutput(
+            {'id': 1, 'tags': [1, 2]}, 'application/json; indent=4'
+        )
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, parser_class, content):
+        return parser_class().parse(io.BytesIO(content))
+
+    def test_parse(self):
+        content = '{"title": "Soup – 東京", "price": 5.25, "tags": []}'
+
+        self.assertEqual(
+            self.parse(FastJSONParser, content.encode()),
+            self.parse(JSONParser, content.encode())
+        )
+
+    def test_parse_big_integer(self):
+        content = b'{"id": 123456789012345678901234567890}'
+
+        self.assertEqual(
+            self.parse(FastJSONParser, content),
+            {'id': 123456789012345678901234567890}
+        )
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError) as expected:
+            self.parse(JSONParser, b'{"title": ')
+        with self.assertRaises(ParseError) as actual:
+            self.parse(FastJSONParser, b'{"title": ')
+
+        self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_rejects_nan(self):
+        with self.assertRaises(ParseError):
+            self.parse(FastJSONParser, b'{"price": NaN}')
+
+
+class ColumnarRendererTests(SimpleTestCase):
+    rows = [
+        {'id': 2, 'title': 'B', 'tags': [1, 3]},
+        {'id': 1, 'title': 'A', 'tags': []},
+        {'id': 0, 'title': 'C', 'tags': [3]},
+    ]
+
+    def test_to_columns(self):
+        self.assertEqual(to_columns(self.rows), {
+            'count': 3,
+            'columns': {'id': [2, 1, 0], 'title': ['B', 'A', 'C']},
+            'relations': {'tags': {'offsets': [0, 2, 2, 3], 'ids': [1, 3, 3]}},
+        })
+
+    def test_empty(self):
+        self.assertEqual(
+            to_columns([]), {'count': 0, 'columns': {}, 'relations': {}}
+        )
+
+    def test_document_with_included(self):
+        included = {'tags': [{'id': 1, 'name': 'x'}, {'id': 3, 'name': 'y'}]}
+
+        content = ColumnarJSONRenderer().render(
+            {'recipes': self.rows, 'included': included}
+        )
+
+        document = json.loads(content)
+        self.assertEqual(document['included'], included)
+        self.assertEqual(document['columns']['title'], ['B', 'A', 'C'])
+
+    def test_non_row_data_passes_through(self):
+        content = ColumnarJSONRenderer().render({'detail': 'Not found.'})
+
+        self.assertEqual(json.loads(content), {'detail': 'Not found.'})
+
+    def test_msgpack_round_trip(self):
+        content = MessagePackRenderer().render(
+            [{'id': 1, 'price': Decimal('5.25'), 'tags': [4]}]
+        )
+
+        self.assertEqual(msgpack.unpackb(content), {
+            'count': 1,
+            'columns': {'id': [1], 'price': [5.25]},
+            'relations': {'tags': {'offsets': [0, 1], 'ids': [4]}},
+        })
+
+    def test_msgpack_stream(self):
+        chunks = iter([self.rows[:2], self.rows[2:]])
+
+        content = b''.join(
+            MessagePackRenderer().stream(chunks, lambda: {'tags': []})
+        )
+
+        objects = list(msgpack.Unpacker(io.BytesIO(content)))
+        self.assertEqual(len(objects), 3)
+        self.assertEqual(objects[1]['batch']['columns']['id'], [0])
+        self.assertEqual(objects[2], {'included': {'tags': []}})
@@ -0,0 +1,132 @@
+import gzip
+import os
+import tempfile
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+
+from core import schema
+from core.compression import brotli
+
+SCHEMA_URL = reverse('api-schema')
+
+
+class SchemaCacheTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            SCHEMA_CACHE_DIR=self.directory.name,
+            CODE_VERSION='v1'
+        )
+        self.settings_override.enable()
+        schema.code_version.cache_clear()
+        schema.clear_cache()
+
+    def tearDown(self):
+        schema.clear_cache()
+        schema.code_version.cache_clear()
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def test_generate_schema_command(self):
+        call_command('generate_schema', stdout=open(os.devnull, 'w'))
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ['openapi-v1.json', 'openapi-v1.yaml']
+        )
+
+    def test_schema_generated_once(self):
+        with patch('core.schema.generate', wraps=schema.generate) as generate:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertIn(b'openapi:', first.content)
+        self.assertIn('max-age=', first['Cache-Control'])
+
+    def test_served_from_file_without_generation(self):
+        call_command('generate_schema', stdout=open(os.devnull, 'w'))
+        schema.clear_cache()
+
+        with patch('core.schema.generate') as generate:
+            response = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        generate.assert_not_called()
+        self.assertEqual(response.json()['openapi'][:2], '3.')
+
+    def test_etag_not_modified(self):
+        etag = self.client.get(SCHEMA_URL)['ETag']
+
+        response = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_per_encoding(self):
+        etag = self.client.get(SCHEMA_URL)['ETag']
+        gzip_etag = self.client.get(
+            SCHEMA_URL, HTTP_ACCEPT_ENCODING='gzip'
+        )['ETag']
+        self.assertNotEqual(gzip_etag, etag)
+
+        response = self.client.get(
+            SCHEMA_URL, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+        response = self.client.get(
+            SCHEMA_URL,
+            HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=f'"other", W/{gzip_etag}'
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_gzip_variant(self):
+        plain = self.client.get(SCHEMA_URL)
+
+        response = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @skipUnless(brotli, 'brotli is not installed')
+    def test_brotli_variant_precompressed(self):
+        plain = self.client.get(SCHEMA_URL)
+
+        with patch('brotli.compress') as compress:
+            response = self.client.get(
+                SCHEMA_URL, HTTP_ACCEPT_ENCODING='gzip, br'
+            )
+
+        compress.assert_not_called()
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+    @override_settings(SCHEMA_LIVE_GENERATION=False)
+    def test_live_generation_disabled(self):
+        response = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_new_code_version_regenerates(self):
+        self.client.get(SCHEMA_URL)
+
+        with override_settings(CODE_VERSION='v2'):
+            schema.code_version.cache_clear()
+            self.client.get(SCHEMA_URL)
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ['openapi-v2.json', 'openapi-v2.yaml']
+        )
@@ -0,0 +1,137 @@
+"""
+Thread pool executing background jobs; see core.jobs.
+
+Idle threads wait on a semaphore released once per NOTIFY on the jobs
+channel, with a poll timeout so delayed retries are picked up too. A
+heartbeat thread marks the pool's running jobs every JOB_HEARTBEAT_INTERVAL
+seconds.
+"""
+import logging
+import os
+import select
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.db import (
+    close_old_connections,
+    connection
+)
+
+from core import (
+    jobs,
+    notify
+)
+
+logger = logging.getLogger('core.jobs')
+
+STALE_CHECK_INTERVAL = 60
+
+
+class WorkerPool:
+    def __init__(self, threads, poll_interval=None):
+        self.threads = threads
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self.wakeups = threading.Semaphore(0)
+        self.stopping = threading.Event()
+        self.prefix = f'{socket.gethostname()}:{os.getpid()}'
+        self.running = set()
+        self.running_lock = threading.Lock()
+
+    def stop(self):
+        self.stopping.set()
+        for _ in range(self.threads):
+            self.wakeups.release()
+
+    def run(self, burst=False):
+        """Work until stopped, or with `burst` until no job is due."""
+        workers = [
+            threading.Thread(
+                target=self._work, args=(index, burst), daemon=True
+            )
+            for index in range(self.threads)
+        ]
+        listener = None
+        if not burst:
+            listener = threading.Thread(target=self._listen, daemon=True)
+            listener.start()
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.stopping.set()
+        if listener is not None:
+            listener.join()
+        heartbeat.join()
+
+    def _work(self, index, burst):
+        worker_id = f'{self.prefix}:{index}'
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    job = jobs.claim(worker_id)
+                    if job is not None:
+                        with self.running_lock:
+                            self.running.add(job.id)
+                        try:
+                            jobs.run(job)
+                        finally:
+                            with self.running_lock:
+                                self.running.discard(job.id)
+                        continue
+                except Exception:
+                    logger.exception('Worker %s failed', worker_id)
+                    connection.close()
+                    self.stopping.wait(self.poll_interval)
+                    continue
+
+                if burst:
+                    return
+                self.wakeups.acquire(timeout=self.poll_interval)
+        finally:
+            connection.close()
+
+    def _heartbeat(self):
+        interval = settings.JOB_HEARTBEAT_INTERVAL
+        try:
+            while not self.stopping.wait(interval):
+                with self.running_lock:
+                    job_ids = list(self.running)
+                if not job_ids:
+                    continue
+                try:
+                    jobs.heartbeat(job_ids)
+                except Exception:
+                    logger.exception('Job heartbeat failed')
+                    connection.close()
+        finally:
+            connection.close()
+
+    def _listen(self):
+        last_stale_check = 0
+        while not self.stopping.is_set():
+            listener = None
+            try:
+                listener = notify.listen([jobs.JOBS_CHANNEL])
+                while not self.stopping.is_set():
+                    if time.monotonic() - last_stale_check > (
+                            STALE_CHECK_INTERVAL):
+                        last_stale_check = time.monotonic()
+                        if jobs.requeue_stale():
+                            self.wakeups.release()
+                    if select.select([listener], [], [], 1)[0]:
+                        listener.poll()
+                        for _ in listener.notifies:
+                            self.wakeups.release()
+                        listener.notifies.clear()
+            except Exception:
+                logger.exception('Job listener failed, reconnecting')
+                self.stopping.wait(1)
+            finally:
+                if listener is not None:
+                    listener.close()
+                connection.close()
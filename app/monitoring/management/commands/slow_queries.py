@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from monitoring import slow_queries
+
+
+class Command(BaseCommand):
+    help = 'Print the captured slow queries with the highest total time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument(
+            '--plans', action='store_true',
+            help='Print the plan of the slowest capture of each query.'
+        )
+
+    def handle(self, *args, **options):
+        store = slow_queries.get_store()
+        offenders = slow_queries.summarize(store.list())[:options['limit']]
+        if not offenders:
+            self.stdout.write('No slow queries captured.')
+            return
+
+        for rank, offender in enumerate(offenders, start=1):
+            worst = offender['worst']
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'#{rank} {offender["fingerprint"]}  '
+                f'total {offender["total_ms"]:.1f}ms  '
+                f'count {offender["count"]}  '
+                f'max {offender["max_ms"]:.1f}ms'
+            ))
+            views = ', '.join(sorted(offender['views']))
+            self.stdout.write(f'  views: {views}')
+            self.stdout.write(f'  origin: {worst["frame"]}')
+            self.stdout.write(f'  params: {worst["params"]}')
+            self.stdout.write(f'  {offender["sql"]}')
+            if options['plans']:
+                with open(store.content_path(worst)) as plan:
+                    for line in plan.read().splitlines():
+                        self.stdout.write(f'    {line}')
@@ -0,0 +1,109 @@
+"""
+Prometheus metrics for views and database access.
+
+With PROMETHEUS_MULTIPROC_DIR set (before the app is imported), every worker
+process writes its samples to memory-mapped files in that directory and the
+metrics view aggregates all of them. Live gauges of a worker that exits
+stay in its files until process_exited() is called for it, which the
+server must do; with gunicorn, in gunicorn.conf.py:
+
+    def child_exit(server, worker):
+        from monitoring.metrics import process_exited
+        process_exited(worker.pid)
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0
+)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+UNRESOLVED = '<unresolved>'
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by view and action.',
+    ['view', 'action', 'method'],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter(
+    'http_requests',
+    'Requests by view, action and response status.',
+    ['view', 'action', 'method', 'status']
+)
+IN_FLIGHT = Gauge(
+    'http_requests_in_flight',
+    'Requests currently being processed.',
+    multiprocess_mode='livesum'
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes',
+    'Response body size by view and action.',
+    ['view', 'action'],
+    buckets=SIZE_BUCKETS
+)
+DB_QUERIES = Histogram(
+    'db_queries_per_request',
+    'Database queries issued per request.',
+    ['view', 'action'],
+    buckets=QUERY_COUNT_BUCKETS
+)
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Database query execution time.',
+    ['view', 'action'],
+    buckets=QUERY_BUCKETS
+)
+
+
+def view_labels(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNRESOLVED, ''
+
+    func = match.func
+    view_class = getattr(func, 'cls', None) or getattr(
+        func, 'view_class', None
+    )
+    if view_class is None:
+        return match.view_name or func.__name__, request.method.lower()
+
+    actions = getattr(func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return view_class.__name__, action
+
+
+def multiprocess_dir():
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+
+def process_exited(pid):
+    """Drop the live gauge samples of the exited worker process `pid`."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+def render_latest():
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,144 @@
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from monitoring import (
+    metrics,
+    slow_queries,
+    timing
+)
+
+logger = logging.getLogger('monitoring.timing')
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        self.header_opt_in = settings.SERVER_TIMING_HEADER_OPT_IN
+
+    def _enabled(self, request):
+        if self.header_opt_in and request.META.get('HTTP_X_SERVER_TIMING'):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not self._enabled(request):
+            return self.get_response(request)
+
+        request_timing = timing.RequestTiming()
+        token = timing.activate(request_timing)
+        try:
+            with connection.execute_wrapper(timing.execute_wrapper):
+                response = self.get_response(request)
+        finally:
+            timing.deactivate(token)
+
+        response['Server-Timing'] = self._header(request_timing)
+        self._log(request, response, request_timing)
+        return response
+
+    def process_template_response(self, request, response):
+        request_timing = timing.current()
+        if request_timing is None:
+            return response
+
+        started = time.perf_counter()
+
+        def rendered(response):
+            request_timing.add_phase(
+                'render', time.perf_counter() - started
+            )
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def _header(self, request_timing):
+        metrics = [
+            f'db;dur={request_timing.sql_time * 1000:.3f};'
+            f'desc="{request_timing.query_count} queries"',
+        ]
+        for name, duration in request_timing.phases.items():
+            metrics.append(f'{name};dur={duration * 1000:.3f}')
+        metrics.append(f'total;dur={request_timing.elapsed() * 1000:.3f}')
+
+        return ', '.join(metrics)
+
+    def _log(self, request, response, request_timing):
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+        }
+        record.update(request_timing.as_dict())
+        logger.info(json.dumps(record), extra={'timing': record})
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        durations = []
+
+        def record_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                durations.append(time.perf_counter() - start)
+
+        metrics.IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(record_query):
+                response = self.get_response(request)
+        finally:
+            metrics.IN_FLIGHT.dec()
+        elapsed = time.perf_counter() - start
+
+        view, action = metrics.view_labels(request)
+        metrics.REQUEST_LATENCY.labels(view, action, request.method).observe(
+            elapsed
+        )
+        metrics.REQUESTS.labels(
+            view, action, request.method, response.status_code
+        ).inc()
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(view, action).observe(
+                len(response.content)
+            )
+        metrics.DB_QUERIES.labels(view, action).observe(len(durations))
+        query_duration = metrics.DB_QUERY_DURATION.labels(view, action)
+        for duration in durations:
+            query_duration.observe(duration)
+
+        return response
+
+
+class SlowQueryMiddleware:
+    recorder = None
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_THRESHOLD_MS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if SlowQueryMiddleware.recorder is None:
+            SlowQueryMiddleware.recorder = slow_queries.SlowQueryRecorder(
+                settings.SLOW_QUERY_THRESHOLD_MS,
+                settings.SLOW_QUERY_CAPTURE_INTERVAL,
+                settings.SLOW_QUERY_CAPTURES_PER_MINUTE
+            )
+
+    def __call__(self, request):
+        with connection.execute_wrapper(self.recorder.wrapper(request)):
+            return self.get_response(request)
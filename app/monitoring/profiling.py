@@ -0,0 +1,182 @@
+"""
+Opt-in request profiling.
+
+Staff users can profile a single request by sending `X-Profile: 1` (or
+`?profile=1`); otherwise a PROFILING_SAMPLE_RATE share of requests to
+profiled views is captured. The statistical sampler produces folded stacks
+ready for flamegraph tools, the cProfile mode produces pstats dumps.
+"""
+import cProfile
+import io
+import marshal
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from monitoring.storage import RingBufferStore
+
+MODE_SAMPLE = 'sample'
+MODE_CPROFILE = 'cprofile'
+
+
+def get_store():
+    return RingBufferStore(settings.PROFILING_DIR, settings.PROFILING_CAPACITY)
+
+
+class StackSampler:
+    extension = 'folded'
+    content_type = 'text/plain; charset=utf-8'
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.counts = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.counts[self._fold(frame)] += 1
+
+    def _fold(self, frame):
+        stack = []
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '?')
+            stack.append(f'{module}:{frame.f_code.co_name}')
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def dump(self):
+        lines = (f'{stack} {count}' for stack, count in self.counts.items())
+        return '\n'.join(lines).encode()
+
+
+class CProfiler:
+    extension = 'prof'
+    content_type = 'application/octet-stream'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def dump(self):
+        self.profile.create_stats()
+        buffer = io.BytesIO()
+        marshal.dump(self.profile.stats, buffer)
+        return buffer.getvalue()
+
+
+def should_profile(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff and (
+        request.META.get('HTTP_X_PROFILE')
+        or request.query_params.get('profile')
+    ):
+        return True
+
+    rate = settings.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def start_profiler():
+    if settings.PROFILING_MODE == MODE_CPROFILE:
+        profiler = CProfiler()
+    else:
+        profiler = StackSampler(settings.PROFILING_INTERVAL)
+    profiler.started = time.perf_counter()
+    profiler.start()
+    return profiler
+
+
+def finish_profiler(profiler, meta, entry_id=None):
+    profiler.stop()
+    meta = dict(
+        meta,
+        mode=profiler.extension,
+        content_type=profiler.content_type,
+        duration_ms=round((time.perf_counter() - profiler.started) * 1000, 3)
+    )
+    return get_store().save(
+        profiler.dump(), profiler.extension, meta, entry_id=entry_id
+    )
+
+
+def _finished_when_closed(content, finish):
+    """Iterate streamed `content`, calling `finish` once it is closed."""
+    try:
+        yield from content
+    finally:
+        finish()
+
+
+class ProfilingMixin:
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if should_profile(request):
+            self._profiler = start_profiler()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # finalize_response is skipped when an exception is re-raised,
+            # and a profiler left running would never stop.
+            profiler = getattr(self, '_profiler', None)
+            if profiler is not None:
+                self._profiler = None
+                finish_profiler(profiler, self._profile_meta(request, 500))
+
+    def _profile_meta(self, request, status):
+        return {
+            'view': type(self).__name__,
+            'action': getattr(self, 'action', None) or request.method.lower(),
+            'method': request.method,
+            'path': request.path,
+            'status': status,
+            'user': request.user.pk,
+        }
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        profiler = getattr(self, '_profiler', None)
+        if profiler is None:
+            return response
+
+        self._profiler = None
+        profile_id = get_store().new_id()
+        meta = self._profile_meta(request, response.status_code)
+        response['X-Profile-Id'] = profile_id
+
+        def finish(*args):
+            finish_profiler(profiler, meta, entry_id=profile_id)
+
+        if response.streaming:
+            # The body is generated after the view returns.
+            response.streaming_content = _finished_when_closed(
+                response.streaming_content, finish
+            )
+        elif getattr(response, 'is_rendered', True):
+            finish()
+        else:
+            response.add_post_render_callback(finish)
+        return response
@@ -0,0 +1,269 @@
+"""
+Capture of slow SQL statements with their EXPLAIN (ANALYZE, BUFFERS) plans.
+
+EXPLAIN ANALYZE runs the statement again, so it always runs in a
+transaction or savepoint that is rolled back. Statements with side
+effects outside the transaction, or that would write again, are only
+planned: those with data-modifying CTEs or calls to functions such as
+pg_notify and nextval.
+
+Captures are rate-limited per fingerprint and globally. Occurrences that
+are not captured are counted and folded into the next capture of the same
+fingerprint, so totals stay accurate. The request only queues a capture; a
+background thread explains it on its own connection and stores the plan.
+"""
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import traceback
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+
+from monitoring.metrics import view_labels
+from monitoring.storage import RingBufferStore
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+WHITESPACE = re.compile(r'\s+')
+EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+# Not the row locks of SELECT ... FOR [NO KEY] UPDATE.
+WRITES = re.compile(
+    r'(?<!FOR )(?<!KEY )\b(INSERT|UPDATE|DELETE|MERGE)\b', re.IGNORECASE
+)
+SIDE_EFFECTS = re.compile(
+    r'\b(pg_notify|nextval|setval|set_config|pg_sleep|'
+    r'pg_(try_)?advisory_\w+|lo_\w+|dblink\w*)\s*\(',
+    re.IGNORECASE
+)
+MONITORING_DIR = os.path.dirname(os.path.abspath(__file__))
+
+logger = logging.getLogger('monitoring.slow_queries')
+
+
+def get_store():
+    return RingBufferStore(
+        settings.SLOW_QUERY_DIR, settings.SLOW_QUERY_CAPACITY
+    )
+
+
+def normalize_sql(sql):
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = PLACEHOLDER_LIST.sub('(...)', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(sql):
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def normalize_param(value):
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}[{len(value)}]'
+    if isinstance(value, (str, bytes)):
+        return f'{type(value).__name__}({len(value)})'
+    return type(value).__name__
+
+
+def normalize_params(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: normalize_param(value) for key, value in params.items()}
+    return [normalize_param(value) for value in params]
+
+
+def origin_frame():
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if (filename.startswith(base_dir)
+                and not filename.startswith(MONITORING_DIR)):
+            relative = os.path.relpath(filename, base_dir)
+            return f'{relative}:{frame.lineno} in {frame.name}'
+    return None
+
+
+def analyzable(sql):
+    """Whether running `sql` again under EXPLAIN ANALYZE is harmless."""
+    sql = STRING_LITERAL.sub('?', sql)
+    return not WRITES.search(sql) and not SIDE_EFFECTS.search(sql)
+
+
+def explain(connection, sql, params):
+    if connection.vendor != 'postgresql' or not EXPLAINABLE.match(sql):
+        return None
+
+    options = ' (ANALYZE, BUFFERS)' if analyzable(sql) else ''
+    if connection.get_autocommit():
+        begin, end = ['BEGIN'], ['ROLLBACK']
+    else:
+        begin = ['SAVEPOINT slow_query_explain']
+        end = [
+            'ROLLBACK TO SAVEPOINT slow_query_explain',
+            'RELEASE SAVEPOINT slow_query_explain',
+        ]
+    with connection.connection.cursor() as cursor:
+        for statement in begin:
+            cursor.execute(statement)
+        try:
+            cursor.execute(f'EXPLAIN{options} {sql}', params)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+        except connection.Database.Error as error:
+            return f'EXPLAIN failed: {error}'
+        finally:
+            for statement in end:
+                cursor.execute(statement)
+
+
+class RateLimiter:
+    def __init__(self, interval, per_minute):
+        self.interval = interval
+        self.per_minute = per_minute
+        self._last_capture = {}
+        self._window = []
+        self._lock = threading.Lock()
+
+    def allow(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            last = self._last_capture.get(key)
+            if last is not None and now - last < self.interval:
+                return False
+            self._window = [t for t in self._window if now - t < 60]
+            if len(self._window) >= self.per_minute:
+                return False
+            self._window.append(now)
+            self._last_capture[key] = now
+            return True
+
+
+class SlowQueryRecorder:
+    def __init__(self, threshold_ms, interval, per_minute):
+        self.threshold = threshold_ms / 1000
+        self.limiter = RateLimiter(interval, per_minute)
+        self._suppressed = defaultdict(lambda: [0, 0.0])
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=per_minute)
+        self._thread = None
+
+    def wrapper(self, request=None):
+        def capture(execute, sql, params, many, context):
+            start = time.perf_counter()
+            result = execute(sql, params, many, context)
+            duration = time.perf_counter() - start
+            if duration >= self.threshold and not many:
+                view = None
+                if request is not None:
+                    view = '.'.join(view_labels(request))
+                self.record(sql, params, duration, context, view)
+            return result
+
+        return capture
+
+    def _suppress(self, key, count, total_ms):
+        with self._lock:
+            self._suppressed[key][0] += count
+            self._suppressed[key][1] += total_ms
+
+    def _take_suppressed(self, key):
+        with self._lock:
+            count, total = self._suppressed.pop(key, (0, 0.0))
+        return count, total
+
+    def record(self, sql, params, duration, context, view=None):
+        """Queue a capture of `sql`; return whether it was queued."""
+        key = fingerprint(sql)
+        if not self.limiter.allow(key):
+            self._suppress(key, 1, duration * 1000)
+            return False
+
+        suppressed_count, suppressed_ms = self._take_suppressed(key)
+        meta = {
+            'fingerprint': key,
+            'sql': normalize_sql(sql),
+            'params': normalize_params(params),
+            'duration_ms': round(duration * 1000, 3),
+            'suppressed_count': suppressed_count,
+            'suppressed_ms': round(suppressed_ms, 3),
+            'view': view,
+            'frame': origin_frame(),
+            'captured_at': time.time(),
+        }
+        try:
+            self._queue.put_nowait(
+                (context['connection'].alias, sql, params, meta)
+            )
+        except queue.Full:
+            self._suppress(
+                key, 1 + suppressed_count,
+                duration * 1000 + suppressed_ms
+            )
+            return False
+        self._ensure_thread()
+        return True
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='slow-query-explain', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            capture = self._queue.get()
+            try:
+                self._capture(*capture)
+            except Exception:
+                logger.exception('Slow query capture failed')
+            finally:
+                self._queue.task_done()
+
+    def _capture(self, alias, sql, params, meta):
+        connection = connections[alias]
+        try:
+            plan = explain(connection, sql, params)
+        finally:
+            # Captures are rare; an idle connection would outlive them.
+            connection.close()
+        return get_store().save((plan or '').encode(), 'plan', meta)
+
+    def wait(self):
+        """Block until every queued capture is stored."""
+        self._queue.join()
+
+
+def summarize(entries):
+    offenders = {}
+    for entry in entries:
+        offender = offenders.setdefault(entry['fingerprint'], {
+            'fingerprint': entry['fingerprint'],
+            'sql': entry['sql'],
+            'views': set(),
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'worst': entry,
+        })
+        offender['count'] += 1 + entry['suppressed_count']
+        offender['total_ms'] += entry['duration_ms'] + entry['suppressed_ms']
+        if entry['view']:
+            offender['views'].add(entry['view'])
+        if entry['duration_ms'] > offender['max_ms']:
+            offender['max_ms'] = entry['duration_ms']
+            offender['worst'] = entry
+
+    return sorted(
+        offenders.values(), key=lambda o: o['total_ms'], reverse=True
+    )
@@ -0,0 +1,83 @@
+"""
+Bounded on-disk ring buffer for captured diagnostics.
+"""
+import json
+import os
+import re
+import time
+import uuid
+
+ENTRY_ID = re.compile(r'^[0-9]+-[0-9]+-[0-9a-f]+$')
+
+
+class RingBufferStore:
+    def __init__(self, directory, capacity):
+        self.directory = str(directory)
+        self.capacity = capacity
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def new_id(self):
+        return f'{time.time_ns()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+    def save(self, content, extension, meta, entry_id=None):
+        os.makedirs(self.directory, exist_ok=True)
+        entry_id = entry_id or self.new_id()
+        filename = f'{entry_id}.{extension}'
+        meta = dict(meta, id=entry_id, filename=filename, size=len(content))
+
+        with open(self._path(filename), 'wb') as content_file:
+            content_file.write(content)
+        temporary = self._path(f'.{entry_id}.json')
+        with open(temporary, 'w') as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(temporary, self._path(f'{entry_id}.json'))
+
+        self._evict()
+        return entry_id
+
+    def _entry_ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            name[:-len('.json')] for name in names
+            if name.endswith('.json') and not name.startswith('.')
+        )
+
+    def _evict(self):
+        entry_ids = self._entry_ids()
+        for entry_id in entry_ids[:max(len(entry_ids) - self.capacity, 0)]:
+            self.delete(entry_id)
+
+    def delete(self, entry_id):
+        meta = self.get(entry_id)
+        if meta is None:
+            return
+        for name in (meta['filename'], f'{entry_id}.json'):
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    def get(self, entry_id):
+        if not ENTRY_ID.match(entry_id):
+            return None
+        try:
+            with open(self._path(f'{entry_id}.json')) as meta_file:
+                return json.load(meta_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def content_path(self, meta):
+        return self._path(meta['filename'])
+
+    def list(self):
+        entries = []
+        for entry_id in reversed(self._entry_ids()):
+            meta = self.get(entry_id)
+            if meta is not None:
+                entries.append(meta)
+        return entries
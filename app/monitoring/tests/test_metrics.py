@@ -0,0 +1,116 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from monitoring import metrics
+
+METRICS_URL = reverse('monitoring:metrics')
+RECIPES_URL = reverse('recipe:recipe-list')
+TOKEN_URL = reverse('user:token')
+
+WORKER_SCRIPT = '''
+from prometheus_client import Counter
+Counter('worker_jobs', 'Jobs.', ['kind']).labels('export').inc()
+'''
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123'
+        )
+        self.client = APIClient()
+        self.staff = APIClient()
+        self.staff.force_login(get_user_model().objects.create_user(
+            email='staff@example.com', password='password123', is_staff=True
+        ))
+
+    def test_view_and_action_labels(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(RECIPES_URL)
+
+        response = self.staff.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn(
+            'http_request_duration_seconds_count{action="list",'
+            'method="GET",view="RecipeViewSet"}',
+            content
+        )
+        self.assertIn(
+            'db_queries_per_request_count{action="list",'
+            'view="RecipeViewSet"}',
+            content
+        )
+        self.assertIn('http_requests_in_flight', content)
+
+    def test_api_view_labels(self):
+        self.client.post(TOKEN_URL, {'email': 'x@example.com'})
+
+        content = self.staff.get(METRICS_URL).content.decode()
+
+        self.assertIn(
+            'http_requests_total{action="post",method="POST",'
+            'status="400",view="CreateTokenView"}',
+            content
+        )
+
+    def test_denied_by_default(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        with override_settings(METRICS_PUBLIC=True):
+            self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_required_when_configured(self):
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION='Bearer secret'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION='Bearer s\xe9cret'
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_aggregates_worker_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory)
+            for _ in range(2):
+                subprocess.run(
+                    [sys.executable, '-c', WORKER_SCRIPT],
+                    env=env,
+                    check=True
+                )
+
+            with patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory):
+                body, _ = metrics.render_latest()
+
+        self.assertIn(
+            'worker_jobs_total{kind="export"} 2.0', body.decode()
+        )
+
+    def test_exited_process_gauges_dropped(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory):
+            open(os.path.join(directory, 'gauge_livesum_4242.db'), 'wb')
+            metrics.process_exited(4242)
+
+            self.assertEqual(os.listdir(directory), [])
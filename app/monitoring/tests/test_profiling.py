@@ -0,0 +1,146 @@
+import pstats
+import tempfile
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from monitoring import profiling
+from monitoring.storage import RingBufferStore
+
+RECIPES_URL = reverse('recipe:recipe-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+ME_URL = reverse('user:me')
+PROFILES_URL = reverse('monitoring:profile-list')
+
+
+def download_url(profile_id):
+    return reverse('monitoring:profile-download', args=[profile_id])
+
+
+class RingBufferStoreTests(SimpleTestCase):
+    def test_evicts_oldest_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = RingBufferStore(directory, capacity=2)
+            ids = [store.save(b'data', 'txt', {'n': n}) for n in range(3)]
+
+            entries = store.list()
+
+            self.assertEqual([e['id'] for e in entries], ids[:0:-1])
+            self.assertIsNone(store.get(ids[0]))
+
+    def test_rejects_invalid_ids(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = RingBufferStore(directory, capacity=2)
+
+            self.assertIsNone(store.get('../../etc/passwd'))
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            PROFILING_DIR=self.directory.name,
+            PROFILING_SAMPLE_RATE=0,
+            PROFILING_INTERVAL=0.001
+        )
+        self.settings_override.enable()
+        self.staff = get_user_model().objects.create_superuser(
+            'admin@example.com', 'password123'
+        )
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def test_staff_profile_request(self):
+        self.client.force_authenticate(self.staff)
+
+        response = self.client.get(RECIPES_URL, HTTP_X_PROFILE='1')
+
+        profile_id = response['X-Profile-Id']
+        meta = profiling.get_store().get(profile_id)
+        self.assertEqual(meta['view'], 'RecipeViewSet')
+        self.assertEqual(meta['action'], 'list')
+        self.assertEqual(meta['mode'], 'folded')
+
+    def test_profile_finished_on_exception(self):
+        self.client.force_authenticate(self.staff)
+        threads = threading.active_count()
+
+        with patch(
+            'recipe.views.RecipeViewSet.list', side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.get(RECIPES_URL, HTTP_X_PROFILE='1')
+
+        entries = profiling.get_store().list()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['status'], 500)
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_streamed_profile_finished_when_closed(self):
+        self.client.force_authenticate(self.staff)
+
+        response = self.client.get(EXPORT_URL, HTTP_X_PROFILE='1')
+
+        profile_id = response['X-Profile-Id']
+        self.assertIsNone(profiling.get_store().get(profile_id))
+        b''.join(response.streaming_content)
+        response.close()
+        meta = profiling.get_store().get(profile_id)
+        self.assertEqual(meta['action'], 'export')
+
+    def test_regular_user_cannot_request_profile(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(RECIPES_URL, HTTP_X_PROFILE='1')
+
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(profiling.get_store().list(), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_MODE='cprofile')
+    def test_sampled_cprofile(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(ME_URL)
+
+        meta = profiling.get_store().get(response['X-Profile-Id'])
+        self.assertEqual(meta['view'], 'ManageUserView')
+        stats = pstats.Stats(profiling.get_store().content_path(meta))
+        self.assertGreater(stats.total_calls, 0)
+
+    def test_list_and_download_profiles(self):
+        self.client.force_authenticate(self.staff)
+        profile_id = self.client.get(
+            RECIPES_URL, HTTP_X_PROFILE='1'
+        )['X-Profile-Id']
+
+        response = self.client.get(PROFILES_URL)
+        self.assertEqual(response.data[0]['id'], profile_id)
+
+        response = self.client.get(download_url(profile_id))
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        for line in content.splitlines():
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(int(count) > 0)
+
+    def test_profiles_staff_only(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(PROFILES_URL)
+
+        self.assertEqual(response.status_code, 403)
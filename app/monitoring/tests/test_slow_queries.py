@@ -0,0 +1,171 @@
+import tempfile
+import threading
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag
+)
+from monitoring import slow_queries
+from monitoring.middleware import SlowQueryMiddleware
+
+RECIPES_URL = reverse('recipe:recipe-list')
+
+
+class NormalizationTests(SimpleTestCase):
+    def test_normalize_sql(self):
+        sql = (
+            "SELECT * FROM core_recipe WHERE id IN (%s, %s, %s) "
+            "AND title = 'Soup'  AND time_minutes > 10"
+        )
+
+        self.assertEqual(
+            slow_queries.normalize_sql(sql),
+            'SELECT * FROM core_recipe WHERE id IN (...) '
+            'AND title = ? AND time_minutes > ?'
+        )
+
+    def test_fingerprint_ignores_literals(self):
+        self.assertEqual(
+            slow_queries.fingerprint('SELECT 1 WHERE x = 5'),
+            slow_queries.fingerprint('SELECT 2 WHERE x =  7'),
+        )
+
+    def test_normalize_params(self):
+        self.assertEqual(
+            slow_queries.normalize_params([5, 'secret', [1, 2], None]),
+            ['int', 'str(6)', 'list[2]', None]
+        )
+
+    def test_rate_limiter(self):
+        limiter = slow_queries.RateLimiter(interval=60, per_minute=2)
+
+        self.assertTrue(limiter.allow('a', now=0))
+        self.assertFalse(limiter.allow('a', now=10))
+        self.assertTrue(limiter.allow('b', now=10))
+        self.assertFalse(limiter.allow('c', now=20))
+        self.assertTrue(limiter.allow('a', now=70))
+
+
+class SlowQueryCaptureTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            SLOW_QUERY_THRESHOLD_MS=0.000001,
+            SLOW_QUERY_DIR=self.directory.name
+        )
+        self.settings_override.enable()
+        SlowQueryMiddleware.recorder = None
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        Recipe.objects.create(
+            user=self.user, title='Soup', time_minutes=5,
+            price=Decimal('2.50')
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        SlowQueryMiddleware.recorder = None
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def test_captures_plan_and_origin(self):
+        self.client.get(RECIPES_URL)
+        SlowQueryMiddleware.recorder.wait()
+
+        entries = slow_queries.get_store().list()
+        recipe_query = next(
+            entry for entry in entries
+            if 'FROM "core_recipe"' in entry['sql']
+        )
+        self.assertEqual(recipe_query['view'], 'RecipeViewSet.list')
+        self.assertEqual(recipe_query['params'], ['int'])
+        with open(slow_queries.get_store().content_path(recipe_query)) as f:
+            plan = f.read()
+        self.assertIn('actual time=', plan)
+
+    def test_explained_off_the_request_thread(self):
+        threads = []
+
+        def explain(connection, sql, params):
+            threads.append(threading.current_thread())
+            return 'plan'
+
+        with patch.object(slow_queries, 'explain', explain):
+            self.client.get(RECIPES_URL)
+            SlowQueryMiddleware.recorder.wait()
+
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_explain_rolls_back(self):
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        sql = 'SELECT id FROM core_tag WHERE id = %s FOR UPDATE'
+
+        plan = slow_queries.explain(connection, sql, [tag.id])
+
+        self.assertIn('actual time=', plan)
+        self.assertTrue(Tag.objects.filter(id=tag.id).exists())
+
+    def test_side_effects_only_planned(self):
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        statements = [
+            'WITH deleted AS (DELETE FROM core_tag WHERE id = %s '
+            'RETURNING id) SELECT * FROM deleted',
+            "SELECT pg_notify('channel', %s::text)",
+        ]
+        for sql in statements:
+            with self.subTest(sql=sql):
+                plan = slow_queries.explain(connection, sql, [tag.id])
+
+                self.assertNotIn('actual time=', plan)
+        self.assertTrue(Tag.objects.filter(id=tag.id).exists())
+
+    def test_repeated_queries_are_rate_limited(self):
+        self.client.get(RECIPES_URL)
+        self.client.get(RECIPES_URL)
+
+        recorder = SlowQueryMiddleware.recorder
+        self.assertTrue(recorder._suppressed)
+
+    def test_top_offenders_command(self):
+        self.client.get(RECIPES_URL)
+        SlowQueryMiddleware.recorder.wait()
+        out = StringIO()
+
+        call_command('slow_queries', '--plans', stdout=out)
+
+        self.assertIn('core_recipe', out.getvalue())
+        self.assertIn('actual time=', out.getvalue())
+
+    def test_summarize_includes_suppressed(self):
+        entries = [
+            {'fingerprint': 'a', 'sql': 'q', 'view': 'V.list',
+             'duration_ms': 10.0, 'suppressed_count': 4,
+             'suppressed_ms': 40.0},
+            {'fingerprint': 'b', 'sql': 'r', 'view': None,
+             'duration_ms': 30.0, 'suppressed_count': 0,
+             'suppressed_ms': 0.0},
+        ]
+
+        offenders = slow_queries.summarize(entries)
+
+        self.assertEqual(offenders[0]['fingerprint'], 'a')
+        self.assertEqual(offenders[0]['count'], 5)
+        self.assertEqual(offenders[0]['total_ms'], 50.0)
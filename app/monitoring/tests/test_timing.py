@@ -0,0 +1,110 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from monitoring import timing
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+ME_URL = reverse('user:me')
+
+
+def create_user():
+    return get_user_model().objects.create_user(
+        email='user@example.com',
+        password='password123'
+    )
+
+
+class PhaseTests(TestCase):
+    def test_phase_without_active_timing(self):
+        with timing.phase('serialize'):
+            pass
+
+        self.assertIsNone(timing.current())
+
+    def test_phase_excludes_sql_time(self):
+        request_timing = timing.RequestTiming()
+        token = timing.activate(request_timing)
+        try:
+            with timing.phase('serialize'):
+                request_timing.add_query(10.0)
+        finally:
+            timing.deactivate(token)
+
+        self.assertEqual(request_timing.query_count, 1)
+        self.assertLess(request_timing.phases['serialize'], 0)
+
+
+@override_settings(
+    SERVER_TIMING_SAMPLE_RATE=0,
+    SERVER_TIMING_HEADER_OPT_IN=True
+)
+class ServerTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Recipe.objects.create(
+            user=self.user,
+            title='Recipe',
+            time_minutes=5,
+            price=Decimal('5.00')
+        )
+
+    def test_disabled_by_default(self):
+        response = self.client.get(RECIPES_URL)
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_enabled_per_request(self):
+        with self.assertLogs('monitoring.timing', level='INFO') as logs:
+            response = self.client.get(
+                RECIPES_URL, HTTP_X_SERVER_TIMING='1'
+            )
+
+        header = response['Server-Timing']
+        self.assertIn('db;dur=', header)
+        self.assertIn('serialize;dur=', header)
+        self.assertIn('render;dur=', header)
+        self.assertIn('total;dur=', header)
+        self.assertIn('"view": "recipe:recipe-list"', logs.output[0])
+        self.assertIn('"queries": ', logs.output[0])
+
+    def test_generic_views_time_serialization(self):
+        for url in (TAGS_URL, ME_URL):
+            with self.subTest(url=url), self.assertLogs('monitoring.timing'):
+                response = self.client.get(url, HTTP_X_SERVER_TIMING='1')
+
+                self.assertIn('serialize;dur=', response['Server-Timing'])
+
+    def test_serializers_not_patched(self):
+        self.assertFalse(hasattr(BaseSerializer.data.fget, 'timed'))
+
+    @override_settings(SERVER_TIMING_HEADER_OPT_IN=False)
+    def test_header_opt_in_can_be_disabled(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(RECIPES_URL, HTTP_X_SERVER_TIMING='1')
+
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_sampled_requests(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.assertLogs('monitoring.timing', level='INFO'):
+            response = client.get(RECIPES_URL)
+
+        self.assertIn('Server-Timing', response)
@@ -0,0 +1,137 @@
+"""
+Per-request phase timing: SQL, serialization and rendering.
+"""
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from rest_framework import (
+    mixins,
+    status
+)
+from rest_framework.response import Response
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.phases = defaultdict(float)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def add_query(self, duration):
+        self.query_count += 1
+        self.sql_time += duration
+
+    def add_phase(self, name, duration):
+        self.phases[name] += duration
+
+    def as_dict(self):
+        data = {
+            'total_ms': round(self.elapsed() * 1000, 3),
+            'db_ms': round(self.sql_time * 1000, 3),
+            'queries': self.query_count,
+        }
+        for name, duration in self.phases.items():
+            data[f'{name}_ms'] = round(duration * 1000, 3)
+        return data
+
+
+def current():
+    return _current.get()
+
+
+def activate(timing):
+    return _current.set(timing)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def phase(name):
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    sql_before = timing.sql_time
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        timing.add_phase(name, duration - (timing.sql_time - sql_before))
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(time.perf_counter() - start)
+
+
+def serialize(serializer):
+    """The serializer's data, timed as the serialize phase."""
+    with phase('serialize'):
+        return serializer.data
+
+
+# DRF's generic model mixins with their serializer output timed.
+
+class TimedListModelMixin(mixins.ListModelMixin):
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serialize(serializer))
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serialize(serializer))
+
+
+class TimedRetrieveModelMixin(mixins.RetrieveModelMixin):
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        return Response(serialize(serializer))
+
+
+class TimedCreateModelMixin(mixins.CreateModelMixin):
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        data = serialize(serializer)
+        return Response(
+            data,
+            status=status.HTTP_201_CREATED,
+            headers=self.get_success_headers(data)
+        )
+
+
+class TimedUpdateModelMixin(mixins.UpdateModelMixin):
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(
+            instance, data=request.data, partial=partial
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        if getattr(instance, '_prefetched_objects_cache', None):
+            # Prefetched relations are stale after the update.
+            instance._prefetched_objects_cache = {}
+        return Response(serialize(serializer))
@@ -0,0 +1,19 @@
+from django.urls import path
+
+from monitoring import views
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    path('metrics', views.metrics, name='metrics'),
+    path(
+        'monitoring/profiles/',
+        views.ProfileListView.as_view(),
+        name='profile-list'
+    ),
+    path(
+        'monitoring/profiles/<str:profile_id>/',
+        views.ProfileDownloadView.as_view(),
+        name='profile-download'
+    ),
+]
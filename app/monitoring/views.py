@@ -0,0 +1,79 @@
+import hmac
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden
+)
+from drf_spectacular.utils import (
+    OpenApiTypes,
+    extend_schema
+)
+from rest_framework import (
+    authentication,
+    permissions
+)
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from monitoring import metrics as prometheus
+from monitoring import profiling
+
+
+def _metrics_allowed(request):
+    if settings.METRICS_PUBLIC:
+        return True
+    token = settings.METRICS_TOKEN
+    # Headers arrive decoded as latin-1; compare_digest rejects non-ASCII
+    # str, so bytes are compared.
+    provided = request.META.get('HTTP_AUTHORIZATION', '').encode('latin-1')
+    if token and hmac.compare_digest(provided, f'Bearer {token}'.encode()):
+        return True
+    return request.user.is_staff
+
+
+def metrics(request):
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+
+    body, content_type = prometheus.render_latest()
+    return HttpResponse(body, content_type=content_type)
+
+
+class ProfileListView(APIView):
+    authentication_classes = [
+        authentication.TokenAuthentication,
+        authentication.SessionAuthentication
+    ]
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        operation_id='monitoring_profiles_list',
+        responses={200: OpenApiTypes.OBJECT}
+    )
+    def get(self, request):
+        return Response(profiling.get_store().list())
+
+
+class ProfileDownloadView(APIView):
+    authentication_classes = ProfileListView.authentication_classes
+    permission_classes = ProfileListView.permission_classes
+
+    @extend_schema(
+        operation_id='monitoring_profiles_download',
+        responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY}
+    )
+    def get(self, request, profile_id):
+        store = profiling.get_store()
+        meta = store.get(profile_id)
+        if meta is None:
+            raise Http404
+
+        return FileResponse(
+            open(store.content_path(meta), 'rb'),
+            as_attachment=True,
+            filename=meta['filename'],
+            content_type=meta['content_type']
+        )
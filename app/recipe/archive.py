@@ -0,0 +1,157 @@
+"""
+Full account archives: a zip holding a `recipes.json` manifest and the
+recipe images, written straight to ARCHIVE_DIR.
+
+Recipes are read in keyset chunks and images copied through fixed size
+buffers, so memory stays bounded by the chunk size whatever the size of
+the collection. All reads share one repeatable read snapshot, so the
+manifest and the images describe the same state of the account.
+"""
+import os
+import secrets
+import shutil
+import zipfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import (
+    connection,
+    transaction
+)
+from django.utils import timezone
+
+from core.models import (
+    Ingredient,
+    Recipe,
+    Tag
+)
+from core.renderers import FastJSONRenderer
+from recipe.serializers.fast import (
+    FastRecipeSerializer,
+    RELATED_FIELDS
+)
+
+MANIFEST_NAME = 'recipes.json'
+MANIFEST_VERSION = 1
+IMAGE_DIR = 'images'
+COPY_BUFFER_SIZE = 256 * 1024
+
+
+class ArchiveRecipeSerializer(FastRecipeSerializer):
+    """Full recipe rows with tag and ingredient ids."""
+    extra_columns = ('description', 'image')
+
+    def __init__(self):
+        super().__init__(sideload=list(RELATED_FIELDS))
+
+    def _values(self, queryset, *extra):
+        return super()._values(queryset, *extra, *self.extra_columns)
+
+    def _include(self, field, recipes):
+        # Every tag and ingredient of the account is written separately.
+        pass
+
+
+def archive_path(name):
+    return os.path.join(settings.ARCHIVE_DIR, os.path.basename(name))
+
+
+def new_archive_name(job_id):
+    return f'{job_id}-{secrets.token_hex(8)}.zip'
+
+
+def image_name(name):
+    return f'{IMAGE_DIR}/{os.path.basename(name)}'
+
+
+@contextmanager
+def snapshot():
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY'
+                )
+        yield
+
+
+def _write_images(archive, recipes):
+    copied = 0
+    missing = set()
+    names = recipes.exclude(image='').exclude(image__isnull=True).values_list(
+        'image', flat=True
+    ).order_by('id')
+    for name in names.iterator():
+        try:
+            source = default_storage.open(name, 'rb')
+        except OSError:
+            missing.add(name)
+            continue
+        info = zipfile.ZipInfo(
+            image_name(name), timezone.now().timetuple()[:6]
+        )
+        # Images are already compressed.
+        info.compress_type = zipfile.ZIP_STORED
+        with source, archive.open(info, 'w', force_zip64=True) as target:
+            shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+        copied += 1
+    return copied, missing
+
+
+def _write_named(stream, renderer, name, queryset):
+    stream.write(f'"{name}":['.encode())
+    separator = b''
+    for item in queryset.order_by('id').values('id', 'name').iterator():
+        stream.write(separator + renderer.render(item))
+        separator = b','
+    stream.write(b']')
+
+
+def _write_manifest(stream, user, recipes, missing):
+    renderer = FastJSONRenderer()
+    header = renderer.render({
+        'version': MANIFEST_VERSION,
+        'exported_at': timezone.now(),
+    })
+    stream.write(header[:-1] + b',')
+    _write_named(stream, renderer, 'tags', Tag.objects.filter(user=user))
+    stream.write(b',')
+    _write_named(
+        stream, renderer, 'ingredients', Ingredient.objects.filter(user=user)
+    )
+
+    count = 0
+    separator = b''
+    stream.write(b',"recipes":[')
+    for chunk in ArchiveRecipeSerializer().iter_chunks(recipes):
+        for item in chunk:
+            image = item['image']
+            item['image'] = (
+                image_name(image) if image and image not in missing else None
+            )
+        content = renderer.render(chunk)[1:-1]
+        if content:
+            stream.write(separator + content)
+            separator = b','
+        count += len(chunk)
+    stream.write(b']}')
+    return count
+
+
+def write_archive(user, path):
+    """Write the archive of `user` to `path` and return its statistics."""
+    recipes = Recipe.objects.filter(user=user)
+    with snapshot(), zipfile.ZipFile(
+        path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True
+    ) as archive:
+        images, missing = _write_images(archive, recipes)
+        with archive.open(MANIFEST_NAME, 'w', force_zip64=True) as stream:
+            count = _write_manifest(stream, user, recipes, missing)
+    return {
+        'recipes': count,
+        'images': images,
+        'missing_images': len(missing),
+        'size': os.path.getsize(path),
+    }
@@ -0,0 +1,113 @@
+"""
+Set based deletion of recipes, tags and ingredients.
+
+Django's deletion collector loads every cascaded row into memory to send
+signals. Here ids are selected in batches and removed, then their through
+rows, with plain DELETE ... WHERE id = ANY(...) statements. Post delete signals
+are replaced by a single `bulk_deleted` signal per batch, and recipe images
+are deleted by a background job once the batch has committed.
+"""
+from collections import defaultdict
+
+from django.db import (
+    connection,
+    transaction
+)
+from django.dispatch import Signal
+
+from core import jobs
+from core.models import (
+    Ingredient,
+    Recipe,
+    Tag
+)
+from recipe.jobs import DELETE_IMAGES_JOB
+
+BATCH_SIZE = 5000
+
+# Sent with `user_id`, `ids` and `links`, the ids of their deleted links
+# by through model, for every batch deleted with send=True.
+bulk_deleted = Signal()
+
+LINKS = {
+    Recipe: [
+        (Recipe.tags.through, 'recipe_id'),
+        (Recipe.ingredients.through, 'recipe_id'),
+    ],
+    Tag: [(Recipe.tags.through, 'tag_id')],
+    Ingredient: [(Recipe.ingredients.through, 'ingredient_id')],
+}
+
+
+def link_ids(model, ids):
+    """{through model: [link id]} of the links of `model` rows `ids`."""
+    return {
+        through: list(through.objects.filter(
+            **{f'{column}__in': ids}
+        ).values_list('id', flat=True))
+        for through, column in LINKS.get(model, ())
+    }
+
+
+def _delete_ids(model, ids):
+    # Rows before links: the foreign keys are deferred, and the link
+    # triggers then find no deleted recipe left to refresh.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {model._meta.db_table} WHERE id = ANY(%s)', [ids]
+        )
+        for through, column in LINKS.get(model, ()):
+            cursor.execute(
+                f'DELETE FROM {through._meta.db_table} '
+                f'WHERE {column} = ANY(%s)',
+                [ids]
+            )
+
+
+def delete_batch(queryset, batch_size=BATCH_SIZE, send=True):
+    """Delete up to `batch_size` rows of `queryset`; return how many."""
+    model = queryset.model
+    columns = ['id', 'user_id']
+    if model is Recipe:
+        columns.append('image')
+
+    with transaction.atomic():
+        rows = list(
+            model.objects.filter(id__in=queryset.order_by().values('id'))
+            .order_by('id')
+            .select_for_update()
+            .values_list(*columns)[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        by_user = defaultdict(list)
+        for row in rows:
+            by_user[row[1]].append(row[0])
+        links = {
+            user_id: link_ids(model, ids) if send else {}
+            for user_id, ids in by_user.items()
+        }
+        _delete_ids(model, [row[0] for row in rows])
+
+        images = [row[2] for row in rows if model is Recipe and row[2]]
+        if images:
+            jobs.enqueue(DELETE_IMAGES_JOB, {'names': images})
+
+        if send:
+            for user_id, ids in by_user.items():
+                bulk_deleted.send(
+                    sender=model, user_id=user_id, ids=ids,
+                    links=links[user_id]
+                )
+    return len(rows)
+
+
+def delete_all(queryset, batch_size=BATCH_SIZE, send=True):
+    """Delete every row of `queryset` in batches; return how many."""
+    total = 0
+    while True:
+        deleted = delete_batch(queryset, batch_size, send)
+        if not deleted:
+            return total
+        total += deleted
@@ -0,0 +1,170 @@
+"""
+Strictly parsed filters, ordering and keyset cursors for recipe lists.
+
+Every ordering ends with `id` in the same direction, so each one is a
+total order matching an index on (user, field, id). A cursor holds the
+ordering and the last row's (field, id) key, and the next page is the
+rows after that key: a range scan of the index, however deep the page.
+"""
+import base64
+import binascii
+import json
+from decimal import (
+    Decimal,
+    InvalidOperation
+)
+
+from django.conf import settings
+from django.db.models import (
+    Exists,
+    OuterRef,
+    Q
+)
+from rest_framework import serializers
+
+ORDERING_FIELDS = ('id', 'price', 'time_minutes', 'title')
+ORDERINGS = [
+    f'{direction}{name}'
+    for name in ORDERING_FIELDS
+    for direction in ('', '-')
+]
+DEFAULT_ORDERING = '-id'
+
+# JSON type of each key value in a cursor, and its parser.
+CURSOR_VALUES = {
+    'id': (int, int),
+    'price': (str, Decimal),
+    'time_minutes': (int, int),
+    'title': (str, str),
+}
+
+
+def order_by(ordering):
+    name = ordering.lstrip('-')
+    if name == 'id':
+        return [ordering]
+    direction = '-' if ordering.startswith('-') else ''
+    return [ordering, f'{direction}id']
+
+
+def after(queryset, ordering, key):
+    """Rows of `queryset` sorted after `key` in `ordering`."""
+    name = ordering.lstrip('-')
+    op = 'lt' if ordering.startswith('-') else 'gt'
+    value, pk = key
+    if name == 'id':
+        return queryset.filter(**{f'id__{op}': pk})
+    # The first condition bounds the index range scan on its own.
+    return queryset.filter(
+        Q(**{f'{name}__{op}e': value}),
+        Q(**{f'{name}__{op}': value}) | Q(**{f'id__{op}': pk})
+    )
+
+
+def encode_cursor(ordering, key):
+    value, pk = key
+    if isinstance(value, Decimal):
+        value = str(value)
+    data = json.dumps([ordering, value, pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering):
+    """Return the key in `cursor`, or None if it is not for `ordering`."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_ordering, value, pk = json.loads(data)
+        kind, parse = CURSOR_VALUES[ordering.lstrip('-')]
+        if (cursor_ordering != ordering or type(pk) is not int
+                or type(value) is not kind):
+            return None
+        value = parse(value)
+    except (binascii.Error, InvalidOperation, TypeError, UnicodeDecodeError,
+            ValueError):
+        return None
+    return value, pk
+
+
+class IdListField(serializers.CharField):
+    default_error_messages = {
+        'invalid_ids': 'Must be a comma separated list of ids.',
+    }
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        try:
+            ids = [int(part) for part in value.split(',')]
+        except ValueError:
+            self.fail('invalid_ids')
+        if any(pk < 1 for pk in ids):
+            self.fail('invalid_ids')
+        return ids
+
+
+class RecipeFilterSerializer(serializers.Serializer):
+    """Query parameters of recipe lists, validated before any query."""
+    tags = IdListField(required=False)
+    ingredients = IdListField(required=False)
+    time_minutes_min = serializers.IntegerField(min_value=0, required=False)
+    time_minutes_max = serializers.IntegerField(min_value=0, required=False)
+    price_min = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, required=False
+    )
+    price_max = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, required=False
+    )
+    ordering = serializers.ChoiceField(
+        choices=ORDERINGS, default=DEFAULT_ORDERING
+    )
+    cursor = serializers.CharField(required=False)
+    page_size = serializers.IntegerField(
+        min_value=1, max_value=settings.RECIPE_MAX_PAGE_SIZE, required=False
+    )
+
+    def to_internal_value(self, data):
+        # Blank parameters, like ?tags=, are ignored as if absent.
+        data = {name: value for name, value in data.items() if value != ''}
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        for name in ('time_minutes', 'price'):
+            low = attrs.get(f'{name}_min')
+            high = attrs.get(f'{name}_max')
+            if low is not None and high is not None and low > high:
+                raise serializers.ValidationError(
+                    {f'{name}_max': [f'Must not be less than {name}_min.']}
+                )
+
+        if 'cursor' in attrs:
+            key = decode_cursor(attrs['cursor'], attrs['ordering'])
+            if key is None:
+                raise serializers.ValidationError(
+                    {'cursor': ['Invalid cursor for this ordering.']}
+                )
+            attrs['cursor'] = key
+        return attrs
+
+    def filter(self, queryset):
+        attrs = self.validated_data
+        through_filters = [
+            ('tags', queryset.model.tags.through, 'tag_id'),
+            ('ingredients', queryset.model.ingredients.through,
+             'ingredient_id'),
+        ]
+        # Semi-joins on the (tag_id, recipe_id) style through indexes, so
+        # no DISTINCT over the joined rows is needed.
+        for name, through, column in through_filters:
+            if name in attrs:
+                queryset = queryset.filter(Exists(through.objects.filter(
+                    recipe_id=OuterRef('pk'), **{f'{column}__in': attrs[name]}
+                )))
+        for name in ('time_minutes', 'price'):
+            if f'{name}_min' in attrs:
+                queryset = queryset.filter(
+                    **{f'{name}__gte': attrs[f'{name}_min']}
+                )
+            if f'{name}_max' in attrs:
+                queryset = queryset.filter(
+                    **{f'{name}__lte': attrs[f'{name}_max']}
+                )
+        return queryset.order_by(*order_by(attrs['ordering']))
@@ -0,0 +1,70 @@
+"""
+Background jobs of the recipe app.
+"""
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+from recipe.archive import (
+    archive_path,
+    new_archive_name,
+    write_archive
+)
+
+ARCHIVE_JOB = 'recipe.archive'
+EXPIRE_ARCHIVE_JOB = 'recipe.expire_archive'
+DELETE_IMAGES_JOB = 'recipe.delete_images'
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@jobs.register(ARCHIVE_JOB)
+def build_archive(job):
+    os.makedirs(settings.ARCHIVE_DIR, exist_ok=True)
+    name = new_archive_name(job.id)
+    path = archive_path(name)
+    partial = f'{path}.part'
+    try:
+        result = write_archive(job.user, partial)
+        os.replace(partial, path)
+    finally:
+        _remove(partial)
+
+    expires_at = timezone.now() + timedelta(seconds=settings.ARCHIVE_TTL)
+    jobs.enqueue(
+        EXPIRE_ARCHIVE_JOB,
+        {'archive': job.id, 'file': name},
+        run_at=expires_at
+    )
+    return dict(result, file=name, expires_at=expires_at.isoformat())
+
+
+@jobs.register(EXPIRE_ARCHIVE_JOB)
+def expire_archive(job):
+    # The archive job is gone with its user once the account is purged.
+    _remove(archive_path(job.payload['file']))
+    archive = Job.objects.filter(
+        id=job.payload['archive'], name=ARCHIVE_JOB
+    ).first()
+    if archive is not None and (archive.result or {}).get('file'):
+        Job.objects.filter(id=archive.id).update(
+            result=dict(archive.result, file=None, expired=True)
+        )
+    return {'removed': job.payload['file']}
+
+
+@jobs.register(DELETE_IMAGES_JOB)
+def delete_images(job):
+    for name in job.payload['names']:
+        default_storage.delete(name)
+    return {'deleted': len(job.payload['names'])}
@@ -0,0 +1,83 @@
+"""
+"What can I cook?" matching of recipes against a set of ingredients.
+
+Each recipe carries a sorted `ingredient_ids` array and an `ingredient_mask`
+signature, with bit `id % MASK_BITS` set for each of its ingredients, both
+maintained by database triggers. Candidates share an ingredient with the
+pantry, found through the GIN index on the array; the signature then drops
+in one bitwise step every candidate with more missing bits than allowed,
+and only the rest have their missing ingredients counted exactly.
+"""
+from django.db import connection
+
+from core.models import Recipe
+from core.models.recipe import MASK_BITS
+from recipe.serializers import FastRecipeSerializer
+from recipe.serializers.fast import RECIPE_FIELDS
+
+# OFFSET 0 keeps the candidates a subquery, so `missing` is counted once
+# per row rather than once per reference to it.
+MATCH_SQL = f'''
+SELECT id, missing, 1 - missing::float / cardinality(ingredient_ids)
+FROM (
+    SELECT id, ingredient_ids, (
+        SELECT count(*) FROM unnest(ingredient_ids) AS item
+        WHERE item <> ALL(%(pantry)s::bigint[])
+    ) AS missing
+    FROM core_recipe
+    WHERE user_id = %(user)s
+        AND ingredient_ids && %(pantry)s::bigint[]
+        AND bit_count(ingredient_mask & ~%(mask)s::bit({MASK_BITS}))
+            <= %(max_missing)s
+    OFFSET 0
+) AS candidates
+WHERE missing <= %(max_missing)s
+ORDER BY 3 DESC, missing, id DESC
+LIMIT %(limit)s
+'''
+
+
+def signature(ids):
+    """The '0'/'1' bit string with bit `id % MASK_BITS` set for each id."""
+    bits = ['0'] * MASK_BITS
+    for pk in ids:
+        bits[pk % MASK_BITS] = '1'
+    return ''.join(bits)
+
+
+def find_matches(user, pantry, max_missing, limit):
+    """
+    (id, missing count, coverage) of `user`'s recipes missing at most
+    `max_missing` ingredients from `pantry`, best covered first.
+    """
+    pantry = sorted(set(pantry))
+    with connection.cursor() as cursor:
+        cursor.execute(MATCH_SQL, {
+            'user': user.id,
+            'pantry': pantry,
+            'mask': signature(pantry),
+            'max_missing': max_missing,
+            'limit': limit,
+        })
+        return cursor.fetchall()
+
+
+def best_matches(user, pantry, max_missing=0, limit=50):
+    """Serialized best matches, each with `coverage` and `missing` ids."""
+    matches = find_matches(user, pantry, max_missing, limit)
+    rows = Recipe.objects.filter(id__in=[pk for pk, _, _ in matches])
+    rows = {
+        row['id']: row
+        for row in rows.values(*RECIPE_FIELDS, 'ingredient_ids')
+    }
+    rows = [rows[pk] for pk, _, _ in matches]
+    ingredient_ids = [row.pop('ingredient_ids') for row in rows]
+
+    data = FastRecipeSerializer().serialize_rows(
+        rows, Recipe.objects.filter(id__in=[row['id'] for row in rows])
+    )
+    pantry = set(pantry)
+    for item, (_, _, coverage), ids in zip(data, matches, ingredient_ids):
+        item['coverage'] = coverage
+        item['missing'] = [pk for pk in ids if pk not in pantry]
+    return data
@@ -0,0 +1,115 @@
+"""
+Case-insensitive merging of duplicate tags and ingredients.
+
+Names are stored with surrounding whitespace stripped and inner runs of
+whitespace collapsed, and a unique index on (user, UPPER(name)) keeps one
+object per name and user. `merge` folds duplicates into a single object:
+its recipe links are moved or dropped with one statement and the
+duplicates are then deleted like any other bulk deletion.
+"""
+from django.db import (
+    connection,
+    transaction
+)
+from django.dispatch import Signal
+
+from recipe.deletion import (
+    LINKS,
+    delete_batch
+)
+
+# Sent with `user_id`, `moved` and `dropped` link ids for every merge.
+links_merged = Signal()
+
+# Collapse first: btrim only strips spaces, not tabs or newlines.
+NORMALIZED_SQL = r"btrim(regexp_replace({column}, '\s+', ' ', 'g'))"
+
+# The link kept for a recipe is the one already pointing at the target,
+# otherwise its oldest link to a source, which is repointed.
+MERGE_LINKS_SQL = '''
+WITH links AS (
+    SELECT id, {column} <> %(target)s AS moving, row_number() OVER (
+        PARTITION BY recipe_id ORDER BY {column} = %(target)s DESC, id
+    ) AS n
+    FROM {table}
+    WHERE {column} = %(target)s OR {column} = ANY(%(sources)s)
+), moved AS (
+    UPDATE {table} SET {column} = %(target)s
+    FROM links
+    WHERE {table}.id = links.id AND links.n = 1 AND links.moving
+    RETURNING {table}.id
+), dropped AS (
+    DELETE FROM {table}
+    USING links
+    WHERE {table}.id = links.id AND links.n > 1
+    RETURNING {table}.id
+)
+SELECT ARRAY(SELECT id FROM moved), ARRAY(SELECT id FROM dropped)
+'''
+
+DUPLICATES_SQL = '''
+SELECT array_agg(id ORDER BY id), (array_agg({normalized} ORDER BY id))[1]
+FROM {table}
+GROUP BY user_id, UPPER({normalized})
+HAVING count(*) > 1 OR bool_or(name <> {normalized})
+LIMIT %s
+'''
+
+
+def merge(target, sources):
+    """Fold `sources` into `target`; return the number of merged objects."""
+    model = type(target)
+    through, column = LINKS[model][0]
+    source_ids = [source.id for source in sources if source.id != target.id]
+    if not source_ids:
+        return 0
+
+    with transaction.atomic():
+        locked = list(
+            model.objects.filter(id__in=[target.id] + source_ids)
+            .order_by('id').select_for_update().values_list('id', flat=True)
+        )
+        source_ids = [pk for pk in locked if pk != target.id]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                MERGE_LINKS_SQL.format(
+                    table=through._meta.db_table, column=column
+                ),
+                {'target': target.id, 'sources': source_ids}
+            )
+            moved, dropped = cursor.fetchone()
+        links_merged.send(
+            sender=through,
+            user_id=target.user_id,
+            moved=moved,
+            dropped=dropped
+        )
+        return delete_batch(
+            model.objects.filter(id__in=source_ids), len(source_ids)
+        )
+
+
+def dedupe_batch(model, batch_size):
+    """Merge up to `batch_size` groups of duplicates; return how many."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            DUPLICATES_SQL.format(
+                table=table,
+                normalized=NORMALIZED_SQL.format(column='name')
+            ),
+            [batch_size]
+        )
+        groups = cursor.fetchall()
+
+    for ids, name in groups:
+        with transaction.atomic():
+            objects = list(model.objects.filter(id__in=ids).order_by('id'))
+            if not objects:
+                continue
+            target = objects[0]
+            merge(target, objects[1:])
+            if target.name != name:
+                target.name = name
+                target.save(update_fields=['name'])
+    return len(groups)
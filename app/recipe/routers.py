@@ -0,0 +1,9 @@
+from rest_framework.routers import DefaultRouter
+
+
+class BulkRouter(DefaultRouter):
+    """DefaultRouter also routing DELETE on list URLs to `bulk_destroy`."""
+    routes = list(DefaultRouter.routes)
+    routes[0] = routes[0]._replace(
+        mapping=dict(routes[0].mapping, delete='bulk_destroy')
+    )
@@ -5,11 +5,29 @@ from .recipe import (
     RecipeImageSerializer
 )
 from .ingredient import IngredientSerializer
+from .fast import FastRecipeSerializer
+from .archive import ArchiveSerializer
+from .merge import MergeSerializer
+from .match import (
+    MatchSerializer,
+    RecipeMatchSerializer
+)
+from .similar import (
+    SimilarSerializer,
+    RecipeSimilarSerializer
+)
 
 __all__ = [
     'TagSerializer',
     'RecipeSerializer',
     'RecipeDetailSerializer',
     'RecipeImageSerializer',
-    'IngredientSerializer'
+    'IngredientSerializer',
+    'FastRecipeSerializer',
+    'ArchiveSerializer',
+    'MergeSerializer',
+    'MatchSerializer',
+    'RecipeMatchSerializer',
+    'SimilarSerializer',
+    'RecipeSimilarSerializer'
 ]
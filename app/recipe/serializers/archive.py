@@ -0,0 +1,49 @@
+from django.urls import reverse
+from drf_spectacular.utils import (
+    extend_schema_field,
+    OpenApiTypes
+)
+from rest_framework import serializers
+
+from core.models import Job
+
+
+class ArchiveSerializer(serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+    expires_at = serializers.SerializerMethodField()
+    expired = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'status', 'created_at', 'finished_at', 'expires_at',
+            'expired', 'url', 'download_url'
+        ]
+        read_only_fields = fields
+
+    def _absolute(self, name, job):
+        url = reverse(name, args=[job.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def _result(self, job):
+        return job.result or {}
+
+    @extend_schema_field(OpenApiTypes.URI)
+    def get_url(self, job):
+        return self._absolute('recipe:archive-detail', job)
+
+    @extend_schema_field(OpenApiTypes.URI)
+    def get_download_url(self, job):
+        if not self._result(job).get('file'):
+            return None
+        return self._absolute('recipe:archive-download', job)
+
+    @extend_schema_field(OpenApiTypes.DATETIME)
+    def get_expires_at(self, job):
+        return self._result(job).get('expires_at')
+
+    @extend_schema_field(OpenApiTypes.BOOL)
+    def get_expired(self, job):
+        return self._result(job).get('expired', False)
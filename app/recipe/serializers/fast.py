@@ -0,0 +1,138 @@
+"""
+Read-only fast path producing RecipeSerializer output from values() rows
+and pre-grouped many-to-many maps, without building model instances.
+
+Related fields listed in `sideload` are rendered as id lists, with each
+referenced tag or ingredient collected once for an `included` section.
+"""
+from collections import defaultdict
+
+from core.models import Recipe
+from recipe.filters import (
+    DEFAULT_ORDERING,
+    after,
+    order_by
+)
+from .recipe import RecipeSerializer
+
+RECIPE_FIELDS = ('id', 'title', 'time_minutes', 'price', 'link')
+RELATED_FIELDS = {
+    'tags': 'tag',
+    'ingredients': 'ingredient',
+}
+CHUNK_SIZE = 2000
+
+
+class FastRecipeSerializer:
+    def __init__(self, fields=None, sideload=()):
+        fields = [
+            name for name in RecipeSerializer.Meta.fields
+            if fields is None or name in fields
+        ]
+        self.columns = [name for name in fields if name in RECIPE_FIELDS]
+        self.related = [name for name in fields if name in RELATED_FIELDS]
+        self.sideload = [name for name in self.related if name in sideload]
+        self.included = {name: {} for name in self.sideload}
+        self.price = RecipeSerializer().fields['price'].to_representation
+
+    def _through_rows(self, field, recipes, *columns):
+        through = getattr(Recipe, field).through
+        target = RELATED_FIELDS[field]
+        return through.objects.filter(
+            recipe_id__in=recipes.order_by().values('id')
+        ).order_by(f'{target}_id').values_list(
+            'recipe_id', f'{target}_id', *columns
+        )
+
+    def _grouped(self, field, recipes):
+        target = RELATED_FIELDS[field]
+        rows = self._through_rows(field, recipes, f'{target}__name')
+
+        items = {}
+        grouped = defaultdict(list)
+        for recipe_id, related_id, name in rows:
+            item = items.get(related_id)
+            if item is None:
+                item = items[related_id] = {'id': related_id, 'name': name}
+            grouped[recipe_id].append(item)
+        return grouped
+
+    def _grouped_ids(self, field, recipes):
+        grouped = defaultdict(list)
+        for recipe_id, related_id in self._through_rows(field, recipes):
+            grouped[recipe_id].append(related_id)
+        return grouped
+
+    def _include(self, field, recipes):
+        through = getattr(Recipe, field).through
+        target = RELATED_FIELDS[field]
+        model = through._meta.get_field(target).related_model
+        related_ids = through.objects.filter(
+            recipe_id__in=recipes.order_by().values('id')
+        ).values(f'{target}_id')
+
+        items = self.included[field]
+        for item in model.objects.filter(
+            id__in=related_ids
+        ).values('id', 'name'):
+            items.setdefault(item['id'], item)
+
+    def included_data(self):
+        return {
+            field: [items[key] for key in sorted(items)]
+            for field, items in self.included.items()
+        }
+
+    def _values(self, queryset, *extra):
+        return queryset.values(*dict.fromkeys(['id', *extra, *self.columns]))
+
+    def serialize_rows(self, rows, recipes):
+        columns = self.columns
+        if columns == list(RECIPE_FIELDS):
+            data = rows
+        else:
+            data = [{name: row[name] for name in columns} for row in rows]
+        if 'price' in columns:
+            price = self.price
+            for item in data:
+                item['price'] = price(item['price'])
+
+        for field in self.related:
+            if field in self.included:
+                self._include(field, recipes)
+                grouped = self._grouped_ids(field, recipes)
+            else:
+                grouped = self._grouped(field, recipes)
+            for row, item in zip(rows, data):
+                item[field] = grouped.get(row['id'], [])
+        return data
+
+    def serialize(self, queryset):
+        return self.serialize_rows(list(self._values(queryset)), queryset)
+
+    def serialize_page(self, queryset, size, key_field):
+        """
+        Serialize the first `size` rows of the ordered `queryset`. Returns
+        the data and the (key_field, id) key of the last row, or None as
+        the key when no rows follow.
+        """
+        rows = list(self._values(queryset, key_field)[:size + 1])
+        key = None
+        if len(rows) > size:
+            rows = rows[:size]
+            key = rows[-1][key_field], rows[-1]['id']
+        recipes = Recipe.objects.filter(id__in=[row['id'] for row in rows])
+        return self.serialize_rows(rows, recipes), key
+
+    def iter_chunks(self, queryset, chunk_size=CHUNK_SIZE,
+                    ordering=DEFAULT_ORDERING):
+        queryset = queryset.order_by(*order_by(ordering))
+        key_field = ordering.lstrip('-')
+        chunk = queryset
+        while True:
+            data, key = self.serialize_page(chunk, chunk_size, key_field)
+            if data:
+                yield data
+            if key is None:
+                return
+            chunk = after(queryset, ordering, key)
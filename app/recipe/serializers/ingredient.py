@@ -1,8 +1,8 @@
-from rest_framework import serializers
 from core.models import Ingredient
+from .named import NamedSerializer
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(NamedSerializer):
     class Meta:
         model = Ingredient
         fields = ['id', 'name']
@@ -0,0 +1,36 @@
+from rest_framework import serializers
+
+from .recipe import RecipeSerializer
+
+MAX_PANTRY_SIZE = 1000
+MAX_MISSING = 5
+MAX_MATCHES = 200
+
+
+class MatchSerializer(serializers.Serializer):
+    """A pantry of ingredient ids to find recipes for."""
+    ingredients = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_PANTRY_SIZE
+    )
+    max_missing = serializers.IntegerField(
+        min_value=0, max_value=MAX_MISSING, default=0
+    )
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_MATCHES, default=50
+    )
+
+
+class RecipeMatchSerializer(RecipeSerializer):
+    """Documents match results; they are produced by recipe.matching."""
+    coverage = serializers.FloatField(
+        help_text='Share of the recipe\'s ingredients in the pantry'
+    )
+    missing = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text='Ids of the recipe\'s ingredients not in the pantry'
+    )
+
+    class Meta(RecipeSerializer.Meta):
+        fields = RecipeSerializer.Meta.fields + ['coverage', 'missing']
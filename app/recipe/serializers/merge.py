@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+MAX_SOURCES = 100
+
+
+class MergeSerializer(serializers.Serializer):
+    """Objects to fold into `target`, looked up in context['queryset']."""
+    target = serializers.IntegerField()
+    sources = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=MAX_SOURCES
+    )
+
+    def validate(self, attrs):
+        sources = list(dict.fromkeys(attrs['sources']))
+        if attrs['target'] in sources:
+            raise serializers.ValidationError(
+                {'sources': ['Must not include the target.']}
+            )
+
+        objects = self.context['queryset'].in_bulk(
+            [attrs['target']] + sources
+        )
+        errors = {}
+        if attrs['target'] not in objects:
+            errors['target'] = [
+                f'Invalid pk "{attrs["target"]}" - object does not exist.'
+            ]
+        missing = [pk for pk in sources if pk not in objects]
+        if missing:
+            errors['sources'] = [
+                f'Invalid pk "{pk}" - object does not exist.'
+                for pk in missing
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return {
+            'target': objects[attrs['target']],
+            'sources': [objects[pk] for pk in sources],
+        }
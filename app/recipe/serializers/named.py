@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+
+def normalize_name(name):
+    return ' '.join(name.split())
+
+
+class NamedSerializer(serializers.ModelSerializer):
+    """Base for tags and ingredients, whose names are unique per user."""
+
+    def validate_name(self, value):
+        name = normalize_name(value)
+        if self.instance is not None:
+            model = type(self.instance)
+            clash = model.objects.filter(
+                user_id=self.instance.user_id, name__iexact=name
+            ).exclude(id=self.instance.id)
+            if clash.exists():
+                raise serializers.ValidationError(
+                    f'A {model._meta.verbose_name} with this name already '
+                    f'exists; merge them instead.'
+                )
+        return name
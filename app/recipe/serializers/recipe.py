@@ -25,7 +25,8 @@ class RecipeSerializer(serializers.ModelSerializer):
         for tag in tags:
             created_tag, created = Tag.objects.get_or_create(
                 user=auth_user,
-                **tag
+                name__iexact=tag['name'],
+                defaults=tag
             )
             recipe.tags.add(created_tag)
 
@@ -34,7 +35,8 @@ class RecipeSerializer(serializers.ModelSerializer):
         for ingredient in ingredients:
             created_ingredient, created = Ingredient.objects.get_or_create(
                 user=auth_user,
-                **ingredient
+                name__iexact=ingredient['name'],
+                defaults=ingredient
             )
             recipe.ingredients.add(created_ingredient)
 
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+from .recipe import RecipeSerializer
+
+MAX_SIMILAR = 50
+
+
+class SimilarSerializer(serializers.Serializer):
+    """Query parameters of similar recipe lists."""
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_SIMILAR, default=10
+    )
+
+
+class RecipeSimilarSerializer(RecipeSerializer):
+    """Documents similar recipes; they are produced by recipe.similarity."""
+    score = serializers.FloatField(
+        help_text='Weighted Jaccard similarity of ingredients and tags'
+    )
+
+    class Meta(RecipeSerializer.Meta):
+        fields = RecipeSerializer.Meta.fields + ['score']
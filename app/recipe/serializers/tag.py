@@ -1,8 +1,8 @@
-from rest_framework import serializers
 from core.models import Tag
+from .named import NamedSerializer
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(NamedSerializer):
     class Meta:
         model = Tag
         fields = ['id', 'name']
@@ -0,0 +1,294 @@
+"""
+Similar recipe recommendations from a per-user in-memory index.
+
+A user's index is an inverted index from each ingredient and tag to the
+recipes using it, so the recipes similar to one are found by counting,
+over only the postings of its own features, how many each other recipe
+shares. Recipes are scored by weighted Jaccard similarity, tags weighing
+SIMILAR_TAG_WEIGHT against 1 for an ingredient.
+
+Postings are arrays of 4 byte recipe slots and each recipe's features one
+array, so an index costs about 12 bytes per link plus 16 per link id kept
+to resolve deleted links. Each process keeps the indexes of its
+SIMILAR_INDEX_USERS most recently used users.
+
+An index follows its user's change log like a sync client: changes after
+the sequence it was built at are applied by reloading just the recipes
+they touched, and an index behind the compaction horizon is rebuilt.
+"""
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from collections import (
+    Counter,
+    OrderedDict
+)
+from itertools import (
+    chain,
+    repeat
+)
+from operator import itemgetter
+
+from django.conf import settings
+
+from core.models import (
+    Change,
+    ChangeSequence,
+    Recipe
+)
+from recipe.serializers import FastRecipeSerializer
+from recipe.serializers.fast import RECIPE_FIELDS
+
+_lock = threading.Lock()
+_indexes = OrderedDict()
+
+# Link kind: (through model, related column, feature key sign). Tags are
+# keyed by their negated id so both kinds share one postings table.
+LINKS = {
+    Change.KIND_RECIPE_INGREDIENT: (
+        Recipe.ingredients.through, 'ingredient_id', 1
+    ),
+    Change.KIND_RECIPE_TAG: (Recipe.tags.through, 'tag_id', -1),
+}
+FEATURE_SIGNS = {
+    Change.KIND_INGREDIENT: 1,
+    Change.KIND_TAG: -1,
+}
+
+
+class LinkMap:
+    """Recipe ids of link ids, in two parallel sorted arrays."""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.recipes = array('q')
+
+    def set(self, link_id, recipe_id):
+        ids = self.ids
+        if not ids or link_id > ids[-1]:
+            ids.append(link_id)
+            self.recipes.append(recipe_id)
+            return
+        i = bisect_left(ids, link_id)
+        if ids[i] == link_id:
+            self.recipes[i] = recipe_id
+        else:
+            ids.insert(i, link_id)
+            self.recipes.insert(i, recipe_id)
+
+    def pop(self, link_id):
+        i = bisect_left(self.ids, link_id)
+        if i == len(self.ids) or self.ids[i] != link_id:
+            return None
+        recipe_id = self.recipes[i]
+        del self.ids[i]
+        del self.recipes[i]
+        return recipe_id
+
+
+class SimilarityIndex:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.seq = None
+        self.lock = threading.Lock()
+        self.slots = {}
+        self.recipe_ids = array('q')
+        self.weights = array('d')
+        self.features = []
+        self.free = []
+        self.postings = {}
+        self.links = {kind: LinkMap() for kind in LINKS}
+
+    def _remove(self, recipe_id):
+        slot = self.slots.pop(recipe_id, None)
+        if slot is None:
+            return
+        for feature in self.features[slot]:
+            postings = self.postings[feature]
+            postings.remove(slot)
+            if not postings:
+                del self.postings[feature]
+        self.recipe_ids[slot] = 0
+        self.weights[slot] = 0
+        self.features[slot] = ()
+        self.free.append(slot)
+
+    def _add(self, recipe_id, features):
+        if self.free:
+            slot = self.free.pop()
+            self.recipe_ids[slot] = recipe_id
+        else:
+            slot = len(self.recipe_ids)
+            self.recipe_ids.append(recipe_id)
+            self.weights.append(0)
+            self.features.append(())
+        self.slots[recipe_id] = slot
+        self.features[slot] = array('q', features)
+        self.weights[slot] = sum(map(weight, features))
+        for feature in features:
+            self.postings.setdefault(feature, array('i')).append(slot)
+
+    def load(self, recipe_ids=None):
+        """(Re)load the given recipes, or all of the user's recipes."""
+        recipes = Recipe.objects.filter(user_id=self.user_id)
+        if recipe_ids is not None:
+            recipes = recipes.filter(id__in=recipe_ids)
+        features = {pk: [] for pk in recipes.values_list('id', flat=True)}
+
+        for kind, (through, column, sign) in LINKS.items():
+            links = through.objects.filter(recipe__user_id=self.user_id)
+            if recipe_ids is not None:
+                links = links.filter(recipe_id__in=recipe_ids)
+            link_map = self.links[kind]
+            for link_id, recipe_id, related_id in (
+                links.order_by('id').values_list('id', 'recipe_id', column)
+            ):
+                if recipe_id in features:
+                    link_map.set(link_id, recipe_id)
+                    features[recipe_id].append(sign * related_id)
+
+        for recipe_id in recipe_ids if recipe_ids is not None else ():
+            self._remove(recipe_id)
+        for recipe_id, recipe_features in features.items():
+            self._add(recipe_id, recipe_features)
+
+    def update(self, seq):
+        """Apply the user's changes up to `seq`."""
+        changes = Change.objects.filter(
+            user_id=self.user_id, seq__gt=self.seq, seq__lte=seq
+        ).values_list('kind', 'object_id', 'deleted')
+
+        touched = set()
+        added = {kind: [] for kind in LINKS}
+        for kind, object_id, deleted in changes:
+            if kind == Change.KIND_RECIPE:
+                touched.add(object_id)
+            elif kind in LINKS:
+                recipe_id = self.links[kind].pop(object_id)
+                if recipe_id is not None:
+                    touched.add(recipe_id)
+                if not deleted:
+                    added[kind].append(object_id)
+            elif deleted:
+                # Its link tombstones are logged too, but not by changes
+                # recorded before links were.
+                feature = FEATURE_SIGNS[kind] * object_id
+                touched.update(
+                    self.recipe_ids[slot]
+                    for slot in self.postings.get(feature, ())
+                )
+
+        for kind, link_ids in added.items():
+            if link_ids:
+                through = LINKS[kind][0]
+                touched.update(through.objects.filter(
+                    id__in=link_ids
+                ).values_list('recipe_id', flat=True))
+
+        if touched:
+            self.load(touched)
+        self.seq = seq
+
+    def similar(self, recipe_id, limit):
+        """
+        [(score, recipe id)] of the `limit` recipes most similar to
+        `recipe_id`, or None if the user has no such recipe.
+        """
+        slot = self.slots.get(recipe_id)
+        if slot is None:
+            return None
+
+        # Counting postings runs in C, giving the shared ingredients and
+        # tags of every recipe sharing any.
+        ingredients = Counter()
+        tags = Counter()
+        for feature in self.features[slot]:
+            shared = ingredients if feature > 0 else tags
+            shared.update(self.postings[feature])
+        ingredients.pop(slot, None)
+        tags.pop(slot, None)
+
+        # A recipe's score is at most its shared weight over this recipe's
+        # total weight, so once candidates taken by shared ingredients
+        # cannot beat the worst of the best so far, the rest cannot either.
+        tag_weight = settings.SIMILAR_TAG_WEIGHT
+        tag_bound = tag_weight * sum(
+            feature < 0 for feature in self.features[slot]
+        )
+        total = self.weights[slot]
+        weights = self.weights
+        recipe_ids = self.recipe_ids
+        candidates = chain(
+            sorted(ingredients.items(), key=itemgetter(1), reverse=True),
+            zip(tags.keys() - ingredients.keys(), repeat(0))
+        )
+        best = []
+        for other, count in candidates:
+            if len(best) == limit and (count + tag_bound) / total < best[0][0]:
+                break
+            shared = count + tag_weight * tags.get(other, 0)
+            item = (
+                shared / (total + weights[other] - shared), recipe_ids[other]
+            )
+            if len(best) < limit:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+        return sorted(best, reverse=True)
+
+
+def weight(feature):
+    return 1.0 if feature > 0 else settings.SIMILAR_TAG_WEIGHT
+
+
+def get_index(user_id):
+    """The user's index, brought up to date with their change log."""
+    seq, horizon = ChangeSequence.objects.filter(
+        user_id=user_id
+    ).values_list('last_seq', 'horizon').first() or (0, 0)
+
+    with _lock:
+        index = _indexes.get(user_id)
+        if index is None or (index.seq or 0) < horizon:
+            index = _indexes[user_id] = SimilarityIndex(user_id)
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > settings.SIMILAR_INDEX_USERS:
+            _indexes.popitem(last=False)
+
+    with index.lock:
+        if index.seq is None:
+            index.load()
+            index.seq = seq
+        elif index.seq < seq:
+            index.update(seq)
+    return index
+
+
+def similar_recipes(user, recipe_id, limit):
+    """
+    The serialized recipes most similar to `recipe_id`, each with its
+    `score`, or None if `user` has no such recipe.
+    """
+    index = get_index(user.id)
+    with index.lock:
+        scores = index.similar(recipe_id, limit)
+    if scores is None:
+        return None
+
+    recipes = Recipe.objects.filter(id__in=[pk for _, pk in scores])
+    rows = {row['id']: row for row in recipes.values(*RECIPE_FIELDS)}
+    # Recipes deleted since the index was brought up to date are skipped.
+    scores = [(score, pk) for score, pk in scores if pk in rows]
+
+    data = FastRecipeSerializer().serialize_rows(
+        [rows[pk] for _, pk in scores], recipes
+    )
+    for item, (score, _) in zip(data, scores):
+        item['score'] = score
+    return data
+
+
+def clear_indexes():
+    with _lock:
+        _indexes.clear()
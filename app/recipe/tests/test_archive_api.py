@@ -0,0 +1,220 @@
+"""
+Tests for account archive exports.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings
+)
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import jobs
+from core.models import (
+    Ingredient,
+    Job,
+    Recipe,
+    Tag
+)
+from recipe.jobs import (
+    ARCHIVE_JOB,
+    EXPIRE_ARCHIVE_JOB
+)
+
+ARCHIVES_URL = reverse('recipe:archive-list')
+
+
+def detail_url(job_id):
+    return reverse('recipe:archive-detail', args=[job_id])
+
+
+def download_url(job_id):
+    return reverse('recipe:archive-download', args=[job_id])
+
+
+def run_next_job():
+    job = jobs.claim('test')
+    jobs.run(job)
+    job.refresh_from_db()
+    return job
+
+
+class ArchiveApiTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.archives = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media.name,
+            ARCHIVE_DIR=self.archives.name
+        )
+        self.settings_override.enable()
+
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+        self.archives.cleanup()
+
+    def create_recipe(self, title, image=''):
+        return Recipe.objects.create(
+            user=self.user,
+            title=title,
+            time_minutes=5,
+            price=Decimal('2.50'),
+            image=image
+        )
+
+    def write_image(self, name, content):
+        path = os.path.join(self.media.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as image:
+            image.write(content)
+
+    def test_create_queues_job_once(self):
+        res = self.client.post(ARCHIVES_URL)
+        again = self.client.post(ARCHIVES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['status'], Job.STATUS_QUEUED)
+        self.assertEqual(res['Location'], res.data['url'])
+        self.assertTrue(res.data['url'].endswith(detail_url(res.data['id'])))
+        self.assertIsNone(res.data['download_url'])
+        self.assertEqual(again.data['id'], res.data['id'])
+        self.assertEqual(Job.objects.filter(name=ARCHIVE_JOB).count(), 1)
+
+    def test_archive_contents(self):
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        self.write_image('uploads/recipe/a.jpg', b'jpeg bytes')
+        with_image = self.create_recipe('Soup', 'uploads/recipe/a.jpg')
+        with_image.tags.add(tag)
+        with_image.ingredients.add(ingredient)
+        self.create_recipe('Stew', 'uploads/recipe/gone.jpg')
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        Recipe.objects.create(
+            user=other, title='Other', time_minutes=1, price=Decimal('1.00')
+        )
+        job_id = self.client.post(ARCHIVES_URL).data['id']
+
+        job = run_next_job()
+        res = self.client.get(detail_url(job_id))
+        download = self.client.get(download_url(job_id))
+
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.result['recipes'], 2)
+        self.assertEqual(job.result['images'], 1)
+        self.assertEqual(job.result['missing_images'], 1)
+        self.assertEqual(res.data['status'], Job.STATUS_SUCCEEDED)
+        self.assertTrue(res.data['download_url'].endswith(
+            download_url(job_id)
+        ))
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        self.assertEqual(download['Content-Type'], 'application/zip')
+        self.assertIn('attachment', download['Content-Disposition'])
+
+        content = b''.join(download.streaming_content)
+        with tempfile.TemporaryFile() as file:
+            file.write(content)
+            archive = zipfile.ZipFile(file)
+            self.assertEqual(archive.read('images/a.jpg'), b'jpeg bytes')
+            manifest = json.loads(archive.read('recipes.json'))
+
+        self.assertEqual(manifest['version'], 1)
+        self.assertEqual(manifest['tags'], [{'id': tag.id, 'name': 'Vegan'}])
+        self.assertEqual(
+            manifest['ingredients'], [{'id': ingredient.id, 'name': 'Salt'}]
+        )
+        recipes = {item['title']: item for item in manifest['recipes']}
+        self.assertEqual(set(recipes), {'Soup', 'Stew'})
+        self.assertEqual(recipes['Soup']['image'], 'images/a.jpg')
+        self.assertEqual(recipes['Soup']['tags'], [tag.id])
+        self.assertEqual(recipes['Soup']['ingredients'], [ingredient.id])
+        self.assertEqual(recipes['Soup']['price'], '2.50')
+        self.assertIsNone(recipes['Stew']['image'])
+
+    def test_download_before_ready(self):
+        job_id = self.client.post(ARCHIVES_URL).data['id']
+
+        res = self.client.get(download_url(job_id))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_archive_expires(self):
+        self.create_recipe('Soup')
+        job_id = self.client.post(ARCHIVES_URL).data['id']
+        job = run_next_job()
+        path = os.path.join(self.archives.name, job.result['file'])
+        self.assertTrue(os.path.exists(path))
+
+        expiry = Job.objects.get(name=EXPIRE_ARCHIVE_JOB)
+        self.assertGreater(expiry.run_at, timezone.now())
+        Job.objects.filter(id=expiry.id).update(run_at=timezone.now())
+        run_next_job()
+        res = self.client.get(detail_url(job_id))
+        download = self.client.get(download_url(job_id))
+
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(res.data['expired'])
+        self.assertIsNone(res.data['download_url'])
+        self.assertEqual(download.status_code, status.HTTP_410_GONE)
+
+    def test_other_users_archives_hidden(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        job = jobs.enqueue(ARCHIVE_JOB, user=other)
+
+        res = self.client.get(detail_url(job.id))
+        listed = self.client.get(ARCHIVES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(listed.data, [])
+
+
+class ConcurrentArchiveTests(TransactionTestCase):
+    def test_concurrent_creates_queue_one_job(self):
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        enqueue = jobs.enqueue
+
+        def slow_enqueue(*args, **kwargs):
+            time.sleep(0.2)
+            return enqueue(*args, **kwargs)
+
+        def create():
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                client.post(ARCHIVES_URL)
+            finally:
+                connection.close()
+
+        with patch('core.jobs.enqueue', side_effect=slow_enqueue):
+            threads = [threading.Thread(target=create) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(Job.objects.filter(name=ARCHIVE_JOB).count(), 1)
@@ -0,0 +1,148 @@
+"""
+Tests for set based recipe deletion.
+"""
+import os
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import jobs
+from core.models import (
+    Change,
+    Ingredient,
+    Job,
+    Recipe,
+    Tag
+)
+from recipe.deletion import delete_all
+from recipe.jobs import DELETE_IMAGES_JOB
+
+RECIPES_URL = reverse('recipe:recipe-list')
+
+
+def create_recipe(user, title='Soup', **params):
+    return Recipe.objects.create(
+        user=user,
+        title=title,
+        time_minutes=5,
+        price=Decimal('1.00'),
+        **params
+    )
+
+
+class BulkDeleteApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_delete_by_tag(self):
+        vegan = Tag.objects.create(user=self.user, name='Vegan')
+        salt = Ingredient.objects.create(user=self.user, name='Salt')
+        deleted = [create_recipe(self.user, f'R{i}') for i in range(3)]
+        for recipe in deleted:
+            recipe.tags.add(vegan)
+            recipe.ingredients.add(salt)
+        kept = create_recipe(self.user, 'Kept')
+        kept.ingredients.add(salt)
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        foreign = create_recipe(other, 'Foreign')
+        foreign.tags.add(vegan)
+
+        res = self.client.delete(f'{RECIPES_URL}?tags={vegan.id}')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'deleted': 3})
+        self.assertEqual(
+            set(Recipe.objects.values_list('title', flat=True)),
+            {'Kept', 'Foreign'}
+        )
+        self.assertEqual(
+            list(Recipe.ingredients.through.objects.values_list(
+                'recipe_id', flat=True
+            )),
+            [kept.id]
+        )
+        tombstones = Change.objects.filter(
+            user=self.user, kind=Change.KIND_RECIPE, deleted=True
+        )
+        self.assertEqual(
+            sorted(tombstones.values_list('object_id', flat=True)),
+            [recipe.id for recipe in deleted]
+        )
+
+    def test_filter_required(self):
+        create_recipe(self.user)
+
+        res = self.client.delete(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Recipe.objects.count(), 1)
+
+
+class DeleteAllTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+
+    def test_batches(self):
+        for index in range(5):
+            create_recipe(self.user, f'R{index}')
+
+        deleted = delete_all(Recipe.objects.all(), batch_size=2)
+
+        self.assertEqual(deleted, 5)
+        self.assertFalse(Recipe.objects.exists())
+
+    def recipe_updates(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT n_tup_upd FROM pg_stat_xact_user_tables '
+                "WHERE relname = 'core_recipe'"
+            )
+            return cursor.fetchone()[0]
+
+    def test_deleted_recipes_not_refreshed(self):
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        for index in range(3):
+            create_recipe(self.user, f'R{index}').ingredients.add(ingredient)
+        updates = self.recipe_updates()
+
+        delete_all(Recipe.objects.all())
+
+        self.assertEqual(self.recipe_updates(), updates)
+
+    def test_images_deleted_by_job(self):
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root):
+            path = os.path.join(media_root, 'uploads', 'recipe', 'a.jpg')
+            os.makedirs(os.path.dirname(path))
+            open(path, 'wb').close()
+            create_recipe(self.user, image='uploads/recipe/a.jpg')
+            create_recipe(self.user, 'No image')
+
+            delete_all(Recipe.objects.all())
+            job = jobs.claim('test')
+            jobs.run(job)
+
+            self.assertFalse(os.path.exists(path))
+
+        self.assertEqual(job.name, DELETE_IMAGES_JOB)
+        self.assertEqual(job.payload, {'names': ['uploads/recipe/a.jpg']})
+        self.assertEqual(
+            Job.objects.get(id=job.id).status, Job.STATUS_SUCCEEDED
+        )
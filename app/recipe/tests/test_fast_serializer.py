@@ -0,0 +1,217 @@
+import io
+import json
+
+from decimal import Decimal
+
+import msgpack
+
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag,
+    Ingredient
+)
+
+from recipe.serializers import (
+    RecipeSerializer,
+    FastRecipeSerializer
+)
+
+RECIPES_URL = reverse('recipe:recipe-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+def create_recipes(user, count):
+    tags = [
+        Tag.objects.create(user=user, name=f'Tag{i}') for i in range(3)
+    ]
+    ingredients = [
+        Ingredient.objects.create(user=user, name=f'Ingredient{i}')
+        for i in range(4)
+    ]
+    for i in range(count):
+        recipe = Recipe.objects.create(
+            user=user,
+            title=f'Recipe {i}',
+            time_minutes=i,
+            price=Decimal('5.5') + i,
+            link='http://example.com' if i % 2 else '',
+        )
+        recipe.tags.add(*tags[i % 3:])
+        recipe.ingredients.add(*ingredients[:i % 5])
+
+
+class FastRecipeSerializerTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123'
+        )
+        create_recipes(self.user, 7)
+        self.recipes = Recipe.objects.filter(user=self.user).order_by('-id')
+
+    def test_matches_recipe_serializer(self):
+        # Related objects are otherwise in no particular order.
+        recipes = self.recipes.prefetch_related(
+            Prefetch('tags', Tag.objects.order_by('id')),
+            Prefetch('ingredients', Ingredient.objects.order_by('id'))
+        )
+        expected = RecipeSerializer(recipes, many=True).data
+
+        data = FastRecipeSerializer().serialize(self.recipes)
+
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(data), renderer.render(expected))
+
+    def test_chunks_match_full_serialization(self):
+        serializer = FastRecipeSerializer()
+
+        chunks = list(serializer.iter_chunks(self.recipes, chunk_size=3))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        self.assertEqual(
+            [row for chunk in chunks for row in chunk],
+            serializer.serialize(self.recipes)
+        )
+
+    def test_sideload_matches_embedded(self):
+        embedded = FastRecipeSerializer().serialize(self.recipes)
+        serializer = FastRecipeSerializer(sideload=['tags', 'ingredients'])
+
+        data = serializer.serialize(self.recipes)
+        included = serializer.included_data()
+
+        self.assertEqual(len(included['tags']), 3)
+        self.assertEqual(len(included['ingredients']), 4)
+        by_id = {
+            field: {item['id']: item for item in items}
+            for field, items in included.items()
+        }
+        for row, expected in zip(data, embedded):
+            for field in ('tags', 'ingredients'):
+                row[field] = [by_id[field][pk] for pk in row[field]]
+            self.assertEqual(row, expected)
+
+    def test_query_count_independent_of_rows(self):
+        with self.assertNumQueries(3):
+            FastRecipeSerializer().serialize(self.recipes)
+
+
+class RecipeExportApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_export_matches_list(self):
+        create_recipes(self.user, 5)
+        other = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='password123'
+        )
+        create_recipes(other, 2)
+
+        response = self.client.get(EXPORT_URL)
+        listed = self.client.get(RECIPES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        content = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(content, json.loads(listed.content))
+        self.assertEqual(len(content), 5)
+
+    def test_list_and_export_sideloaded(self):
+        create_recipes(self.user, 4)
+
+        listed = self.client.get(RECIPES_URL, {'include': 'tags'})
+        exported = self.client.get(EXPORT_URL, {'include': 'tags'})
+
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(listed.data), {'recipes', 'included'})
+        self.assertEqual(list(listed.data['included']), ['tags'])
+        self.assertIsInstance(listed.data['recipes'][0]['tags'][0], int)
+        self.assertIsInstance(
+            listed.data['recipes'][0]['ingredients'], list
+        )
+        content = json.loads(b''.join(exported.streaming_content))
+        self.assertEqual(content, json.loads(listed.content))
+
+    def test_unknown_include_rejected(self):
+        response = self.client.get(RECIPES_URL, {'include': 'users'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_columnar(self):
+        create_recipes(self.user, 3)
+
+        response = self.client.get(RECIPES_URL, {'format': 'columnar'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response['Content-Type'], 'application/vnd.columnar+json'
+        )
+        document = json.loads(response.content)
+        self.assertEqual(document['count'], 3)
+        self.assertEqual(
+            document['columns']['title'], ['Recipe 2', 'Recipe 1', 'Recipe 0']
+        )
+        self.assertEqual(
+            document['relations']['tags']['offsets'], [0, 1, 3, 6]
+        )
+        self.assertEqual(len(document['included']['ingredients']), 2)
+
+    def test_list_msgpack_by_accept_header(self):
+        create_recipes(self.user, 2)
+
+        response = self.client.get(
+            RECIPES_URL, HTTP_ACCEPT='application/msgpack'
+        )
+
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        document = msgpack.unpackb(response.content)
+        self.assertEqual(document['columns']['price'], ['6.50', '5.50'])
+
+    def test_export_columnar_batches(self):
+        create_recipes(self.user, 3)
+
+        json_response = self.client.get(EXPORT_URL, {'format': 'columnar'})
+        msgpack_response = self.client.get(EXPORT_URL, {'format': 'msgpack'})
+
+        document = json.loads(b''.join(json_response.streaming_content))
+        self.assertEqual(document['batches'][0]['count'], 3)
+        self.assertEqual(len(document['included']['tags']), 3)
+        objects = list(msgpack.Unpacker(
+            io.BytesIO(b''.join(msgpack_response.streaming_content))
+        ))
+        self.assertEqual(objects[0]['batch'], document['batches'][0])
+        self.assertEqual(objects[-1]['included'], document['included'])
+        self.assertIn(
+            'recipes.msgpack', msgpack_response['Content-Disposition']
+        )
+
+    def test_columnar_only_for_listings(self):
+        create_recipes(self.user, 1)
+        recipe = Recipe.objects.get()
+
+        response = self.client.get(
+            reverse('recipe:recipe-detail', args=[recipe.id]),
+            {'format': 'columnar'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_empty(self):
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
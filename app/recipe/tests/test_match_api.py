@@ -0,0 +1,165 @@
+"""
+Tests for matching recipes against a pantry of ingredients.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Ingredient,
+    Recipe
+)
+from recipe.deletion import delete_all
+from recipe.matching import signature
+from recipe.merge import merge
+
+MATCH_URL = reverse('recipe:recipe-match')
+
+
+def create_recipe(user, title, ingredients=()):
+    recipe = Recipe.objects.create(
+        user=user, title=title, time_minutes=5, price=Decimal('1.00')
+    )
+    recipe.ingredients.add(*ingredients)
+    return recipe
+
+
+def ingredient_ids(recipe):
+    return Recipe.objects.get(id=recipe.id).ingredient_ids
+
+
+class IngredientIdsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.salt, self.pepper, self.egg = [
+            Ingredient.objects.create(user=self.user, name=name)
+            for name in ('Salt', 'Pepper', 'Egg')
+        ]
+
+    def test_follows_links(self):
+        recipe = create_recipe(self.user, 'Omelette', [self.egg, self.salt])
+        self.assertEqual(
+            ingredient_ids(recipe), sorted([self.egg.id, self.salt.id])
+        )
+
+        recipe.ingredients.remove(self.egg)
+        self.pepper.recipe_set.add(recipe)
+        self.assertEqual(
+            ingredient_ids(recipe), sorted([self.salt.id, self.pepper.id])
+        )
+
+        recipe.ingredients.clear()
+        self.assertEqual(ingredient_ids(recipe), [])
+
+    def test_mask_follows_links(self):
+        recipe = create_recipe(self.user, 'Omelette', [self.egg, self.salt])
+        mask = Recipe.objects.get(id=recipe.id).ingredient_mask
+        self.assertEqual(mask, signature([self.egg.id, self.salt.id]))
+
+        recipe.ingredients.clear()
+        mask = Recipe.objects.get(id=recipe.id).ingredient_mask
+        self.assertEqual(mask, signature([]))
+
+    def test_follows_deletes_and_merges(self):
+        recipe = create_recipe(
+            self.user, 'Omelette', [self.egg, self.salt, self.pepper]
+        )
+
+        self.egg.delete()
+        delete_all(Ingredient.objects.filter(id=self.pepper.id))
+        self.assertEqual(ingredient_ids(recipe), [self.salt.id])
+
+        sea_salt = Ingredient.objects.create(user=self.user, name='Sea salt')
+        merge(sea_salt, [self.salt])
+        self.assertEqual(ingredient_ids(recipe), [sea_salt.id])
+
+    def test_application_writes_ignored(self):
+        recipe = create_recipe(self.user, 'Omelette', [self.egg])
+        recipe.ingredients.add(self.salt)
+
+        # The instance still holds the array from before the link.
+        recipe.title = 'Salted omelette'
+        recipe.save()
+        Recipe.objects.filter(id=recipe.id).update(ingredient_ids=[1])
+
+        self.assertEqual(
+            ingredient_ids(recipe), sorted([self.egg.id, self.salt.id])
+        )
+
+
+class MatchApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.salt, self.pepper, self.egg, self.milk = [
+            Ingredient.objects.create(user=self.user, name=name)
+            for name in ('Salt', 'Pepper', 'Egg', 'Milk')
+        ]
+        self.boiled = create_recipe(self.user, 'Boiled egg', [self.egg])
+        self.omelette = create_recipe(
+            self.user, 'Omelette', [self.egg, self.salt, self.milk]
+        )
+        self.pancake = create_recipe(
+            self.user, 'Pancake', [self.egg, self.milk, self.pepper]
+        )
+        create_recipe(self.user, 'Water')
+
+    def titles(self, res):
+        return [recipe['title'] for recipe in res.data]
+
+    def test_fully_covered(self):
+        res = self.client.post(
+            MATCH_URL,
+            {'ingredients': [self.egg.id, self.salt.id, self.milk.id]},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(res), ['Omelette', 'Boiled egg'])
+        self.assertEqual(res.data[0]['coverage'], 1.0)
+        self.assertEqual(res.data[0]['missing'], [])
+        self.assertEqual(
+            sorted(item['id'] for item in res.data[0]['ingredients']),
+            sorted([self.egg.id, self.salt.id, self.milk.id])
+        )
+
+    def test_missing_at_most(self):
+        res = self.client.post(
+            MATCH_URL,
+            {'ingredients': [self.egg.id, self.salt.id], 'max_missing': 1},
+            format='json'
+        )
+
+        self.assertEqual(self.titles(res), ['Boiled egg', 'Omelette'])
+        self.assertAlmostEqual(res.data[1]['coverage'], 2 / 3)
+        self.assertEqual(res.data[1]['missing'], [self.milk.id])
+
+    def test_other_users_recipes_excluded(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        recipe = create_recipe(other, 'Other')
+        recipe.ingredients.add(self.egg)
+
+        res = self.client.post(
+            MATCH_URL, {'ingredients': [self.egg.id]}, format='json'
+        )
+
+        self.assertEqual(self.titles(res), ['Boiled egg'])
+
+    def test_invalid_request(self):
+        for payload in ({'ingredients': []}, {'ingredients': ['x']},
+                        {'ingredients': [1], 'max_missing': 99}):
+            with self.subTest(payload=payload):
+                res = self.client.post(MATCH_URL, payload, format='json')
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
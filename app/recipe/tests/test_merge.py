@@ -0,0 +1,202 @@
+"""
+Tests for name normalization and merging of tags and ingredients.
+"""
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import (
+    IntegrityError,
+    connection,
+    transaction
+)
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Change,
+    Ingredient,
+    Recipe,
+    Tag
+)
+
+from recipe.merge import NORMALIZED_SQL
+from recipe.serializers.named import normalize_name
+
+unique_names = import_module('core.migrations.0010_unique_names')
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_MERGE_URL = reverse('recipe:tag-merge')
+INGREDIENTS_MERGE_URL = reverse('recipe:ingredient-merge')
+
+
+def create_recipe(user, title='Soup'):
+    return Recipe.objects.create(
+        user=user, title=title, time_minutes=5, price=Decimal('1.00')
+    )
+
+
+class NameNormalizationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_recipe_reuses_names_ignoring_case(self):
+        salt = Ingredient.objects.create(user=self.user, name='Salt')
+        payload = {
+            'title': 'Soup',
+            'time_minutes': 5,
+            'price': '1.00',
+            'tags': [{'name': 'Quick  dinner '}, {'name': 'quick dinner'}],
+            'ingredients': [{'name': 'salt'}, {'name': ' SALT'}],
+        }
+
+        res = self.client.post(RECIPES_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=res.data['id'])
+        self.assertEqual(list(recipe.ingredients.all()), [salt])
+        self.assertEqual(
+            list(recipe.tags.values_list('name', flat=True)),
+            ['Quick dinner']
+        )
+        self.assertEqual(Ingredient.objects.count(), 1)
+
+    def test_sql_normalization_matches_python(self):
+        names = ['salt\t', '\n Salt \n', 'Black \t\n pepper', 'Salt']
+        for sql in (NORMALIZED_SQL.format(column='name'),
+                    unique_names.NORMALIZED):
+            with self.subTest(sql=sql), connection.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT {sql} FROM unnest(%s::text[]) AS name', [names]
+                )
+                self.assertEqual(
+                    [row[0] for row in cursor.fetchall()],
+                    [normalize_name(name) for name in names]
+                )
+
+    def test_unique_ignoring_case(self):
+        Tag.objects.create(user=self.user, name='Vegan')
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        Tag.objects.create(user=other, name='vegan')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Tag.objects.create(user=self.user, name='VEGAN')
+
+    def test_rename_to_existing_name_rejected(self):
+        Tag.objects.create(user=self.user, name='Vegan')
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+
+        res = self.client.patch(
+            reverse('recipe:tag-detail', args=[tag.id]), {'name': 'vegan '}
+        )
+        renamed = self.client.patch(
+            reverse('recipe:tag-detail', args=[tag.id]), {'name': 'DINNER'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(renamed.status_code, status.HTTP_200_OK)
+        self.assertEqual(renamed.data['name'], 'DINNER')
+
+
+class MergeApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_merge_ingredients(self):
+        salt = Ingredient.objects.create(user=self.user, name='Salt')
+        sea = Ingredient.objects.create(user=self.user, name='Sea salt')
+        flakes = Ingredient.objects.create(user=self.user, name='Flakes')
+        both = create_recipe(self.user, 'Both')
+        both.ingredients.add(salt, sea)
+        two_sources = create_recipe(self.user, 'Two sources')
+        two_sources.ingredients.add(sea, flakes)
+        Change.objects.all().delete()
+
+        res = self.client.post(
+            INGREDIENTS_MERGE_URL,
+            {'target': salt.id, 'sources': [sea.id, flakes.id]},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'id': salt.id, 'name': 'Salt'})
+        self.assertEqual(list(both.ingredients.all()), [salt])
+        self.assertEqual(list(two_sources.ingredients.all()), [salt])
+        self.assertEqual(list(Ingredient.objects.all()), [salt])
+        tombstones = Change.objects.filter(
+            kind=Change.KIND_INGREDIENT, deleted=True
+        )
+        self.assertEqual(
+            sorted(tombstones.values_list('object_id', flat=True)),
+            [sea.id, flakes.id]
+        )
+        links = Change.objects.filter(kind=Change.KIND_RECIPE_INGREDIENT)
+        self.assertEqual(links.filter(deleted=False).count(), 1)
+        self.assertEqual(links.filter(deleted=True).count(), 2)
+
+    def test_merge_other_users_tag_rejected(self):
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        foreign = Tag.objects.create(user=other, name='Vegan')
+
+        res = self.client.post(
+            TAGS_MERGE_URL,
+            {'target': tag.id, 'sources': [foreign.id]},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('sources', res.data)
+        self.assertTrue(Tag.objects.filter(id=foreign.id).exists())
+
+    def test_merge_into_source_rejected(self):
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+
+        res = self.client.post(
+            TAGS_MERGE_URL,
+            {'target': tag.id, 'sources': [tag.id]},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DedupeNamesCommandTests(TestCase):
+    def test_dedupe(self):
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        salt = Ingredient.objects.create(user=user, name='Salt ')
+        spaced = Ingredient.objects.create(user=user, name=' salt')
+        tabbed = Ingredient.objects.create(user=user, name='salt\t')
+        wrapped = Ingredient.objects.create(user=user, name='\nSALT\n')
+        pepper = Ingredient.objects.create(user=user, name='Black  pepper')
+        recipe = create_recipe(user)
+        recipe.ingredients.add(spaced, tabbed, wrapped, pepper)
+
+        call_command('dedupe_names', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(
+            sorted(Ingredient.objects.values_list('id', 'name')),
+            [(salt.id, 'Salt'), (pepper.id, 'Black pepper')]
+        )
+        self.assertEqual(
+            sorted(recipe.ingredients.values_list('id', flat=True)),
+            [salt.id, pepper.id]
+        )
@@ -0,0 +1,136 @@
+"""
+Tests for recipe list range filters, ordering and cursor pagination.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from recipe.filters import encode_cursor
+
+RECIPES_URL = reverse('recipe:recipe-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+def create_recipe(user, title, time_minutes, price):
+    return Recipe.objects.create(
+        user=user,
+        title=title,
+        time_minutes=time_minutes,
+        price=Decimal(price)
+    )
+
+
+class RecipeFilterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.soup = create_recipe(self.user, 'Soup', 20, '4.00')
+        self.stew = create_recipe(self.user, 'Stew', 90, '12.50')
+        self.salad = create_recipe(self.user, 'Salad', 10, '4.00')
+        self.pie = create_recipe(self.user, 'Pie', 45, '8.25')
+
+    def titles(self, res):
+        recipes = res.data
+        if isinstance(recipes, dict):
+            recipes = recipes['recipes']
+        return [recipe['title'] for recipe in recipes]
+
+    def test_range_filters(self):
+        res = self.client.get(RECIPES_URL, {
+            'time_minutes_max': 45, 'price_max': '9', 'price_min': '4.00'
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(res), ['Pie', 'Salad', 'Soup'])
+
+    def test_ordering(self):
+        cheapest = self.client.get(RECIPES_URL, {'ordering': 'price'})
+        slowest = self.client.get(RECIPES_URL, {'ordering': '-time_minutes'})
+        by_title = self.client.get(RECIPES_URL, {'ordering': 'title'})
+
+        # Equal prices fall back to the id in the same direction.
+        self.assertEqual(
+            self.titles(cheapest), ['Soup', 'Salad', 'Pie', 'Stew']
+        )
+        self.assertEqual(
+            self.titles(slowest), ['Stew', 'Pie', 'Soup', 'Salad']
+        )
+        self.assertEqual(
+            self.titles(by_title), ['Pie', 'Salad', 'Soup', 'Stew']
+        )
+
+    def test_invalid_parameters_rejected_without_queries(self):
+        invalid = [
+            {'tags': '1,x'},
+            {'ingredients': '0'},
+            {'time_minutes_min': '-1'},
+            {'price_max': 'cheap'},
+            {'price_min': '10', 'price_max': '5'},
+            {'ordering': 'link'},
+            {'page_size': '0'},
+            {'cursor': 'garbage'},
+            {'cursor': encode_cursor('price', (Decimal('4.00'), 1))},
+        ]
+        for params in invalid:
+            with self.subTest(params=params), self.assertNumQueries(0):
+                res = self.client.get(RECIPES_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail_actions_ignore_list_parameters(self):
+        url = reverse('recipe:recipe-detail', args=[self.soup.id])
+
+        retrieved = self.client.get(url, {'tags': '999', 'ordering': 'x'})
+        patched = self.client.patch(
+            f'{url}?ordering=x', {'title': 'Broth'}, format='json'
+        )
+
+        self.assertEqual(retrieved.status_code, status.HTTP_200_OK)
+        self.assertEqual(patched.status_code, status.HTTP_200_OK)
+        self.soup.refresh_from_db()
+        self.assertEqual(self.soup.title, 'Broth')
+
+    def test_cursor_pagination(self):
+        params = {'ordering': '-price', 'page_size': 3, 'price_max': '100'}
+
+        first = self.client.get(RECIPES_URL, params)
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual(self.titles(first), ['Stew', 'Pie', 'Salad'])
+        self.assertIn('price_max=100', first.data['next'])
+        self.assertEqual(self.titles(second), ['Soup'])
+        self.assertIsNone(second.data['next'])
+
+    def test_cursor_pages_cover_every_recipe(self):
+        for i in range(7):
+            create_recipe(self.user, f'Extra {i}', i, '4.00')
+        expected = self.titles(
+            self.client.get(RECIPES_URL, {'ordering': 'price'})
+        )
+
+        titles = []
+        res = self.client.get(
+            RECIPES_URL, {'ordering': 'price', 'page_size': 2}
+        )
+        while True:
+            titles += self.titles(res)
+            if res.data['next'] is None:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(titles, expected)
+
+    def test_export_ordering(self):
+        res = self.client.get(EXPORT_URL, {'ordering': 'title'})
+
+        content = b''.join(res.streaming_content)
+        self.assertLess(content.index(b'"Pie"'), content.index(b'"Stew"'))
+        self.assertLess(content.index(b'"Salad"'), content.index(b'"Soup"'))
@@ -0,0 +1,135 @@
+"""
+Tests for similar recipe recommendations.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Ingredient,
+    Recipe,
+    Tag
+)
+from recipe import similarity
+from recipe.deletion import delete_all
+from recipe.merge import merge
+
+
+def similar_url(recipe_id):
+    return reverse('recipe:recipe-similar', args=[recipe_id])
+
+
+def create_recipe(user, title, ingredients=(), tags=()):
+    recipe = Recipe.objects.create(
+        user=user, title=title, time_minutes=5, price=Decimal('1.00')
+    )
+    recipe.ingredients.add(*ingredients)
+    recipe.tags.add(*tags)
+    return recipe
+
+
+@override_settings(SIMILAR_TAG_WEIGHT=0.5)
+class SimilarApiTests(TestCase):
+    def setUp(self):
+        similarity.clear_indexes()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.egg, self.milk, self.flour, self.salt = [
+            Ingredient.objects.create(user=self.user, name=name)
+            for name in ('Egg', 'Milk', 'Flour', 'Salt')
+        ]
+        self.breakfast = Tag.objects.create(user=self.user, name='Breakfast')
+        self.pancake = create_recipe(
+            self.user, 'Pancake', [self.egg, self.milk, self.flour],
+            [self.breakfast]
+        )
+        self.crepe = create_recipe(
+            self.user, 'Crepe', [self.egg, self.milk, self.flour]
+        )
+        self.omelette = create_recipe(
+            self.user, 'Omelette', [self.egg, self.salt], [self.breakfast]
+        )
+        create_recipe(self.user, 'Salt water', [self.salt])
+
+    def similar(self, recipe, **params):
+        res = self.client.get(similar_url(recipe.id), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [(item['title'], item['score']) for item in res.data]
+
+    def test_ranked_by_weighted_jaccard(self):
+        res = self.client.get(similar_url(self.pancake.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['title'], item['score']) for item in res.data],
+            [('Crepe', 3 / 3.5), ('Omelette', 1.5 / 4.5)]
+        )
+        self.assertEqual(
+            sorted(item['id'] for item in res.data[0]['ingredients']),
+            sorted([self.egg.id, self.milk.id, self.flour.id])
+        )
+        self.assertEqual(self.similar(self.pancake, limit=1)[0][0], 'Crepe')
+
+    def test_follows_changes(self):
+        self.similar(self.pancake)
+
+        self.omelette.ingredients.add(self.milk, self.flour)
+        self.crepe.ingredients.remove(self.flour)
+        self.assertEqual(
+            self.similar(self.pancake),
+            [('Omelette', 3.5 / 4.5), ('Crepe', 2 / 3.5)]
+        )
+
+        self.breakfast.recipe_set.remove(self.omelette)
+        self.crepe.delete()
+        self.assertEqual(self.similar(self.pancake), [('Omelette', 3 / 4.5)])
+
+    def test_follows_tag_and_ingredient_changes(self):
+        self.similar(self.pancake)
+
+        self.breakfast.delete()
+        delete_all(Ingredient.objects.filter(id=self.flour.id))
+        self.assertEqual(
+            self.similar(self.pancake),
+            [('Crepe', 1.0), ('Omelette', 1 / 3)]
+        )
+
+        salt = Ingredient.objects.create(user=self.user, name='Sea salt')
+        merge(salt, [self.salt])
+        milk = Ingredient.objects.create(user=self.user, name='Oat milk')
+        merge(milk, [self.milk])
+        self.assertEqual(
+            self.similar(self.pancake),
+            [('Crepe', 1.0), ('Omelette', 1 / 3)]
+        )
+        self.assertEqual(
+            self.similar(self.omelette),
+            [('Salt water', 1 / 2), ('Crepe', 1 / 3), ('Pancake', 1 / 3)]
+        )
+
+    def test_other_users_recipes_not_found(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+        recipe = create_recipe(other, 'Other', [self.egg])
+
+        self.assertEqual(
+            self.client.get(similar_url(recipe.id)).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        self.assertNotIn('Other', dict(self.similar(self.omelette)))
+
+    def test_invalid_limit(self):
+        res = self.client.get(similar_url(self.pancake.id), {'limit': 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
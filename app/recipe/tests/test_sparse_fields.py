@@ -0,0 +1,121 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag,
+    Ingredient
+)
+
+RECIPES_URL = reverse('recipe:recipe-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+def detail_url(recipe_id):
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class SparseFieldsApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='password123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.recipe = Recipe.objects.create(
+            user=self.user,
+            title='Soup',
+            time_minutes=10,
+            price=Decimal('2.50'),
+            description='Hot soup',
+        )
+        self.tag = Tag.objects.create(user=self.user, name='Dinner')
+        self.ingredient = Ingredient.objects.create(
+            user=self.user, name='Water'
+        )
+        self.recipe.tags.add(self.tag)
+        self.recipe.ingredients.add(self.ingredient)
+
+    def test_recipe_list_fields_single_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(RECIPES_URL, {'fields': 'id,title'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, [{'id': self.recipe.id, 'title': 'Soup'}]
+        )
+        self.assertEqual(len(queries.captured_queries), 1)
+        sql = queries.captured_queries[0]['sql']
+        self.assertNotIn('description', sql)
+        self.assertNotIn('"price"', sql)
+
+    def test_recipe_list_omit_skips_related(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(RECIPES_URL, {'omit': 'ingredients'})
+
+        self.assertEqual(
+            list(response.data[0]),
+            ['id', 'title', 'time_minutes', 'price', 'link', 'tags']
+        )
+        self.assertEqual(response.data[0]['tags'], [
+            {'id': self.tag.id, 'name': 'Dinner'}
+        ])
+        self.assertEqual(len(queries.captured_queries), 2)
+
+    def test_recipe_export_fields(self):
+        response = self.client.get(EXPORT_URL, {'fields': 'title'})
+
+        content = b''.join(response.streaming_content)
+        self.assertEqual(content, b'[{"title":"Soup"}]')
+
+    def test_recipe_detail_fields_prune_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                detail_url(self.recipe.id), {'fields': 'title,description'}
+            )
+
+        self.assertEqual(
+            response.data, {'title': 'Soup', 'description': 'Hot soup'}
+        )
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertNotIn('"image"', queries.captured_queries[0]['sql'])
+
+    def test_unknown_field_rejected(self):
+        response = self.client.get(RECIPES_URL, {'fields': 'title,secret'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+    def test_tag_list_fields(self):
+        response = self.client.get(TAGS_URL, {'fields': 'name'})
+
+        self.assertEqual(response.data, [{'name': 'Dinner'}])
+
+    def test_ingredient_list_omit_with_filter(self):
+        response = self.client.get(
+            INGREDIENTS_URL, {'omit': 'name', 'assigned_only': 1}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'id': self.ingredient.id}])
+
+    def test_fields_ignored_on_write(self):
+        response = self.client.patch(
+            detail_url(self.recipe.id) + '?fields=title',
+            {'time_minutes': 20},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['time_minutes'], 20)
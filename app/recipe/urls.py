@@ -3,14 +3,14 @@ from django.urls import (
     include
 )
 
-from rest_framework.routers import DefaultRouter
-
 from recipe import views
+from recipe.routers import BulkRouter
 
-router = DefaultRouter()
+router = BulkRouter()
 router.register('recipes', views.RecipeViewSet)
 router.register('tags', views.TagViewSet)
 router.register('ingredients', views.IngredientViewSet)
+router.register('archives', views.ArchiveViewSet, basename='archive')
 
 app_name = 'recipe'
 
@@ -1,9 +1,11 @@
 from .recipe import RecipeViewSet
 from .tag import TagViewSet
 from .ingredient import IngredientViewSet
+from .archive import ArchiveViewSet
 
 __all__ = [
     'RecipeViewSet',
     'TagViewSet',
-    'IngredientViewSet'
+    'IngredientViewSet',
+    'ArchiveViewSet'
 ]
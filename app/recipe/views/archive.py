@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import FileResponse
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiResponse
+)
+from rest_framework import (
+    status,
+    viewsets
+)
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import (
+    APIException,
+    NotFound
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core import jobs
+from core.models import Job
+from monitoring.timing import (
+    TimedListModelMixin,
+    TimedRetrieveModelMixin,
+    serialize
+)
+from recipe.archive import archive_path
+from recipe.jobs import ARCHIVE_JOB
+from recipe.serializers import ArchiveSerializer
+
+PENDING = (Job.STATUS_QUEUED, Job.STATUS_RUNNING)
+
+
+class ArchiveNotReady(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The archive is not ready yet.'
+    default_code = 'archive_not_ready'
+
+
+class ArchiveExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The archive has expired.'
+    default_code = 'archive_expired'
+
+
+@extend_schema_view(
+    create=extend_schema(request=None, responses={202: ArchiveSerializer}),
+    download=extend_schema(
+        responses={(200, 'application/zip'): OpenApiResponse(
+            description='Zip with recipes.json and the recipe images'
+        )}
+    )
+)
+class ArchiveViewSet(TimedRetrieveModelMixin,
+                     TimedListModelMixin,
+                     viewsets.GenericViewSet):
+    """Full account archives, built in the background."""
+    serializer_class = ArchiveSerializer
+    queryset = Job.objects.filter(name=ARCHIVE_JOB)
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user).order_by('-id')
+
+    def create(self, request):
+        with transaction.atomic():
+            # Concurrent requests of one user queue a single archive.
+            get_user_model().objects.select_for_update().filter(
+                id=request.user.id
+            ).exists()
+            job = self.get_queryset().filter(status__in=PENDING).first()
+            if job is None:
+                job = jobs.enqueue(ARCHIVE_JOB, user=request.user)
+        data = serialize(self.get_serializer(job))
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': data['url']}
+        )
+
+    @action(methods=['GET'], detail=True)
+    def download(self, request, pk=None):
+        job = self.get_object()
+        result = job.result or {}
+        if result.get('expired'):
+            raise ArchiveExpired()
+        if job.status != Job.STATUS_SUCCEEDED or not result.get('file'):
+            raise ArchiveNotReady()
+
+        try:
+            archive = open(archive_path(result['file']), 'rb')
+        except FileNotFoundError:
+            raise NotFound('The archive file is missing.')
+        return FileResponse(
+            archive,
+            as_attachment=True,
+            filename=f'recipes-{job.id}.zip',
+            content_type='application/zip'
+        )
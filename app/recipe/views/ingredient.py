@@ -12,7 +12,16 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from core.models import Ingredient
+from monitoring.timing import (
+    TimedListModelMixin,
+    TimedUpdateModelMixin
+)
 from recipe.serializers import IngredientSerializer
+from recipe.views.mixins import (
+    MergeMixin,
+    SparseFieldsMixin,
+    SPARSE_FIELDS_PARAMETERS
+)
 
 
 @extend_schema_view(
@@ -23,11 +32,13 @@ from recipe.serializers import IngredientSerializer
                 OpenApiTypes.INT, enum=[0, 1],
                 description='Filter by assigned quality',
             )
-        ]
+        ] + SPARSE_FIELDS_PARAMETERS
     )
 )
-class IngredientViewSet(mixins.ListModelMixin,
-                        mixins.UpdateModelMixin,
+class IngredientViewSet(MergeMixin,
+                        SparseFieldsMixin,
+                        TimedListModelMixin,
+                        TimedUpdateModelMixin,
                         mixins.DestroyModelMixin,
                         viewsets.GenericViewSet):
     serializer_class = IngredientSerializer
@@ -38,7 +49,7 @@ class IngredientViewSet(mixins.ListModelMixin,
     def get_queryset(self):
         assigned_only = bool(int(self.request.query_params.
                                  get('assigned_only', 0)))
-        queryset = self.queryset
+        queryset = super().get_queryset()
         if assigned_only:
             queryset = queryset.filter(recipe__isnull=False)
 
@@ -0,0 +1,99 @@
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes
+)
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from monitoring.timing import serialize
+from recipe.merge import merge
+from recipe.serializers import MergeSerializer
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        'fields',
+        OpenApiTypes.STR,
+        description='Comma separated list of fields to return'
+    ),
+    OpenApiParameter(
+        'omit',
+        OpenApiTypes.STR,
+        description='Comma separated list of fields to leave out'
+    ),
+]
+
+
+class SparseFieldsMixin:
+    """Support ?fields= and ?omit= on read actions, pruning the SQL too."""
+    sparse_actions = ('list', 'retrieve')
+
+    def _param_to_names(self, param, available):
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError(
+                {param: [f'Unknown field(s): {", ".join(unknown)}.']}
+            )
+        return names
+
+    def get_sparse_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+
+        available = self.get_serializer_class().Meta.fields
+        fields = self._param_to_names('fields', available)
+        omit = self._param_to_names('omit', available)
+        if fields is None and omit is None:
+            return None
+
+        return [
+            name for name in available
+            if (fields is None or name in fields) and name not in (omit or [])
+        ]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    target.fields.pop(name)
+        return serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        columns = []
+        for name in fields:
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                columns.append(name)
+        return queryset.only(*columns)
+
+
+class MergeMixin:
+    """POST merge/ folds duplicate objects into one."""
+
+    @extend_schema(request=MergeSerializer)
+    @action(methods=['POST'], detail=False)
+    def merge(self, request):
+        serializer = MergeSerializer(
+            data=request.data, context={'queryset': self.get_queryset()}
+        )
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data['target']
+        merge(target, serializer.validated_data['sources'])
+        return Response(serialize(self.get_serializer(target)))
@@ -1,73 +1,343 @@
+from django.conf import settings
+from django.db import transaction
+from django.http import (
+    Http404,
+    StreamingHttpResponse
+)
 from rest_framework import (
+    serializers,
     viewsets,
     status
 )
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
+    inline_serializer,
     OpenApiParameter,
     OpenApiTypes
 )
 from core.models import Recipe
+from core.renderers import (
+    FastJSONRenderer,
+    ColumnarJSONRenderer,
+    MessagePackRenderer
+)
+from monitoring.profiling import ProfilingMixin
+from monitoring.timing import (
+    TimedCreateModelMixin,
+    TimedRetrieveModelMixin,
+    TimedUpdateModelMixin,
+    phase,
+    serialize
+)
+from recipe.deletion import delete_all
+from recipe.filters import (
+    ORDERINGS,
+    RecipeFilterSerializer,
+    after,
+    encode_cursor
+)
+from recipe.matching import best_matches
+from recipe.similarity import similar_recipes
+from recipe.views.mixins import (
+    SparseFieldsMixin,
+    SPARSE_FIELDS_PARAMETERS
+)
 from recipe.serializers import (
     RecipeSerializer,
     RecipeDetailSerializer,
-    RecipeImageSerializer
+    RecipeImageSerializer,
+    FastRecipeSerializer,
+    MatchSerializer,
+    RecipeMatchSerializer,
+    SimilarSerializer,
+    RecipeSimilarSerializer
+)
+from recipe.serializers.fast import RELATED_FIELDS
+
+COLUMNAR_RENDERERS = (ColumnarJSONRenderer, MessagePackRenderer)
+
+FILTER_PARAMETERS = [
+    OpenApiParameter(
+        'tags',
+        OpenApiTypes.STR,
+        description='List of ids to filter'
+    ),
+    OpenApiParameter(
+        'ingredients',
+        OpenApiTypes.STR,
+        description='List of ids to filter'
+    ),
+    OpenApiParameter(
+        'time_minutes_min',
+        OpenApiTypes.INT,
+        description='Minimum preparation time in minutes'
+    ),
+    OpenApiParameter(
+        'time_minutes_max',
+        OpenApiTypes.INT,
+        description='Maximum preparation time in minutes'
+    ),
+    OpenApiParameter(
+        'price_min',
+        OpenApiTypes.DECIMAL,
+        description='Minimum price'
+    ),
+    OpenApiParameter(
+        'price_max',
+        OpenApiTypes.DECIMAL,
+        description='Maximum price'
+    ),
+]
+
+ORDERING_PARAMETER = OpenApiParameter(
+    'ordering',
+    OpenApiTypes.STR,
+    enum=ORDERINGS,
+    description='Sort order, "-" for descending; defaults to -id'
+)
+
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        'cursor',
+        OpenApiTypes.STR,
+        description='The "next" cursor of the previous page'
+    ),
+    OpenApiParameter(
+        'page_size',
+        OpenApiTypes.INT,
+        description=(
+            'Recipes per page. With this or a cursor the list is paginated '
+            'and returned as {"recipes": [...], "next": url}'
+        )
+    ),
+]
+
+INCLUDE_PARAMETER = OpenApiParameter(
+    'include',
+    OpenApiTypes.STR,
+    description=(
+        'Comma separated related fields (tags, ingredients) to return as '
+        'ids, with each referenced object listed once under "included"'
+    )
 )
 
 
 @extend_schema_view(
     list=extend_schema(
-        parameters=[
-            OpenApiParameter(
-                'tags',
-                OpenApiTypes.STR,
-                description='List of ids to filter'
-            ),
-            OpenApiParameter(
-                'ingredients',
-                OpenApiTypes.STR,
-                description='List of ids to filter'
-            )
-        ]
+        parameters=FILTER_PARAMETERS + [ORDERING_PARAMETER]
+        + PAGINATION_PARAMETERS + [INCLUDE_PARAMETER]
+        + SPARSE_FIELDS_PARAMETERS
+    ),
+    retrieve=extend_schema(parameters=SPARSE_FIELDS_PARAMETERS),
+    export=extend_schema(
+        parameters=FILTER_PARAMETERS + [ORDERING_PARAMETER]
+        + [INCLUDE_PARAMETER] + SPARSE_FIELDS_PARAMETERS,
+        responses=RecipeSerializer(many=True)
     )
 )
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ProfilingMixin,
+                    SparseFieldsMixin,
+                    TimedCreateModelMixin,
+                    TimedRetrieveModelMixin,
+                    TimedUpdateModelMixin,
+                    viewsets.ModelViewSet):
     serializer_class = RecipeDetailSerializer
     queryset = Recipe.objects.all()
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    sparse_actions = ('list', 'retrieve', 'export')
+    filter_actions = ('list', 'export', 'bulk_destroy')
 
-    def _params_to_ints(self, query):
-        return [int(str_id) for str_id in query.split(',')]
+    def get_filters(self):
+        if not hasattr(self, '_filters'):
+            filters = RecipeFilterSerializer(data=self.request.query_params)
+            filters.is_valid(raise_exception=True)
+            self._filters = filters
+        return self._filters
 
     def get_queryset(self):
-        tags = self.request.query_params.get('tags')
-        ingredients = self.request.query_params.get('ingredients')
-        queryset = self.queryset
-        if tags:
-            tag_ids = self._params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tag_ids)
-        if ingredients:
-            ingredient_ids = self._params_to_ints(ingredients)
-            queryset = queryset.filter(ingredients__id__in=ingredient_ids)
-
-        return (queryset.filter(user=self.request.user).
-                order_by('-id').distinct())
+        queryset = super().get_queryset().filter(user=self.request.user)
+        if self.action not in self.filter_actions:
+            return queryset
+        return self.get_filters().filter(queryset)
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.action in ('list', 'export'):
+            renderers += [renderer() for renderer in COLUMNAR_RENDERERS]
+        return renderers
+
+    def _is_columnar(self):
+        return isinstance(self.request.accepted_renderer, COLUMNAR_RENDERERS)
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'export'):
             return RecipeSerializer
         elif self.action == 'upload_image':
             return RecipeImageSerializer
 
         return self.serializer_class
 
+    def _get_sideload(self):
+        if self._is_columnar():
+            return list(RELATED_FIELDS)
+        include = self.request.query_params.get('include')
+        if not include:
+            return []
+        names = [name.strip() for name in include.split(',') if name.strip()]
+        unknown = [name for name in names if name not in RELATED_FIELDS]
+        if unknown:
+            raise ValidationError(
+                {'include': [f'Unknown relation(s): {", ".join(unknown)}.']}
+            )
+        return names
+
+    def _get_fast_serializer(self):
+        return FastRecipeSerializer(
+            self.get_sparse_fields(), sideload=self._get_sideload()
+        )
+
+    def _next_link(self, ordering, key):
+        if key is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            'cursor',
+            encode_cursor(ordering, key)
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self._get_fast_serializer()
+        params = self.get_filters().validated_data
+        ordering = params['ordering']
+        paginated = 'cursor' in params or 'page_size' in params
+        with phase('serialize'):
+            if paginated:
+                if 'cursor' in params:
+                    queryset = after(queryset, ordering, params['cursor'])
+                recipes, key = serializer.serialize_page(
+                    queryset,
+                    params.get('page_size', settings.RECIPE_PAGE_SIZE),
+                    ordering.lstrip('-')
+                )
+            else:
+                recipes = serializer.serialize(queryset)
+
+            data = recipes
+            if serializer.sideload or paginated:
+                data = {'recipes': recipes}
+            if serializer.sideload:
+                data['included'] = serializer.included_data()
+            if paginated:
+                data['next'] = self._next_link(ordering, key)
+        return Response(data)
+
+    def _stream_json(self, serializer, chunks):
+        renderer = FastJSONRenderer()
+        separator = b''
+        yield b'{"recipes":[' if serializer.sideload else b'['
+        for chunk in chunks:
+            content = renderer.render(chunk)[1:-1]
+            if content:
+                yield separator + content
+                separator = b','
+        if serializer.sideload:
+            included = renderer.render(serializer.included_data())
+            yield b'],"included":' + included + b'}'
+        else:
+            yield b']'
+
+    @action(methods=['GET'], detail=False)
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self._get_fast_serializer()
+        chunks = serializer.iter_chunks(
+            queryset, ordering=self.get_filters().validated_data['ordering']
+        )
+        renderer = request.accepted_renderer
+        if self._is_columnar():
+            content = renderer.stream(chunks, serializer.included_data)
+            content_type = renderer.media_type
+            extension = renderer.extension
+        else:
+            content = self._stream_json(serializer, chunks)
+            content_type = 'application/json'
+            extension = 'json'
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="recipes.{extension}"'
+        )
+        return response
+
+    @extend_schema(
+        operation_id='recipes_bulk_destroy',
+        parameters=FILTER_PARAMETERS,
+        responses={200: inline_serializer(
+            'BulkDeleteResult', {'deleted': serializers.IntegerField()}
+        )}
+    )
+    def bulk_destroy(self, request, *args, **kwargs):
+        """Delete every recipe matching the filters."""
+        if not any(request.query_params.get(name)
+                   for name in ('tags', 'ingredients')):
+            raise ValidationError(
+                {'detail': 'Filter by tags or ingredients to delete in bulk.'}
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        with transaction.atomic():
+            deleted = delete_all(queryset)
+        return Response({'deleted': deleted})
+
+    @extend_schema(
+        request=MatchSerializer,
+        responses=RecipeMatchSerializer(many=True)
+    )
+    @action(methods=['POST'], detail=False)
+    def match(self, request):
+        """Recipes cookable from a set of ingredients, best covered first."""
+        serializer = MatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        with phase('serialize'):
+            data = best_matches(
+                request.user,
+                params['ingredients'],
+                params['max_missing'],
+                params['limit']
+            )
+        return Response(data)
+
+    @extend_schema(
+        parameters=[SimilarSerializer],
+        responses=RecipeSimilarSerializer(many=True)
+    )
+    @action(methods=['GET'], detail=True)
+    def similar(self, request, pk=None):
+        """The recipes sharing the most ingredients and tags with one."""
+        params = SimilarSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        try:
+            recipe_id = int(pk)
+        except ValueError:
+            raise Http404
+        with phase('serialize'):
+            data = similar_recipes(
+                request.user, recipe_id, params.validated_data['limit']
+            )
+        if data is None:
+            raise Http404
+        return Response(data)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -78,6 +348,6 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(serialize(serializer), status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
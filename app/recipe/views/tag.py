@@ -1,3 +1,7 @@
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view
+)
 from rest_framework import (
     viewsets,
     mixins
@@ -6,11 +10,25 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from core.models import Tag
+from monitoring.timing import (
+    TimedListModelMixin,
+    TimedUpdateModelMixin
+)
 from recipe.serializers import TagSerializer
+from recipe.views.mixins import (
+    MergeMixin,
+    SparseFieldsMixin,
+    SPARSE_FIELDS_PARAMETERS
+)
 
 
-class TagViewSet(mixins.ListModelMixin,
-                 mixins.UpdateModelMixin,
+@extend_schema_view(
+    list=extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+)
+class TagViewSet(MergeMixin,
+                 SparseFieldsMixin,
+                 TimedListModelMixin,
+                 TimedUpdateModelMixin,
                  mixins.DestroyModelMixin,
                  viewsets.GenericViewSet):
     serializer_class = TagSerializer
@@ -19,4 +37,5 @@ class TagViewSet(mixins.ListModelMixin,
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-name')
+        return (super().get_queryset().filter(user=self.request.user).
+                order_by('-name'))
@@ -0,0 +1,143 @@
+"""
+In-process fan-out of change notifications to event stream subscribers.
+
+One LISTEN connection per process is driven from the event loop with
+`add_reader`, so idle subscribers cost a queue each and no threads. A
+subscriber that falls behind has its backlog dropped and receives a
+single RESYNC marker instead, telling the client to catch up via /sync/.
+Subscribers are also sent RESYNC once LISTEN is (re)established, since
+changes committed before then were never notified to this process.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from core import notify
+
+logger = logging.getLogger('sync.broker')
+
+RESYNC = object()
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 30
+
+
+class Subscription:
+    def __init__(self, user_id, size):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+
+    def push(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self):
+        event = await self.queue.get()
+        if event is RESYNC:
+            self.overflowed = False
+        return event
+
+
+class Broker:
+    def __init__(self, channel):
+        self.channel = channel
+        self._subscribers = defaultdict(set)
+        self._loop = None
+        self._task = None
+        self.listening = None
+
+    def subscribe(self, user_id, size):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._subscribers.clear()
+            self._loop = loop
+            self.listening = asyncio.Event()
+            self._task = loop.create_task(self._listen())
+        subscription = Subscription(user_id, size)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def subscriber_count(self):
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def publish(self, event):
+        for subscription in list(self._subscribers.get(event['user'], ())):
+            subscription.push(event)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._subscribers.clear()
+        self._loop = None
+        self._task = None
+
+    def _resync_all(self):
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                subscription.push(RESYNC)
+
+    def _drain(self, listener, lost):
+        try:
+            listener.poll()
+        except Exception as error:
+            if not lost.done():
+                lost.set_exception(error)
+            return
+        while listener.notifies:
+            message = listener.notifies.pop(0)
+            try:
+                self.publish(json.loads(message.payload))
+            except (ValueError, KeyError, TypeError):
+                logger.warning('Ignoring malformed notification %r',
+                               message.payload)
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        delay = RECONNECT_DELAY
+        while True:
+            listener = None
+            fd = None
+            try:
+                listener = await loop.run_in_executor(
+                    None, notify.listen, [self.channel]
+                )
+                lost = loop.create_future()
+                fd = listener.fileno()
+                loop.add_reader(fd, self._drain, listener, lost)
+                self.listening.set()
+                self._resync_all()
+                delay = RECONNECT_DELAY
+                await lost
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Change listener failed, reconnecting')
+                # Events may have been missed while disconnected.
+                self._resync_all()
+            finally:
+                self.listening.clear()
+                if fd is not None:
+                    loop.remove_reader(fd)
+                if listener is not None:
+                    listener.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
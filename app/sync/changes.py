@@ -0,0 +1,115 @@
+"""
+Per-user change log backing the delta-sync feed.
+
+Every synced object keeps a single Change row holding the sequence number
+of its latest change, so the log is compacted by construction; deletions
+stay behind as tombstones until `compact_changes` purges them. Sequence
+numbers come from the user's ChangeSequence row, whose lock is held until
+the writing transaction commits, so they become visible in order.
+
+Each commit is also announced on the CHANNEL NOTIFY channel for the event
+stream; large batches are announced without their change list.
+"""
+from datetime import timedelta
+
+from django.db import (
+    connection,
+    transaction
+)
+from django.db.models import Max
+from django.utils import timezone
+
+from core import notify
+from core.models import (
+    Change,
+    ChangeSequence,
+    Recipe
+)
+
+CHANNEL = 'sync_changes'
+MAX_NOTIFIED_CHANGES = 50
+
+LINKS = {
+    Recipe.tags.through: (Change.KIND_RECIPE_TAG, 'tag'),
+    Recipe.ingredients.through: (Change.KIND_RECIPE_INGREDIENT, 'ingredient'),
+}
+
+
+def allocate(user_id, count):
+    """Reserve `count` sequence numbers and return the last one."""
+    table = ChangeSequence._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (user_id, last_seq, horizon) '
+            f'VALUES (%s, %s, 0) '
+            f'ON CONFLICT (user_id) DO UPDATE '
+            f'SET last_seq = {table}.last_seq + EXCLUDED.last_seq '
+            f'RETURNING last_seq',
+            [user_id, count]
+        )
+        return cursor.fetchone()[0]
+
+
+def record(user_id, kind, object_ids, deleted=False):
+    object_ids = list(object_ids)
+    if not object_ids:
+        return []
+
+    with transaction.atomic():
+        last_seq = allocate(user_id, len(object_ids))
+        first_seq = last_seq - len(object_ids) + 1
+        changes = [
+            Change(
+                user_id=user_id,
+                kind=kind,
+                object_id=object_id,
+                seq=first_seq + offset,
+                deleted=deleted
+            )
+            for offset, object_id in enumerate(object_ids)
+        ]
+        Change.objects.bulk_create(
+            changes,
+            update_conflicts=True,
+            unique_fields=['user', 'kind', 'object_id'],
+            update_fields=['seq', 'deleted', 'changed_at']
+        )
+        announce(user_id, changes)
+    return changes
+
+
+def announce(user_id, changes):
+    payload = {'user': user_id, 'seq': changes[-1].seq, 'changes': None}
+    if len(changes) <= MAX_NOTIFIED_CHANGES:
+        payload['changes'] = [
+            {
+                'kind': change.kind,
+                'id': change.object_id,
+                'deleted': change.deleted
+            }
+            for change in changes
+        ]
+    notify.notify(CHANNEL, payload)
+
+
+def compact(retention_days, user_ids=None):
+    """Purge tombstones older than the retention and advance horizons."""
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    tombstones = Change.objects.filter(deleted=True, changed_at__lt=cutoff)
+    if user_ids is not None:
+        tombstones = tombstones.filter(user_id__in=user_ids)
+
+    purged = 0
+    horizons = tombstones.values('user_id').annotate(horizon=Max('seq'))
+    for row in horizons:
+        with transaction.atomic():
+            ChangeSequence.objects.filter(
+                user_id=row['user_id'], horizon__lt=row['horizon']
+            ).update(horizon=row['horizon'])
+            purged += Change.objects.filter(
+                user_id=row['user_id'],
+                deleted=True,
+                seq__lte=row['horizon'],
+                changed_at__lt=cutoff
+            ).delete()[0]
+    return purged
@@ -0,0 +1,151 @@
+"""
+Server-Sent Events stream of the authenticated user's committed changes.
+
+Served by the ASGI application only, at EVENTS_PATH. Clients authenticate
+with the usual `Authorization: Token <key>` header or, for EventSource
+which cannot set headers, a short-lived `ticket` query parameter from
+POST /sync/ticket/ (see sync.tickets). Each event carries
+the change sequence as its id; on `resync`, or after reconnecting, clients
+catch up with GET /sync/?since=<last id>.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+from rest_framework.authtoken.models import Token
+
+from sync.broker import (
+    Broker,
+    RESYNC
+)
+from sync.changes import CHANNEL
+from sync.tickets import user_id_for_ticket
+
+EVENTS_PATH = '/sync/events/'
+
+broker = Broker(CHANNEL)
+
+
+def _credentials(scope):
+    """(token key, ticket) of the request; either may be None."""
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            keyword, _, key = value.decode('latin-1').partition(' ')
+            if keyword == 'Token':
+                return key.strip(), None
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    return None, query.get('ticket', [None])[0]
+
+
+def _authenticate(scope):
+    """The id of the active user the request is authenticated as, or None."""
+    key, ticket = _credentials(scope)
+    try:
+        if key:
+            token = Token.objects.select_related('user').filter(
+                key=key
+            ).first()
+            user = token and token.user
+        elif ticket:
+            user = get_user_model().objects.filter(
+                id=user_id_for_ticket(ticket)
+            ).first()
+        else:
+            user = None
+    finally:
+        close_old_connections()
+    return user.id if user is not None and user.is_active else None
+
+
+def format_event(event):
+    if event is RESYNC:
+        return b'event: resync\ndata: {}\n\n'
+    data = json.dumps(
+        {'seq': event['seq'], 'changes': event['changes']},
+        separators=(',', ':')
+    )
+    return f'id: {event["seq"]}\nevent: change\ndata: {data}\n\n'.encode()
+
+
+async def _send_json(send, status, body):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _wait_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+async def event_stream(scope, receive, send):
+    user_id = await sync_to_async(_authenticate)(scope)
+    if user_id is None:
+        await _send_json(
+            send, 401, b'{"detail":"Invalid or missing credentials."}'
+        )
+        return
+
+    subscription = broker.subscribe(user_id, settings.SYNC_EVENTS_QUEUE_SIZE)
+    disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': b'retry: 5000\n\n',
+            'more_body': True,
+        })
+        while True:
+            getter = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait(
+                {getter, disconnected},
+                timeout=settings.SYNC_EVENTS_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done:
+                getter.cancel()
+                break
+            if getter in done:
+                body = format_event(getter.result())
+            else:
+                getter.cancel()
+                body = b': ping\n\n'
+            # Blocks while the client is not reading; meanwhile the
+            # subscription queue fills up and collapses into a resync.
+            await send({
+                'type': 'http.response.body',
+                'body': body,
+                'more_body': True,
+            })
+    finally:
+        disconnected.cancel()
+        broker.unsubscribe(subscription)
+
+
+def route(application):
+    """Serve EVENTS_PATH from the event stream, all else from `application`."""
+    async def router(scope, receive, send):
+        if (scope['type'] == 'http' and scope['path'] == EVENTS_PATH
+                and scope['method'] == 'GET'):
+            await event_stream(scope, receive, send)
+        else:
+            await application(scope, receive, send)
+
+    return router
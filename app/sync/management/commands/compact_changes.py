@@ -0,0 +1,23 @@
+"""
+Django command to purge old sync tombstones.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from sync import changes
+
+
+class Command(BaseCommand):
+    help = 'Purge sync tombstones older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+            help='Keep tombstones younger than this many days.'
+        )
+
+    def handle(self, *args, **options):
+        purged = changes.compact(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} tombstones.'))
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from core.models import Recipe
+
+
+class RecipeChangeSerializer(serializers.ModelSerializer):
+    """Recipe fields carried by the sync feed; links are synced separately."""
+
+    class Meta:
+        model = Recipe
+        fields = [
+            'id', 'title', 'time_minutes', 'price', 'link', 'description',
+            'image'
+        ]
+        read_only_fields = fields
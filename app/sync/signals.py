@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+
+from core.models import (
+    Change,
+    Ingredient,
+    Recipe,
+    Tag
+)
+from recipe.deletion import (
+    bulk_deleted,
+    link_ids
+)
+from recipe.merge import links_merged
+from sync import changes
+
+KINDS = {
+    Recipe: Change.KIND_RECIPE,
+    Tag: Change.KIND_TAG,
+    Ingredient: Change.KIND_INGREDIENT,
+}
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def object_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        changes.record(instance.user_id, KINDS[sender], [instance.pk])
+
+
+def _deleted_with_user(origin):
+    user_model = get_user_model()
+    return (isinstance(origin, user_model)
+            or getattr(origin, 'model', None) is user_model)
+
+
+def _record_links_deleted(user_id, links):
+    for through, ids in links.items():
+        changes.record(user_id, changes.LINKS[through][0], ids, deleted=True)
+
+
+@receiver(pre_delete, sender=Recipe)
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Ingredient)
+def object_deleting(sender, instance, origin=None, **kwargs):
+    # The collector removes the links without signals of their own.
+    if not _deleted_with_user(origin):
+        _record_links_deleted(
+            instance.user_id, link_ids(sender, [instance.pk])
+        )
+
+
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def object_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_user(origin):
+        changes.record(
+            instance.user_id, KINDS[sender], [instance.pk], deleted=True
+        )
+
+
+@receiver(bulk_deleted)
+def objects_bulk_deleted(sender, user_id, ids, links=None, **kwargs):
+    if sender in KINDS:
+        changes.record(user_id, KINDS[sender], ids, deleted=True)
+        _record_links_deleted(user_id, links or {})
+
+
+@receiver(links_merged)
+def links_rewritten(sender, user_id, moved, dropped, **kwargs):
+    kind = changes.LINKS[sender][0]
+    changes.record(user_id, kind, moved)
+    changes.record(user_id, kind, dropped, deleted=True)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'pre_remove', 'pre_clear',
+                      'post_remove', 'post_clear'):
+        return
+
+    kind, related = changes.LINKS[sender]
+    if action in ('post_remove', 'post_clear'):
+        # The links are gone by now; their ids were taken beforehand.
+        removed = instance.__dict__.get('_removed_link_ids', {})
+        changes.record(
+            instance.user_id, kind, removed.pop(sender, ()), deleted=True
+        )
+        return
+
+    links = sender.objects.all()
+    if reverse:
+        links = links.filter(**{f'{related}_id': instance.pk})
+        if pk_set is not None:
+            links = links.filter(recipe_id__in=pk_set)
+    else:
+        links = links.filter(recipe_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(**{f'{related}_id__in': pk_set})
+    ids = list(links.values_list('id', flat=True))
+
+    if action == 'post_add':
+        changes.record(instance.user_id, kind, ids)
+    else:
+        instance.__dict__.setdefault('_removed_link_ids', {})[sender] = ids
@@ -0,0 +1,202 @@
+import asyncio
+from decimal import Decimal
+
+from asgiref.sync import (
+    async_to_sync,
+    sync_to_async
+)
+from django.contrib.auth import get_user_model
+from django.test import (
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings
+)
+from rest_framework.authtoken.models import Token
+
+from core.models import Recipe
+from sync import (
+    events,
+    tickets
+)
+from sync.broker import (
+    RESYNC,
+    Subscription
+)
+
+
+class SubscriptionTests(SimpleTestCase):
+    def test_overflow_collapses_into_resync(self):
+        async def run():
+            subscription = Subscription(1, size=2)
+            for seq in range(5):
+                subscription.push({'user': 1, 'seq': seq})
+            first = await subscription.get()
+            subscription.push({'user': 1, 'seq': 9})
+            return first, await subscription.get()
+
+        first, second = asyncio.run(run())
+
+        self.assertIs(first, RESYNC)
+        self.assertEqual(second['seq'], 9)
+
+    def test_format_event(self):
+        body = events.format_event({'user': 1, 'seq': 7, 'changes': None})
+
+        self.assertEqual(
+            body,
+            b'id: 7\nevent: change\ndata: {"seq":7,"changes":null}\n\n'
+        )
+
+
+class Stream:
+    def __init__(self, query_string=b'', headers=()):
+        self.sent = asyncio.Queue()
+        self.incoming = asyncio.Queue()
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': events.EVENTS_PATH,
+            'query_string': query_string,
+            'headers': list(headers),
+        }
+        self.task = asyncio.ensure_future(
+            events.event_stream(scope, self.incoming.get, self.sent.put)
+        )
+
+    async def next_body(self, timeout=5):
+        message = await asyncio.wait_for(self.sent.get(), timeout)
+        return message.get('body')
+
+    async def next_event(self):
+        body = await self.next_body()
+        while body == b': ping\n\n':
+            body = await self.next_body()
+        return body
+
+    async def close(self):
+        await self.incoming.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(self.task, 5)
+
+
+@override_settings(SYNC_EVENTS_HEARTBEAT=0.2)
+class EventStreamTests(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def create_recipe(self):
+        return Recipe.objects.create(
+            user=self.user,
+            title='Soup',
+            time_minutes=5,
+            price=Decimal('1.00')
+        )
+
+    def open_status(self, query_string):
+        async def run():
+            stream = Stream(query_string=query_string)
+            start = await asyncio.wait_for(stream.sent.get(), 5)
+            await stream.task
+            return start['status']
+
+        return async_to_sync(run)()
+
+    def test_rejects_missing_or_invalid_credentials(self):
+        for query_string in [b'', b'ticket=wrong', b'ticket=1:a:b']:
+            with self.subTest(query_string=query_string):
+                self.assertEqual(self.open_status(query_string), 401)
+
+    def test_rejects_token_in_query_string(self):
+        query_string = f'token={self.token.key}'.encode()
+
+        self.assertEqual(self.open_status(query_string), 401)
+
+    def test_rejects_expired_ticket(self):
+        query_string = f'ticket={tickets.issue(self.user)}'.encode()
+
+        with override_settings(SYNC_EVENTS_TICKET_MAX_AGE=-1):
+            self.assertEqual(self.open_status(query_string), 401)
+
+    def test_rejects_ticket_of_inactive_user(self):
+        query_string = f'ticket={tickets.issue(self.user)}'.encode()
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.open_status(query_string), 401)
+
+    def test_pushes_committed_changes(self):
+        async def run():
+            stream = Stream(headers=[
+                (b'authorization', f'Token {self.token.key}'.encode())
+            ])
+            try:
+                start = await asyncio.wait_for(stream.sent.get(), 5)
+                retry = await stream.next_body()
+                # Changes before LISTEN was up are caught up on via /sync/.
+                resync = await stream.next_event()
+                recipe = await sync_to_async(self.create_recipe)()
+                body = await stream.next_event()
+                await stream.close()
+                return start, retry, resync, body, recipe, (
+                    events.broker.subscriber_count()
+                )
+            finally:
+                await events.broker.close()
+
+        start, retry, resync, body, recipe, remaining = (
+            async_to_sync(run)()
+        )
+
+        self.assertEqual(start['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/event-stream'), start['headers']
+        )
+        self.assertEqual(retry, b'retry: 5000\n\n')
+        self.assertEqual(resync, b'event: resync\ndata: {}\n\n')
+        self.assertTrue(body.startswith(b'id: 1\nevent: change\n'))
+        self.assertIn(f'"id":{recipe.id}'.encode(), body)
+        self.assertEqual(remaining, 0)
+
+    def test_heartbeat_and_other_users_filtered(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='password123'
+        )
+
+        async def run():
+            ticket = await sync_to_async(tickets.issue)(self.user)
+            stream = Stream(query_string=f'ticket={ticket}'.encode())
+            try:
+                await asyncio.wait_for(stream.sent.get(), 5)
+                await stream.next_body()
+                await stream.next_event()
+                await sync_to_async(Recipe.objects.create)(
+                    user=other, title='Other', time_minutes=1,
+                    price=Decimal('1.00')
+                )
+                bodies = [await stream.next_body() for _ in range(3)]
+                await stream.close()
+                return bodies
+            finally:
+                await events.broker.close()
+
+        bodies = async_to_sync(run)()
+
+        self.assertEqual(bodies, [b': ping\n\n'] * 3)
+
+
+class RouteTests(SimpleTestCase):
+    def test_other_paths_reach_application(self):
+        seen = []
+
+        async def application(scope, receive, send):
+            seen.append(scope['path'])
+
+        router = events.route(application)
+        async_to_sync(router)(
+            {'type': 'http', 'method': 'GET', 'path': '/recipes/'},
+            None, None
+        )
+
+        self.assertEqual(seen, ['/recipes/'])
@@ -0,0 +1,257 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Change,
+    ChangeSequence,
+    Ingredient,
+    Recipe,
+    Tag
+)
+from recipe.deletion import delete_all
+from sync import tickets
+
+SYNC_URL = reverse('sync:sync')
+TICKET_URL = reverse('sync:ticket')
+
+
+def create_user(email='user@example.com'):
+    return get_user_model().objects.create_user(
+        email=email, password='password123'
+    )
+
+
+def create_recipe(user, **params):
+    defaults = {
+        'title': 'Soup',
+        'time_minutes': 10,
+        'price': Decimal('2.50'),
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class ChangeRecordingTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+
+    def test_sequence_is_monotonic_per_user(self):
+        other = create_user('other@example.com')
+        create_recipe(self.user)
+        create_recipe(other)
+        Tag.objects.create(user=self.user, name='Dinner')
+
+        seqs = list(Change.objects.filter(
+            user=self.user
+        ).order_by('seq').values_list('seq', flat=True))
+
+        self.assertEqual(seqs, [1, 2])
+        self.assertEqual(
+            ChangeSequence.objects.get(user=other).last_seq, 1
+        )
+
+    def test_one_row_per_object(self):
+        recipe = create_recipe(self.user)
+        recipe.title = 'Stew'
+        recipe.save()
+        recipe.save()
+
+        change = Change.objects.get(kind=Change.KIND_RECIPE)
+        self.assertEqual(change.seq, 3)
+        self.assertFalse(change.deleted)
+
+    def test_links_recorded(self):
+        recipe = create_recipe(self.user)
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        recipe.tags.add(tag)
+        link_id = Recipe.tags.through.objects.get().id
+
+        recipe.tags.remove(tag)
+
+        change = Change.objects.get(kind=Change.KIND_RECIPE_TAG)
+        self.assertEqual(change.object_id, link_id)
+        self.assertTrue(change.deleted)
+
+    def test_cascaded_links_recorded(self):
+        recipe = create_recipe(self.user)
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        recipe.tags.add(tag)
+        recipe.ingredients.add(ingredient)
+        tag_link = Recipe.tags.through.objects.get().id
+        ingredient_link = Recipe.ingredients.through.objects.get().id
+        recipe_id = recipe.id
+
+        recipe.delete()
+
+        tombstones = Change.objects.filter(deleted=True).values_list(
+            'kind', 'object_id'
+        )
+        self.assertEqual(set(tombstones), {
+            (Change.KIND_RECIPE, recipe_id),
+            (Change.KIND_RECIPE_TAG, tag_link),
+            (Change.KIND_RECIPE_INGREDIENT, ingredient_link),
+        })
+
+    def test_bulk_deleted_links_recorded(self):
+        recipe = create_recipe(self.user)
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        recipe.tags.add(tag)
+        link_id = Recipe.tags.through.objects.get().id
+
+        delete_all(Tag.objects.filter(id=tag.id))
+
+        change = Change.objects.get(kind=Change.KIND_RECIPE_TAG)
+        self.assertEqual(change.object_id, link_id)
+        self.assertTrue(change.deleted)
+
+    def test_user_delete_leaves_no_changes(self):
+        create_recipe(self.user)
+
+        self.user.delete()
+
+        self.assertFalse(Change.objects.exists())
+
+
+class SyncApiTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_auth_required(self):
+        response = APIClient().get(SYNC_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_initial_sync(self):
+        recipe = create_recipe(self.user)
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        recipe.ingredients.add(ingredient)
+        create_recipe(create_user('other@example.com'))
+
+        response = self.client.get(SYNC_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cursor'], '3')
+        self.assertFalse(response.data['more'])
+        self.assertEqual(
+            [item['title'] for item in response.data['recipes']['upserted']],
+            ['Soup']
+        )
+        self.assertEqual(
+            response.data['ingredients']['upserted'],
+            [{'id': ingredient.id, 'name': 'Salt'}]
+        )
+        link = response.data['recipe_ingredients']['upserted'][0]
+        self.assertEqual(link['recipe'], recipe.id)
+        self.assertEqual(link['ingredient'], ingredient.id)
+
+    def test_incremental_sync_only_changes(self):
+        recipe = create_recipe(self.user)
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        cursor = self.client.get(SYNC_URL).data['cursor']
+
+        recipe.title = 'Stew'
+        recipe.save()
+        tag_id = tag.id
+        tag.delete()
+        response = self.client.get(SYNC_URL, {'since': cursor})
+
+        self.assertEqual(
+            [item['title'] for item in response.data['recipes']['upserted']],
+            ['Stew']
+        )
+        self.assertEqual(response.data['tags']['deleted'], [tag_id])
+        self.assertEqual(response.data['ingredients'], {
+            'upserted': [], 'deleted': []
+        })
+
+        again = self.client.get(
+            SYNC_URL, {'since': response.data['cursor']}
+        )
+        self.assertEqual(again.data['cursor'], response.data['cursor'])
+        self.assertEqual(again.data['recipes']['upserted'], [])
+
+    def test_cascaded_link_reported_deleted(self):
+        recipe = create_recipe(self.user)
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        recipe.tags.add(tag)
+        link_id = Recipe.tags.through.objects.get().id
+        cursor = self.client.get(SYNC_URL).data['cursor']
+
+        tag.delete()
+        response = self.client.get(SYNC_URL, {'since': 0})
+
+        self.assertEqual(response.data['recipe_tags']['deleted'], [link_id])
+        self.assertNotEqual(response.data['cursor'], cursor)
+
+    def test_paging(self):
+        for i in range(5):
+            create_recipe(self.user, title=f'Recipe {i}')
+
+        first = self.client.get(SYNC_URL, {'limit': 3})
+        second = self.client.get(
+            SYNC_URL, {'since': first.data['cursor'], 'limit': 3}
+        )
+
+        self.assertTrue(first.data['more'])
+        self.assertFalse(second.data['more'])
+        self.assertEqual(len(first.data['recipes']['upserted']), 3)
+        self.assertEqual(len(second.data['recipes']['upserted']), 2)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(SYNC_URL, {'since': 'abc'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_compaction_forces_reset(self):
+        recipe = create_recipe(self.user)
+        cursor = self.client.get(SYNC_URL).data['cursor']
+        recipe.delete()
+        create_recipe(self.user, title='Kept')
+        Change.objects.filter(deleted=True).update(
+            changed_at=timezone.now() - timedelta(days=40)
+        )
+
+        out = StringIO()
+        call_command('compact_changes', days=30, stdout=out)
+        response = self.client.get(SYNC_URL, {'since': cursor})
+
+        self.assertIn('Purged 1 tombstones', out.getvalue())
+        self.assertFalse(Change.objects.filter(deleted=True).exists())
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(
+            [item['title'] for item in response.data['recipes']['upserted']],
+            ['Kept']
+        )
+
+
+class EventTicketApiTests(TestCase):
+    def test_auth_required(self):
+        response = APIClient().post(TICKET_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_issues_ticket_for_user(self):
+        user = create_user()
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.post(TICKET_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            tickets.user_id_for_ticket(response.data['ticket']), user.id
+        )
+        self.assertEqual(response.data['expires_in'], 60)
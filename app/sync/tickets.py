@@ -0,0 +1,25 @@
+"""
+Short-lived signed tickets authenticating change event streams.
+
+EventSource cannot set headers, and an API token in the query string would
+be written to access logs and proxies. A ticket only names its user and
+expires after SYNC_EVENTS_TICKET_MAX_AGE seconds.
+"""
+from django.conf import settings
+from django.core import signing
+
+SALT = 'sync.events.ticket'
+
+
+def issue(user):
+    return signing.TimestampSigner(salt=SALT).sign(str(user.pk))
+
+
+def user_id_for_ticket(ticket):
+    """The user id the ticket was issued to, or None if invalid or expired."""
+    try:
+        return int(signing.TimestampSigner(salt=SALT).unsign(
+            ticket, max_age=settings.SYNC_EVENTS_TICKET_MAX_AGE
+        ))
+    except (signing.BadSignature, ValueError):
+        return None
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from sync import views
+
+app_name = 'sync'
+
+urlpatterns = [
+    path('', views.SyncView.as_view(), name='sync'),
+    path('ticket/', views.EventTicketView.as_view(), name='ticket'),
+]
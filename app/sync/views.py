@@ -0,0 +1,169 @@
+from django.conf import settings
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiParameter,
+    OpenApiTypes
+)
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import (
+    Change,
+    ChangeSequence,
+    Ingredient,
+    Recipe,
+    Tag
+)
+from monitoring.profiling import ProfilingMixin
+from monitoring.timing import phase
+from recipe.serializers import (
+    IngredientSerializer,
+    TagSerializer
+)
+from sync import tickets
+from sync.serializers import RecipeChangeSerializer
+
+
+class ObjectFeed:
+    def __init__(self, key, model, serializer_class):
+        self.key = key
+        self.model = model
+        self.serializer_class = serializer_class
+
+    def upserted(self, user, ids, context):
+        queryset = self.model.objects.filter(user=user, id__in=ids)
+        return self.serializer_class(
+            queryset.order_by('id'), many=True, context=context
+        ).data
+
+
+class LinkFeed:
+    def __init__(self, key, through, related):
+        self.key = key
+        self.through = through
+        self.related = related
+
+    def upserted(self, user, ids, context):
+        rows = self.through.objects.filter(
+            recipe__user=user, id__in=ids
+        ).order_by('id').values_list('id', 'recipe_id', f'{self.related}_id')
+        return [
+            {'id': pk, 'recipe': recipe_id, self.related: related_id}
+            for pk, recipe_id, related_id in rows
+        ]
+
+
+FEEDS = {
+    Change.KIND_RECIPE: ObjectFeed(
+        'recipes', Recipe, RecipeChangeSerializer
+    ),
+    Change.KIND_TAG: ObjectFeed('tags', Tag, TagSerializer),
+    Change.KIND_INGREDIENT: ObjectFeed(
+        'ingredients', Ingredient, IngredientSerializer
+    ),
+    Change.KIND_RECIPE_TAG: LinkFeed(
+        'recipe_tags', Recipe.tags.through, 'tag'
+    ),
+    Change.KIND_RECIPE_INGREDIENT: LinkFeed(
+        'recipe_ingredients', Recipe.ingredients.through, 'ingredient'
+    ),
+}
+
+
+class SyncView(ProfilingMixin, APIView):
+    """
+    Changes since a cursor. Upserted objects are sent whole, deletions as
+    ids. `reset` asks the client to drop local state because tombstones it
+    has not seen were compacted away; the feed then restarts from zero.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def _int_param(self, name, default, maximum=None):
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            number = -1
+        if number < 0:
+            raise ValidationError({name: ['Must be a non-negative integer.']})
+        return min(number, maximum) if maximum else number
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'since',
+                OpenApiTypes.INT,
+                description='Cursor returned by the previous sync'
+            ),
+            OpenApiParameter(
+                'limit',
+                OpenApiTypes.INT,
+                description='Maximum number of changes to return'
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT
+    )
+    def get(self, request):
+        since = self._int_param('since', 0)
+        limit = self._int_param(
+            'limit', settings.SYNC_PAGE_SIZE, settings.SYNC_MAX_PAGE_SIZE
+        ) or settings.SYNC_PAGE_SIZE
+
+        horizon = ChangeSequence.objects.filter(
+            user=request.user
+        ).values_list('horizon', flat=True).first() or 0
+        reset = 0 < since < horizon
+        if reset:
+            since = 0
+
+        changes = list(Change.objects.filter(
+            user=request.user, seq__gt=since
+        ).order_by('seq').values_list(
+            'seq', 'kind', 'object_id', 'deleted'
+        )[:limit + 1])
+        more = len(changes) > limit
+        changes = changes[:limit]
+
+        upserted = {kind: [] for kind in FEEDS}
+        deleted = {kind: [] for kind in FEEDS}
+        for seq, kind, object_id, is_deleted in changes:
+            (deleted if is_deleted else upserted)[kind].append(object_id)
+
+        context = {'request': request}
+        data = {
+            'cursor': str(changes[-1][0] if changes else since),
+            'more': more,
+            'reset': reset,
+        }
+        for kind, feed in FEEDS.items():
+            with phase('serialize'):
+                objects = feed.upserted(
+                    request.user, upserted[kind], context
+                )
+            found = {item['id'] for item in objects}
+            # Objects deleted since their change was recorded.
+            missing = [pk for pk in upserted[kind] if pk not in found]
+            data[feed.key] = {
+                'upserted': objects,
+                'deleted': sorted(deleted[kind] + missing),
+            }
+        return Response(data)
+
+
+class EventTicketView(APIView):
+    """A short-lived ticket for opening the change event stream."""
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=None, responses=OpenApiTypes.OBJECT)
+    def post(self, request):
+        return Response({
+            'ticket': tickets.issue(request.user),
+            'expires_in': settings.SYNC_EVENTS_TICKET_MAX_AGE,
+        })
@@ -0,0 +1,49 @@
+"""
+Background jobs of the user app.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from core import jobs
+from core.models import (
+    Change,
+    Ingredient,
+    Recipe,
+    Tag
+)
+from recipe.deletion import delete_all
+
+PURGE_USER_JOB = 'user.purge'
+
+
+def deactivate(user):
+    user.is_active = False
+    user.save(update_fields=['is_active'])
+    Token.objects.filter(user=user).delete()
+
+
+def request_purge(user):
+    """Lock the account out now and delete it in the background."""
+    with transaction.atomic():
+        deactivate(user)
+        # Not owned by the user, so it survives the account's deletion.
+        return jobs.enqueue(PURGE_USER_JOB, {'user': user.id})
+
+
+def purge(user_id):
+    """Delete a user and their data in short batched transactions."""
+    deleted = {}
+    # Recipes go first so tags and ingredients have no links left.
+    for model in (Recipe, Tag, Ingredient, Change):
+        deleted[model._meta.model_name] = delete_all(
+            model.objects.filter(user_id=user_id), send=False
+        )
+    # What is left is small enough for the deletion collector.
+    get_user_model().objects.filter(id=user_id).delete()
+    return deleted
+
+
+@jobs.register(PURGE_USER_JOB)
+def purge_user(job):
+    return purge(job.payload['user'])
@@ -0,0 +1,81 @@
+"""
+Tests for purging users in the background.
+"""
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from core import jobs
+from core.models import (
+    Change,
+    Ingredient,
+    Job,
+    Recipe,
+    Tag
+)
+from user.jobs import (
+    PURGE_USER_JOB,
+    request_purge
+)
+
+
+def create_user(email):
+    user = get_user_model().objects.create_user(
+        email=email, password='password123'
+    )
+    tag = Tag.objects.create(user=user, name='Vegan')
+    ingredient = Ingredient.objects.create(user=user, name='Salt')
+    for index in range(3):
+        recipe = Recipe.objects.create(
+            user=user, title=f'R{index}', time_minutes=5,
+            price=Decimal('1.00')
+        )
+        recipe.tags.add(tag)
+        recipe.ingredients.add(ingredient)
+    return user
+
+
+class PurgeTests(TestCase):
+    def setUp(self):
+        self.user = create_user('user@example.com')
+        self.other = create_user('other@example.com')
+
+    def assert_purged(self):
+        self.assertFalse(
+            get_user_model().objects.filter(id=self.user.id).exists()
+        )
+        for model in (Recipe, Tag, Ingredient, Change):
+            self.assertFalse(model.objects.filter(user=self.user).exists())
+            self.assertTrue(model.objects.filter(user=self.other).exists())
+        self.assertEqual(Recipe.tags.through.objects.count(), 3)
+
+    def test_request_purge_runs_in_background(self):
+        Token.objects.create(user=self.user)
+
+        job = request_purge(self.user)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        self.assertEqual(job.name, PURGE_USER_JOB)
+        self.assertIsNone(job.user)
+
+        claimed = jobs.claim('test')
+        self.assertTrue(jobs.run(claimed))
+
+        self.assert_purged()
+        result = Job.objects.get(id=job.id).result
+        self.assertEqual(result['recipe'], 3)
+        self.assertEqual(result['tag'], 1)
+
+    def test_purge_user_command_now(self):
+        out = StringIO()
+
+        call_command('purge_user', self.user.email, '--now', stdout=out)
+
+        self.assert_purged()
+        self.assertFalse(Job.objects.filter(name=PURGE_USER_JOB).exists())
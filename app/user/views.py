@@ -1,22 +1,33 @@
 from rest_framework import generics, authentication, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
+from monitoring.profiling import ProfilingMixin
+from monitoring.timing import (
+    TimedCreateModelMixin,
+    TimedRetrieveModelMixin,
+    TimedUpdateModelMixin
+)
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer
 )
 
 
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(ProfilingMixin,
+                     TimedCreateModelMixin,
+                     generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
-class CreateTokenView(ObtainAuthToken):
+class CreateTokenView(ProfilingMixin, ObtainAuthToken):
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(ProfilingMixin,
+                     TimedRetrieveModelMixin,
+                     TimedUpdateModelMixin,
+                     generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     authentication_classes = [authentication.TokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]